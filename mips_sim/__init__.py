@@ -0,0 +1,33 @@
+"""Simulador MIPS: núcleo de execução sem interface gráfica e GUI em Tkinter.
+
+A GUI (mips_sim.gui) só importa o tkinter quando é aberta; o restante do pacote
+pode ser usado em scripts e na linha de comando (python -m mips_sim).
+"""
+
+from .core import (
+    REGISTER_NAMES,
+    Instruction,
+    ExecutionError,
+    Machine,
+    Program,
+    bin_to_assembly,
+    decode,
+    disassemble,
+    load_program,
+    parse_instruction,
+    register_name,
+)
+
+__all__ = [
+    'REGISTER_NAMES',
+    'Instruction',
+    'ExecutionError',
+    'Machine',
+    'Program',
+    'bin_to_assembly',
+    'decode',
+    'disassemble',
+    'load_program',
+    'parse_instruction',
+    'register_name',
+]
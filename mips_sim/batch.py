@@ -0,0 +1,79 @@
+#====================================================================================
+# MIPS Simulator - execução em lote com vários processos
+#
+# Descrição: Executa coleções de programas (diretórios ou padrões glob) em um
+# pool de processos (concurrent.futures), cada um no núcleo sem interface
+# gráfica e com limite de instruções. Os resultados são produzidos à medida
+# que os programas terminam, prontos para serem gravados como JSON Lines.
+#
+# Uso: python -m mips_sim batch testes/ "outros/*.bin" --workers 8 --chunksize 4
+#====================================================================================
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .core import DEFAULT_MAX_INSTRUCTIONS, Machine, load_program
+
+# Extensões consideradas ao percorrer diretórios
+PROGRAM_EXTENSIONS = ('.txt', '.hex', '.bin')
+
+def collect_programs(patterns):
+    """Lista ordenada de arquivos de programa a partir de diretórios, arquivos ou globs"""
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                found.extend(os.path.join(root, name) for name in files
+                             if name.lower().endswith(PROGRAM_EXTENSIONS))
+        elif os.path.isfile(pattern):
+            found.append(pattern)
+        else:
+            found.extend(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(set(found))
+
+def run_one(path, max_instructions=DEFAULT_MAX_INSTRUCTIONS, timeout=None, compiled=False, fmt=None):
+    """Executa um programa e devolve o resultado como dicionário serializável"""
+    start = time.perf_counter()
+    result = {'file': path}
+    try:
+        machine = Machine(load_program(path, fmt), max_instructions=max_instructions, timeout=timeout)
+        machine.run(compiled=compiled)
+    except (OSError, ValueError) as e:
+        result.update(status=None, error=str(e), time=time.perf_counter() - start)
+        return result
+    result.update(
+        status=machine.status,
+        error=machine.error,
+        instructions=machine.executed,
+        pc=machine.pc,
+        registers=machine.signed_registers(),
+        memory_digest=machine.memory.digest(),
+        time=time.perf_counter() - start,
+    )
+    return result
+
+def _run_chunk(paths, options):
+    """Tarefa executada em um processo do pool: um grupo de programas"""
+    return [run_one(path, **options) for path in paths]
+
+def run_programs(paths, workers=None, chunksize=1, **options):
+    """Executa os programas em paralelo e gera os resultados à medida que terminam.
+
+    workers é o número de processos (padrão: os.cpu_count()); com workers=1 tudo
+    roda no processo atual. chunksize programas são enviados por tarefa, o que
+    reduz o custo de comunicação com muitos programas pequenos. options são
+    repassadas a run_one (max_instructions, timeout, compiled, fmt).
+    """
+    paths = list(paths)
+    if workers == 1:
+        for path in paths:
+            yield run_one(path, **options)
+        return
+
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_chunk, chunk, options) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
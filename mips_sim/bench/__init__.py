@@ -0,0 +1,10 @@
+#====================================================================================
+# MIPS Simulator - benchmarks
+#
+# Cada módulo pode ser executado diretamente, por exemplo:
+#     python -m mips_sim.bench.dispatch final1.txt final2.txt
+#     python -m mips_sim.bench.trace
+#     python -m mips_sim.bench.suite -o resultados.json
+#
+# Os programas sintéticos usados pela suíte ficam em mips_sim.bench.workloads.
+#====================================================================================
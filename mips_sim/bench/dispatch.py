@@ -0,0 +1,327 @@
+#====================================================================================
+# MIPS Simulator - micro-benchmark de despacho
+#
+# Compara o simulador original (mips_Final.py no commit base: parse_instruction
+# e execute_instruction sobre strings a cada linha, bin_to_assembly com cadeias
+# if/elif) com o despacho por tabelas de mips_sim.isa, tanto na execução quanto
+# na tradução para assembly.
+#
+# Uso: python -m mips_sim.bench.dispatch [programas...] [--repeat N] [--number N]
+#====================================================================================
+
+import argparse
+import glob
+import os
+import timeit
+
+from ..core import Machine, load_program
+from ..isa import disassemble
+
+#====================================================================================
+# Código original, copiado sem alterações de mips_Final.py (commit base)
+#====================================================================================
+
+def register_name(num):
+    """Mapeia números de registradores para nomes convencionais"""
+    if num == 0:
+        return "$zero"
+    elif num == 1:
+        return "$at"
+    elif 2 <= num <= 3:
+        return f"$v{num-2}"
+    elif 4 <= num <= 7:
+        return f"$a{num-4}"
+    elif 8 <= num <= 15:
+        return f"$t{num-8}"
+    elif 16 <= num <= 23:
+        return f"$s{num-16}"
+    elif 24 <= num <= 25:  # Corrigido para $t8 e $t9
+        return f"$t{num-8 + 8}"  # 24-8=16 → 16+8=24 → $t8? Não, isso está errado.
+        # Na verdade, 24-8=16, mas isso não faz sentido. O correto é:
+        # $t8 corresponde ao número 24, então 24-8=16 → $t8? Não.
+        # A lógica correta é: para 24 e 25, $t8 e $t9.
+        # Portanto, corrigindo para:
+        return f"$t{num - 24 + 8}" if num <= 25 else f"${num}"
+    elif 26 <= num <= 27:
+        return f"$k{num-26}"
+    elif num == 28:
+        return "$gp"
+    elif num == 29:
+        return "$sp"
+    elif num == 30:
+        return "$fp"
+    elif num == 31:
+        return "$ra"
+    return f"${num}"
+
+def parse_instruction(bin_instr):
+    """Analisa a instrução binária e retorna um dicionário com os campos parseados"""
+    if len(bin_instr) != 32:
+        return None
+    
+    parsed = {
+        'opcode': bin_instr[:6],
+        'rs': bin_instr[6:11],
+        'rt': bin_instr[11:16],
+        'rd': bin_instr[16:21],
+        'shamt': bin_instr[21:26],
+        'funct': bin_instr[26:],
+        'immediate': bin_instr[16:],
+        'address': bin_instr[6:]
+    }
+    
+    # Converter campos binários para inteiros
+    parsed['rs_num'] = int(parsed['rs'], 2)
+    parsed['rt_num'] = int(parsed['rt'], 2)
+    parsed['rd_num'] = int(parsed['rd'], 2)
+    parsed['shamt_num'] = int(parsed['shamt'], 2)
+    parsed['funct_num'] = int(parsed['funct'], 2)
+    
+    # Tratar immediate (sinalizado)
+    immediate_bin = parsed['immediate']
+    if immediate_bin[0] == '1':
+        parsed['immediate_num'] = -(65536 - int(immediate_bin, 2))
+    else:
+        parsed['immediate_num'] = int(immediate_bin, 2)
+    
+    # Tratar endereço J-type
+    parsed['address_num'] = int(parsed['address'], 2)
+    
+    return parsed
+
+def bin_to_assembly(bin_instr):
+    """Traduz instrução binária para assembly e retorna dados parseados"""
+    if len(bin_instr) != 32:
+        return "   ", None
+    
+    parsed = parse_instruction(bin_instr)
+    if not parsed:
+        return "  ", None
+    
+    rs = register_name(parsed['rs_num'])
+    rt = register_name(parsed['rt_num'])
+    rd = register_name(parsed['rd_num'])
+    shamt = parsed['shamt_num']
+    funct = parsed['funct']
+    immediate = parsed['immediate_num']
+    address = parsed['address_num']
+    
+    try:
+        # Instruções Tipo R
+        if parsed['opcode'] == '000000':
+            if funct == '100000':   # ADD
+                return f"add {rd}, {rs}, {rt}", parsed
+            elif funct == '100010':  # SUB
+                return f"sub {rd}, {rs}, {rt}", parsed
+            elif funct == '011000':  # MULT
+                return f"mult {rs}, {rt}", parsed
+            elif funct == '100100':  # AND
+                return f"and {rd}, {rs}, {rt}", parsed
+            elif funct == '100101':  # OR
+                return f"or {rd}, {rs}, {rt}", parsed
+            elif funct == '000000':  # SLL
+                return f"sll {rd}, {rt}, {shamt}", parsed
+            elif funct == '101010':  # SLT
+                return f"slt {rd}, {rs}, {rt}", parsed
+            elif funct == '001100':  # SYSCALL
+                return "syscall", parsed
+        
+        # Instruções Tipo I
+        elif parsed['opcode'] == '001000':  # ADDI
+            return f"addi {rt}, {rs}, {immediate}", parsed
+        elif parsed['opcode'] == '001010':  # SLTI
+            return f"slti {rt}, {rs}, {immediate}", parsed
+        elif parsed['opcode'] == '100011':  # LW
+            return f"lw {rt}, {immediate}({rs})", parsed
+        elif parsed['opcode'] == '101011':  # SW
+            return f"sw {rt}, {immediate}({rs})", parsed
+        elif parsed['opcode'] == '001111':  # LUI
+            return f"lui {rt}, {immediate}", parsed
+        
+        # Instruções Tipo J
+        elif parsed['opcode'] == '000010':  # J
+            return f"j {address}", parsed
+        
+        # Chamadas de sistema (exemplo não padrão)
+        elif parsed['opcode'] == '000001':  # IMPRIMIR INTEIRO
+            return f"print_int {rt}", parsed
+        elif parsed['opcode'] == '000011':  # IMPRIMIR STRING
+            return f"print_str {rt}", parsed
+        elif parsed['opcode'] == '000100':  # SAIR
+            return "exit", parsed
+        
+        else:
+            return f"Instrução não implementada (OPCODE: {parsed['opcode']})", parsed
+    
+    except:
+        return "Erro na tradução da instrução", parsed
+
+
+class BaselineSimulator:
+    """Estado do MIPSSimulator original (registradores e memória em dicts), sem a interface Tk"""
+
+    def __init__(self):
+        self.instructions = []
+        self.current_line = 0
+        self.registers = {}
+        self.memory = {}
+        self.init_registers()
+
+    def init_registers(self):
+        """Inicializa todos os registradores com 0"""
+        for i in range(32):
+            reg_name = register_name(i)
+            self.registers[reg_name] = 0
+
+    def execute_instruction(self, parsed):
+        opcode = parsed['opcode']
+        funct = parsed['funct']
+
+        def get_register_value(reg_num):
+            return self.registers[register_name(reg_num)]
+        
+        def set_register_value(reg_num, value):
+            reg_name = register_name(reg_num)
+            if reg_name != "$zero":
+                self.registers[reg_name] = value & 0xFFFFFFFF
+        
+        if opcode == '000000':  # Tipo R
+            rs_num = parsed['rs_num']
+            rt_num = parsed['rt_num']
+            rd_num = parsed['rd_num']
+            shamt = parsed['shamt_num']
+            
+            rs_val = get_register_value(rs_num)
+            rt_val = get_register_value(rt_num)
+
+            if funct == '100000':  # ADD
+                result = rs_val + rt_val
+                set_register_value(rd_num, result)
+            elif funct == '100010':  # SUB
+                result = rs_val - rt_val
+                set_register_value(rd_num, result)
+            elif funct == '100100':  # AND
+                result = rs_val & rt_val
+                set_register_value(rd_num, result)
+            elif funct == '100101':  # OR
+                result = rs_val | rt_val
+                set_register_value(rd_num, result)
+            elif funct == '000000':  # SLL
+                result = rt_val << shamt
+                set_register_value(rd_num, result)
+            elif funct == '011000':  # MULT
+                result = rs_val * rt_val
+                # Implementação simplificada (armazena em registradores temporários)
+                set_register_value(32, (result >> 32) & 0xFFFFFFFF)  # HI
+                set_register_value(33, result & 0xFFFFFFFF)           # LO
+
+        elif opcode == '001000':  # ADDI
+            rs_num = parsed['rs_num']
+            rt_num = parsed['rt_num']
+            immediate = parsed['immediate_num']
+            rs_val = get_register_value(rs_num)
+            result = rs_val + immediate
+            set_register_value(rt_num, result)
+
+        elif opcode == '100011':  # LW
+            base_num = parsed['rs_num']
+            rt_num = parsed['rt_num']
+            offset = parsed['immediate_num']
+            base_val = get_register_value(base_num)
+            eff_address = base_val + offset
+            self.memory[eff_address] = self.memory.get(eff_address, 0)
+            set_register_value(rt_num, self.memory[eff_address])
+
+        elif opcode == '101011':  # SW
+            base_num = parsed['rs_num']
+            rt_num = parsed['rt_num']
+            offset = parsed['immediate_num']
+            base_val = get_register_value(base_num)
+            eff_address = base_val + offset
+            rt_val = get_register_value(rt_num)
+            self.memory[eff_address] = rt_val
+
+        elif opcode == '001111':  # LUI
+            rt_num = parsed['rt_num']
+            immediate = parsed['immediate_num']
+            # Tratar immediate como valor não sinalizado
+            immediate_unsigned = immediate & 0xFFFF
+            result = immediate_unsigned << 16
+            set_register_value(rt_num, result)
+
+#====================================================================================
+# Benchmark
+#====================================================================================
+
+def default_programs():
+    """Programas de exemplo (final*.txt) distribuídos na raiz do repositório"""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return sorted(glob.glob(os.path.join(root, 'final*.txt')))
+
+def _best(func, repeat, number):
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+def bench_program(path, repeat=5, number=2000):
+    """Tempo médio (s) por execução do programa com cada despacho"""
+    # Linhas lidas como no load_file original
+    with open(path, 'r') as file:
+        lines = [line.strip() for line in file]
+    program = load_program(path)
+    instrs = [program.decoded[i] for i in range(len(program))]
+    instrs = [instr for instr in instrs if instr is not None]
+    machine = Machine(program)
+    simulator = BaselineSimulator()
+
+    def run_original():
+        # Laço de execução de MIPSSimulator.run_all
+        simulator.registers = {}
+        simulator.memory = {}
+        simulator.init_registers()
+        for bin_instr in lines:
+            parsed = parse_instruction(bin_instr)
+            if parsed:
+                simulator.execute_instruction(parsed)
+
+    def run_table():
+        machine.reset()
+        regs = machine.registers
+        for instr in instrs:
+            instr.handler(machine, regs, instr)
+
+    def dis_original():
+        for bin_instr in lines:
+            bin_to_assembly(bin_instr)
+
+    def dis_table():
+        for instr in instrs:
+            disassemble(instr)
+
+    return {
+        'file': path,
+        'instructions': len(instrs),
+        'execute_original': _best(run_original, repeat, number),
+        'execute_table': _best(run_table, repeat, number),
+        'disassemble_original': _best(dis_original, repeat, number),
+        'disassemble_table': _best(dis_table, repeat, number),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compara o simulador original com o despacho por tabelas')
+    parser.add_argument('programs', nargs='*', help='arquivos de instruções (padrão: final*.txt)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    programs = args.programs or default_programs()
+    print(f"{'programa':<14}{'instr':>6}{'exec original':>15}{'exec tabela':>13}"
+          f"{'asm original':>14}{'asm tabela':>12}")
+    for path in programs:
+        r = bench_program(path, args.repeat, args.number)
+        per = r['instructions'] or 1
+        print(f"{os.path.basename(path):<14}{r['instructions']:>6}"
+              f"{r['execute_original'] / per * 1e9:>12.0f} ns{r['execute_table'] / per * 1e9:>10.0f} ns"
+              f"{r['disassemble_original'] / per * 1e9:>11.0f} ns{r['disassemble_table'] / per * 1e9:>9.0f} ns")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
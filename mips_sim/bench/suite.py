@@ -0,0 +1,234 @@
+#====================================================================================
+# MIPS Simulator - suíte de benchmarks
+#
+# Descrição: Gera os programas sintéticos de mips_sim.bench.workloads e mede,
+# separadamente, carregamento de arquivo (text/hex/bin), decodificação,
+# tradução para assembly e execução (interpretada e compilada), com
+# aquecimento e repetições. O resultado é um JSON com metadados (commit,
+# Python, plataforma) que pode ser comparado com o de outro commit para
+# detectar regressões.
+#
+# Uso:
+#   python -m mips_sim.bench.suite -o atual.json
+#   python -m mips_sim.bench.suite --compare base.json --threshold 0.10
+#   python -m mips_sim.bench.suite --workload memory --param iterations=200000
+#====================================================================================
+
+import argparse
+import datetime
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from ..core import Machine, Program
+from ..isa import disassemble
+from ..loader import read_words
+from .workloads import WORKLOADS, generate
+
+FORMAT_VERSION = 1
+
+def measure(func, setup=None, warmup=1, repeat=5):
+    """Tempos (s) de repeat execuções de func, depois de warmup execuções descartadas.
+
+    setup, se dado, roda antes de cada execução e não entra na medida.
+    """
+    times = []
+    for index in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if index >= warmup:
+            times.append(elapsed)
+    return times
+
+def _write_formats(words, directory):
+    """Grava words em .txt, .hex e .bin e retorna {formato: caminho}"""
+    paths = {}
+    paths['text'] = os.path.join(directory, 'programa.txt')
+    with open(paths['text'], 'w') as f:
+        f.write('\n'.join(f"{word:032b}" for word in words))
+    paths['hex'] = os.path.join(directory, 'programa.hex')
+    with open(paths['hex'], 'w') as f:
+        f.write('\n'.join(f"{word:08x}" for word in words))
+    paths['bin'] = os.path.join(directory, 'programa.bin')
+    swapped = words[:]
+    if sys.byteorder == 'little':
+        swapped.byteswap()
+    with open(paths['bin'], 'wb') as f:
+        f.write(swapped.tobytes())
+    return paths
+
+def phase_cases(words, phase, directory):
+    """Casos [(nome, func, setup, itens)] de uma fase; itens é o divisor do tempo por item"""
+    if phase == 'load':
+        paths = _write_formats(words, directory)
+        return [(f"load_{fmt}", (lambda path=path, fmt=fmt: read_words(path, fmt)), None, len(words))
+                for fmt, path in paths.items()]
+
+    if phase == 'decode':
+        def decode_all():
+            decoded = Program.from_words(words).decoded
+            for index in range(len(words)):
+                decoded[index]
+        return [('decode', decode_all, None, len(words))]
+
+    program = Program.from_words(words)
+    instrs = [program.decoded[index] for index in range(len(words))]
+    if phase == 'disassemble':
+        def disassemble_all():
+            for instr in instrs:
+                disassemble(instr)
+        return [('disassemble', disassemble_all, None, len(words))]
+
+    # Execução: a contagem de instruções vem de uma execução de referência
+    machine = Machine(program)
+    machine.run()
+    executed = machine.executed
+    compiled = phase == 'execute_compiled'
+    return [(phase, lambda: machine.run(compiled=compiled), machine.reset, executed)]
+
+def run_suite(workloads=None, params=None, warmup=1, repeat=5, log=None):
+    """Executa a suíte e retorna o documento de resultados (dict serializável em JSON)"""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name in workloads or WORKLOADS:
+            _, phases, defaults = WORKLOADS[name]
+            workload_params = {**defaults, **(params or {}).get(name, {})}
+            words = generate(name, **workload_params)
+            for phase in phases:
+                for case, func, setup, items in phase_cases(words, phase, directory):
+                    times = measure(func, setup, warmup, repeat)
+                    best = min(times)
+                    result = {
+                        'workload': name,
+                        'params': workload_params,
+                        'case': case,
+                        'items': items,
+                        'min': best,
+                        'median': statistics.median(times),
+                        'mean': statistics.fmean(times),
+                        'ns_per_item': best / items * 1e9 if items else None,
+                    }
+                    results.append(result)
+                    if log is not None:
+                        log(result)
+    return {
+        'format': FORMAT_VERSION,
+        'meta': metadata(warmup, repeat),
+        'results': results,
+    }
+
+def metadata(warmup, repeat):
+    return {
+        'commit': _git_commit(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'warmup': warmup,
+        'repeat': repeat,
+    }
+
+def _git_commit():
+    """Hash do commit atual, se o código estiver em um repositório git"""
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+def _key(result):
+    return result['workload'], result['case']
+
+def compare(baseline, current, threshold=0.10):
+    """Compara dois documentos de resultados pelo tempo mínimo de cada caso.
+
+    Retorna [(workload, caso, razão atual/base, regressão?)] para os casos
+    presentes nos dois; regressão é razão > 1 + threshold. Casos com
+    parâmetros diferentes não são comparados.
+    """
+    base = {_key(result): result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        old = base.get(_key(result))
+        if old is None or old['params'] != result['params']:
+            continue
+        ratio = result['min'] / old['min']
+        rows.append((result['workload'], result['case'], ratio, ratio > 1 + threshold))
+    return rows
+
+def _parse_params(items):
+    """['memory.iterations=1000', 'iterations=10'] -> {workload: {param: valor}}
+
+    Sem prefixo, o parâmetro vale para todos os workloads que o aceitam;
+    com prefixo, tem prioridade sobre o sem prefixo.
+    """
+    params = {}
+    parsed = []
+    for item in items:
+        key, _, value = item.partition('=')
+        workload, _, name = key.rpartition('.')
+        parsed.append((workload, name, int(value)))
+    for workload, name, value in sorted(parsed, key=lambda entry: bool(entry[0])):
+        if workload:
+            targets = [workload]
+        else:
+            targets = [target for target, (generator, _, _) in WORKLOADS.items()
+                       if name in inspect.signature(generator).parameters]
+        for target in targets:
+            params.setdefault(target, {})[name] = value
+    return params
+
+def _print_result(result):
+    print(f"{result['workload']:<8}{result['case']:<18}{result['items']:>10}"
+          f"{result['min'] * 1e3:>11.2f} ms{result['ns_per_item']:>10.0f} ns/item", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Suíte de benchmarks com programas sintéticos')
+    parser.add_argument('--workload', action='append', choices=sorted(WORKLOADS),
+                        help='workloads a executar (padrão: todos; pode repetir)')
+    parser.add_argument('--param', action='append', default=[], metavar='[WORKLOAD.]NOME=VALOR',
+                        help='parâmetro dos geradores, ex.: memory.iterations=200000')
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', '-o', default=None, help='arquivo JSON de saída (padrão: saída padrão)')
+    parser.add_argument('--compare', default=None, metavar='BASE.json',
+                        help='compara com um resultado anterior; sai com código 1 se houver regressão')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='piora relativa considerada regressão (padrão: 0.10)')
+    args = parser.parse_args(argv)
+
+    # A base é lida antes de rodar e de gravar -o, que pode ser o mesmo arquivo
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    document = run_suite(args.workload, _parse_params(args.param), args.warmup, args.repeat, _print_result)
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if baseline is not None:
+        regressions = 0
+        for workload, case, ratio, regression in compare(baseline, document, args.threshold):
+            flag = '  REGRESSÃO' if regression else ''
+            print(f"{workload:<8}{case:<18}{ratio:>8.2f}x{flag}", file=sys.stderr)
+            regressions += regression
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+#====================================================================================
+# MIPS Simulator - custo da gravação do histórico
+#
+# Mede instruções por segundo do laço de memória de mips_sim.bench.workloads
+# com a gravação desligada (caminho normal de Machine.run), comparada ao laço
+# do interpretador chamado diretamente, e com a gravação ligada em memória e
+# em arquivo.
+#
+# Uso: python -m mips_sim.bench.trace [--iterations N] [--repeat N]
+#====================================================================================
+
+import argparse
+import os
+import tempfile
+import time
+
+from ..core import Machine
+from ..trace import TraceRecorder
+from .workloads import build
+
+def _best(funcs, repeat):
+    """Melhor tempo de cada função; as funções se alternam a cada rodada para
+    que variações de frequência da CPU afetem todas igualmente"""
+    best = {}
+    for _ in range(repeat):
+        for key, func in funcs.items():
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best[key] = min(best.get(key, elapsed), elapsed)
+    return best
+
+def bench_trace(iterations=12000, repeat=5):
+    """Tempo (s) de cada modo de execução e número de instruções executadas"""
+    program = build('memory', iterations=iterations)
+    machine = Machine(program)
+    machine.run()
+    instructions = machine.executed
+
+    def interpret():
+        machine.reset()
+        machine._interpret(0, instructions)
+
+    def disabled():
+        machine.reset()
+        machine.run()
+
+    def traced(path=None):
+        def run():
+            recorder = TraceRecorder(path)
+            recorder.attach(machine)
+            machine.reset()
+            machine.run()
+            recorder.close(machine)
+        return run
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = _best({
+            'interpret_loop': interpret,
+            'trace_disabled': disabled,
+            'trace_memory': traced(),
+            'trace_file': traced(os.path.join(directory, 'bench.trace')),
+        }, repeat)
+    results['instructions'] = instructions
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mede o custo da gravação do histórico de execução')
+    parser.add_argument('--iterations', type=int, default=12000, help='iterações do laço')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    r = bench_trace(args.iterations, args.repeat)
+    per = r['instructions']
+    base = r['interpret_loop']
+    print(f"{r['instructions']} instruções")
+    for key, label in (('interpret_loop', 'laço do interpretador'),
+                       ('trace_disabled', 'Machine.run, sem trace'),
+                       ('trace_memory', 'trace em memória'),
+                       ('trace_file', 'trace em arquivo')):
+        print(f"{label:<24}{r[key] / per * 1e9:>8.0f} ns/instr{per / r[key] / 1e6:>8.2f} MIPS"
+              f"{(r[key] / base - 1) * 100:>+9.1f} %")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
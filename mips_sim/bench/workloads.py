@@ -0,0 +1,136 @@
+#====================================================================================
+# MIPS Simulator - geradores de programas sintéticos
+#
+# Descrição: Gera programas binários parametrizados (listas de palavras de 32
+# bits) para os benchmarks: código aritmético sem desvios, laços com muitas
+# leituras/escritas na memória, laços com muitos desvios e programas enormes
+# para estressar o carregador e o decodificador. As instruções são
+# codificadas a partir das tabelas de mips_sim.isa.
+#
+# Uso:
+#     from mips_sim.bench.workloads import WORKLOADS, build
+#     program = build('memory', iterations=10000)
+#====================================================================================
+
+import random
+from array import array
+
+from ..core import Program
+from ..isa import PRIMARY, SPECIAL
+
+# Registradores usados pelos geradores
+ZERO, V0, T0, T1, T2, T3, T4, T5, T6, T7 = 0, 2, 8, 9, 10, 11, 12, 13, 14, 15
+
+_SPECS = {spec.name: spec for spec in PRIMARY + SPECIAL if spec is not None}
+
+def encode(name, rs=0, rt=0, rd=0, shamt=0, imm=0, target=0):
+    """Palavra de 32 bits da instrução name com os campos dados"""
+    spec = _SPECS[name]
+    if spec.opcode == 0:
+        return (rs << 21) | (rt << 16) | (rd << 11) | (shamt << 6) | spec.funct
+    if name in ('j', 'jal'):
+        return (spec.opcode << 26) | (target & 0x3FFFFFF)
+    return (spec.opcode << 26) | (rs << 21) | (rt << 16) | (imm & 0xFFFF)
+
+def load_constant(reg, value):
+    """Instruções (lui + addi) que colocam a constante de 32 bits value em reg"""
+    high = ((value + 0x8000) >> 16) & 0xFFFF
+    low = value - (high << 16)
+    if low < -0x8000:
+        low += 1 << 32
+    return [encode('lui', rt=reg, imm=high), encode('addi', rs=reg, rt=reg, imm=low)]
+
+def _loop(setup, body, iterations):
+    """setup; $t0 = iterations; repete body até $t0 chegar a 0"""
+    words = list(setup) + load_constant(T0, iterations)
+    start = len(words)
+    words += body
+    words.append(encode('addi', rs=T0, rt=T0, imm=-1))
+    offset = start - (len(words) + 1)
+    words.append(encode('bne', rs=T0, rt=ZERO, imm=offset))
+    return words
+
+def alu_straight(instructions=100_000, seed=1):
+    """Código aritmético sem desvios (add/sub/and/or/sll/slt/addi/mult)"""
+    rng = random.Random(seed)
+    regs = (T1, T2, T3, T4, T5, T6, T7)
+    words = [encode('addi', rt=reg, imm=rng.randrange(1, 1000)) for reg in regs]
+    while len(words) < instructions:
+        kind = rng.randrange(8)
+        rd, rs, rt = rng.choice(regs), rng.choice(regs), rng.choice(regs)
+        if kind < 6:
+            name = ('add', 'sub', 'and', 'or', 'slt', 'add')[kind]
+            words.append(encode(name, rs=rs, rt=rt, rd=rd))
+        elif kind == 6:
+            words.append(encode('sll', rt=rt, rd=rd, shamt=rng.randrange(1, 4)))
+        else:
+            words.append(encode('addi', rs=rs, rt=rd, imm=rng.randrange(-500, 500)))
+    return words[:instructions]
+
+def memory_loop(iterations=50_000, footprint=64 * 1024, base=0x10000000):
+    """Laço que lê, soma e escreve palavras percorrendo footprint bytes (potência de 2)"""
+    setup = load_constant(T5, footprint - 4) + load_constant(T6, base) + [encode('addi', rt=T1, imm=0)]
+    body = [
+        encode('and', rs=T1, rt=T5, rd=T3),        # deslocamento dentro da área
+        encode('add', rs=T3, rt=T6, rd=T3),        # endereço = base + deslocamento
+        encode('lw', rs=T3, rt=T2, imm=0),
+        encode('add', rs=T2, rt=T0, rd=T2),
+        encode('sw', rs=T3, rt=T2, imm=0),
+        encode('lw', rs=T3, rt=T4, imm=0),
+        encode('sw', rs=T3, rt=T4, imm=4),
+        encode('addi', rs=T1, rt=T1, imm=8),
+    ]
+    return _loop(setup, body, iterations)
+
+def branch_loop(iterations=50_000):
+    """Laço com desvios dependentes de dados e chamadas (beq/bne/slt/j/jal/jr)"""
+    setup = [encode('addi', rt=T7, imm=1), encode('addi', rt=T6, imm=3)]
+    # O corpo começa logo depois de setup + load_constant (4 palavras)
+    start = len(setup) + 2
+    body = [
+        encode('and', rs=T0, rt=T7, rd=T2),        # 0: $t2 = $t0 & 1
+        encode('beq', rs=T2, rt=ZERO, imm=1),      # 1: pares pulam a próxima
+        encode('addi', rs=T3, rt=T3, imm=1),       # 2
+        encode('slt', rs=T0, rt=T6, rd=T4),        # 3
+        encode('bne', rs=T4, rt=ZERO, imm=1),      # 4
+        encode('addi', rs=T5, rt=T5, imm=1),       # 5
+        encode('jal', target=start + 9),           # 6: chama a "função" em 9
+        encode('j', target=start + 11),            # 7: volta ao fim do corpo
+        encode('addi', rt=T1, imm=0),              # 8: nunca executada
+        encode('add', rs=T1, rt=T0, rd=T1),        # 9: função
+        encode('jr', rs=31),                       # 10
+    ]
+    return _loop(setup, body, iterations)
+
+def huge_program(instructions=1_000_000, seed=2):
+    """Programa enorme de instruções válidas e variadas, para carregador/decodificador.
+
+    Não é feito para ser executado do início ao fim (os desvios são aleatórios).
+    """
+    rng = random.Random(seed)
+    names = sorted(name for name, spec in _SPECS.items() if spec.execute is not None)
+    words = array('I')
+    for _ in range(instructions):
+        name = rng.choice(names)
+        words.append(encode(name, rs=rng.randrange(32), rt=rng.randrange(32), rd=rng.randrange(32),
+                            shamt=rng.randrange(32), imm=rng.randrange(-64, 64) << 2,
+                            target=rng.randrange(instructions)))
+    return words
+
+# Nome -> (gerador, fases medidas, parâmetros padrão)
+WORKLOADS = {
+    'alu': (alu_straight, ('load', 'decode', 'disassemble', 'execute', 'execute_compiled'),
+            {'instructions': 100_000}),
+    'memory': (memory_loop, ('decode', 'execute', 'execute_compiled'), {'iterations': 50_000}),
+    'branch': (branch_loop, ('decode', 'execute', 'execute_compiled'), {'iterations': 50_000}),
+    'huge': (huge_program, ('load', 'decode', 'disassemble'), {'instructions': 1_000_000}),
+}
+
+def generate(name, **params):
+    """Palavras do workload name (parâmetros omitidos usam o padrão)"""
+    generator, _, defaults = WORKLOADS[name]
+    return array('I', generator(**{**defaults, **params}))
+
+def build(name, **params):
+    """Program (mips_sim.core) do workload name"""
+    return Program.from_words(generate(name, **params))
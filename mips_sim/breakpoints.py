@@ -0,0 +1,345 @@
+#====================================================================================
+# MIPS Simulator - pontos de parada e de observação
+#
+# Descrição: Pontos de parada (breakpoints) por endereço, opcionalmente com
+# condição (ex.: "$t1 == 10"), e pontos de observação (watchpoints) em
+# registradores e palavras da memória.
+#
+# Nada é verificado a cada instrução. Antes de executar, Machine.run pede a
+# este objeto uma "sobreposição" das instruções decodificadas do programa em
+# que só as linhas que podem disparar são trocadas por armadilhas (Trap):
+#   - a linha de cada ponto de parada;
+#   - as instruções que escrevem em um registrador observado (destino
+#     conhecido na decodificação);
+#   - os stores, se há memória observada; a armadilha testa primeiro um mapa
+#     de bits por página (um byte por página de 4 KiB) e só então o conjunto
+#     de endereços observados.
+# As demais instruções rodam sem custo extra, tanto no interpretador quanto
+# nos blocos compilados (blocos com armadilhas são interpretados).
+#
+# Um ponto de parada para antes de executar a instrução (STATUS_BREAK); um
+# ponto de observação para depois da instrução que mudou o valor
+# (STATUS_WATCH). O motivo da última parada fica em Breakpoints.hit.
+#
+# Uso:
+#     points = Breakpoints()
+#     points.attach(machine)
+#     points.add(0x40, "$t1 == 10")
+#     points.watch_register('$t0')
+#     points.watch_memory(0x10000000)
+#     machine.run()            # -> 'break' ou 'watch'
+#     print(points.hit)
+#====================================================================================
+
+import re
+from collections import namedtuple
+
+from .core import Instruction
+from .isa import MASK32, NUM_REGISTERS, REGISTER_NAMES, BreakpointHit, WatchpointHit, lookup, register_name
+from .memory import PAGE_SHIFT
+from .pipeline import OPERANDS
+from .profiler import STORE_OPS
+
+class Hit(namedtuple('Hit', ('kind', 'pc', 'target', 'old', 'new'))):
+    """Motivo de uma parada: kind é 'breakpoint', 'register' ou 'memory'; target é o
+    registrador ou endereço observado e old/new os valores antes e depois"""
+
+    __slots__ = ()
+
+    def __str__(self):
+        if self.kind == 'breakpoint':
+            return f"Ponto de parada em 0x{self.pc:08x}"
+        if self.kind == 'register':
+            where = register_name(self.target)
+        else:
+            where = f"Memória 0x{self.target:08x}"
+        return f"{where} mudou de {self.old} para {self.new} (instrução em 0x{self.pc:08x})"
+
+# Condições: comparações entre registradores e constantes, ligadas por and/or
+_TOKEN = re.compile(r"\s*(?:(\$\w+)|(-?0[xX][0-9a-fA-F]+|-?\d+)|(==|!=|<=|>=|<|>)|(and|or|&&|\|\|))")
+_CONNECTORS = {'and': 'and', '&&': 'and', 'or': 'or', '||': 'or'}
+
+def _signed(value):
+    return value - 0x100000000 if value & 0x80000000 else value
+
+def _register_number(name):
+    """Número do registrador a partir do nome ('$t0', '$8', '$hi')"""
+    name = name.lower()
+    if name in REGISTER_NAMES:
+        return REGISTER_NAMES.index(name)
+    if name[1:].isdigit() and int(name[1:]) < 32:
+        return int(name[1:])
+    raise ValueError(f"Registrador desconhecido: {name}")
+
+def compile_condition(text):
+    """Função regs -> bool da condição text (valores comparados com sinal), ex.:
+    "$t1 == 10", "$a0 >= $a1 and $v0 != -1"""
+    parts = []
+    position = 0
+    expect = 'operand'
+    while position < len(text.rstrip()):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"Condição inválida: {text!r} (posição {position})")
+        position = match.end()
+        register, number, operator, connector = match.groups()
+        if register is not None or number is not None:
+            if expect != 'operand':
+                raise ValueError(f"Condição inválida: {text!r} (operador esperado)")
+            if register is not None:
+                parts.append(f"s(r[{_register_number(register)}])")
+            else:
+                parts.append(str(_signed(int(number, 0) & MASK32)))
+            expect = 'operator' if len(parts) % 4 == 1 else 'connector'
+        elif operator is not None:
+            if expect != 'operator':
+                raise ValueError(f"Condição inválida: {text!r} (operando esperado)")
+            parts.append(operator)
+            expect = 'operand'
+        else:
+            if expect != 'connector':
+                raise ValueError(f"Condição inválida: {text!r} (comparação incompleta)")
+            parts.append(_CONNECTORS[connector])
+            expect = 'operand'
+    if expect != 'connector':
+        raise ValueError(f"Condição inválida: {text!r} (comparação incompleta)")
+    return eval(f"lambda r: {' '.join(parts)}", {'s': _signed})
+
+class Trap(Instruction):
+    """Instrução com os mesmos campos da original, mas executada por _execute_trap"""
+
+    __slots__ = ('owner', 'original', 'condition', 'watched', 'store')
+
+def _execute_trap(machine, regs, trap):
+    owner = trap.owner
+    pc = machine.pc - 4
+    condition = trap.condition
+    if condition is not None:
+        if owner.resume_pc == pc:
+            owner.resume_pc = None
+        elif condition is True or condition(regs):
+            owner.hit = Hit('breakpoint', pc, None, None, None)
+            raise BreakpointHit(pc)
+
+    address = None
+    if trap.store:
+        address = (regs[trap.rs] + trap.simm) & MASK32 & ~3
+        if owner.pages[address >> PAGE_SHIFT] and address in owner.addresses:
+            old_word = machine.memory.load_word(address)
+        else:
+            address = None
+    old = [regs[reg] for reg in trap.watched]
+
+    trap.original(machine, regs, trap)
+
+    for reg, value in zip(trap.watched, old):
+        if regs[reg] != value:
+            owner.hit = Hit('register', pc, reg, value, regs[reg])
+            raise WatchpointHit(pc)
+    if address is not None:
+        new_word = machine.memory.load_word(address)
+        if new_word != old_word:
+            owner.hit = Hit('memory', pc, address, old_word, new_word)
+            raise WatchpointHit(pc)
+
+class _Overlay(dict):
+    """Instruções decodificadas com armadilhas: as demais linhas vêm de base na primeira leitura"""
+
+    def __init__(self, base, traps):
+        super().__init__(traps)
+        self.base = base
+
+    def __missing__(self, index):
+        instr = self[index] = self.base[index]
+        return instr
+
+def _program_words(program):
+    """Pares (índice, palavra) das linhas válidas do programa"""
+    if program.words is not None:
+        return enumerate(program.words)
+    return ((index, instr.word) for index, instr in enumerate(program.decoded) if instr is not None)
+
+def _word_effects(word):
+    """(registradores escritos, é store) da instrução word"""
+    spec = lookup(word >> 26, word & 0x3F)
+    if spec is None:
+        return (), False
+    writes = ()
+    entry = OPERANDS.get(spec.name)
+    if entry is not None:
+        fields = {'rs': (word >> 21) & 0x1F, 'rt': (word >> 16) & 0x1F, 'rd': (word >> 11) & 0x1F}
+        writes = tuple(name if isinstance(name, int) else fields[name] for name in entry[2])
+    return writes, spec.name in STORE_OPS
+
+def _check_line(program, pc):
+    """ValueError se pc é uma linha de program que não é uma instrução válida.
+
+    O interpretador só pula essas linhas, sem executá-las nem contá-las, então
+    não há onde pôr a armadilha de um ponto de parada.
+    """
+    line = pc >> 2
+    if line < len(program) and program.decoded[line] is None:
+        raise ValueError(f"Linha {line + 1} (0x{pc:08x}) não é uma instrução válida")
+
+class Breakpoints:
+    """Pontos de parada (por endereço) e de observação (registradores e memória) de uma máquina"""
+
+    def __init__(self):
+        # Endereço -> texto da condição (None = incondicional)
+        self.breakpoints = {}
+        self._conditions = {}
+        self.registers = set()
+        self.addresses = set()
+        # Páginas com algum endereço observado, um byte por página do espaço de 32 bits
+        self.pages = bytearray(1 << (32 - PAGE_SHIFT))
+        # Motivo da última parada (Hit) e ponto de parada a pular ao continuar
+        self.hit = None
+        self.resume_pc = None
+        self._overlay = None
+        # Máquina ligada com attach, usada por add para validar o endereço
+        self.machine = None
+
+    def attach(self, machine):
+        machine.breakpoints = self
+        self.machine = machine
+        self.reset(machine)
+
+    def detach(self, machine):
+        machine.breakpoints = None
+        self.machine = None
+
+    def reset(self, machine):
+        """Esquece a última parada (chamado por Machine.reset)"""
+        self.hit = None
+        self.resume_pc = None
+
+    def __bool__(self):
+        return bool(self.breakpoints or self.registers or self.addresses)
+
+    def _changed(self):
+        self._overlay = None
+
+    def add(self, pc, condition=None):
+        """Ponto de parada no endereço pc (em bytes); condition é um texto como "$t1 == 10".
+
+        Com uma máquina ligada, pc não pode ser uma linha inválida do programa
+        (não há instrução para parar antes; ver invalid_lines).
+        """
+        if pc & 3:
+            raise ValueError(f"Endereço desalinhado: 0x{pc:08x}")
+        if self.machine is not None:
+            _check_line(self.machine.program, pc)
+        compiled = compile_condition(condition) if condition else True
+        self.breakpoints[pc] = condition or None
+        self._conditions[pc] = compiled
+        self._changed()
+
+    def remove(self, pc):
+        self.breakpoints.pop(pc, None)
+        self._conditions.pop(pc, None)
+        self._changed()
+
+    def toggle(self, pc):
+        """Liga ou desliga um ponto de parada incondicional em pc; retorna se ficou ligado"""
+        if pc in self.breakpoints:
+            self.remove(pc)
+            return False
+        self.add(pc)
+        return True
+
+    def watch_register(self, register):
+        """Observa um registrador (nome como '$t0' ou número)"""
+        number = register if isinstance(register, int) else _register_number(register)
+        if not 0 < number < NUM_REGISTERS:
+            raise ValueError(f"Registrador não pode ser observado: {register_name(number)}")
+        self.registers.add(number)
+        self._changed()
+
+    def unwatch_register(self, register):
+        self.registers.discard(register if isinstance(register, int) else _register_number(register))
+        self._changed()
+
+    def watch_memory(self, address):
+        """Observa a palavra que contém address"""
+        address &= MASK32 & ~3
+        self.addresses.add(address)
+        self.pages[address >> PAGE_SHIFT] = 1
+        self._changed()
+
+    def unwatch_memory(self, address):
+        address &= MASK32 & ~3
+        self.addresses.discard(address)
+        page = address >> PAGE_SHIFT
+        if not any(other >> PAGE_SHIFT == page for other in self.addresses):
+            self.pages[page] = 0
+        self._changed()
+
+    def invalid_lines(self, program):
+        """Endereços dos pontos de parada em linhas de program que não são instruções válidas"""
+        n = len(program)
+        return sorted(pc for pc in self.breakpoints if pc >> 2 < n and program.decoded[pc >> 2] is None)
+
+    def check(self, program):
+        """ValueError nomeando a linha se algum ponto de parada cai em uma linha inválida de program"""
+        for pc in self.invalid_lines(program):
+            _check_line(program, pc)
+
+    def clear(self):
+        self.breakpoints.clear()
+        self._conditions.clear()
+        for address in self.addresses:
+            self.pages[address >> PAGE_SHIFT] = 0
+        self.addresses.clear()
+        self.registers.clear()
+        self._changed()
+
+    def prepare(self, machine):
+        """Instruções decodificadas (com armadilhas) e linhas com armadilha para machine.run.
+
+        Continuar a partir do ponto de parada em que a máquina parou executa
+        essa instrução antes de voltar a testar o ponto.
+        """
+        hit = self.hit
+        self.resume_pc = machine.pc if hit is not None and hit.kind == 'breakpoint' and hit.pc == machine.pc else None
+        self.hit = None
+        program = machine.program
+        if self._overlay is None or self._overlay[0] is not program:
+            self._overlay = (program,) + self._build(program)
+        return self._overlay[1], self._overlay[2]
+
+    def _build(self, program):
+        n = len(program)
+        watched = {}
+        stores = set()
+        if self.registers or self.addresses:
+            effects = {}
+            for index, word in _program_words(program):
+                effect = effects.get(word)
+                if effect is None:
+                    effect = effects[word] = _word_effects(word)
+                writes, store = effect
+                registers = tuple(reg for reg in writes if reg in self.registers)
+                if registers:
+                    watched[index] = registers
+                if store and self.addresses:
+                    stores.add(index)
+
+        self.check(program)
+
+        # Instruções só traduzíveis (execute None) também recebem armadilha:
+        # trap.original é o _nop que as executa
+        traps = {}
+        lines = {pc >> 2 for pc in self.breakpoints if pc >> 2 < n} | watched.keys() | stores
+        for index in lines:
+            instr = program.decoded[index]
+            if instr is None:
+                continue
+            trap = Trap(instr.word)
+            trap.owner = self
+            trap.original = instr.handler
+            trap.handler = _execute_trap
+            trap.condition = self._conditions.get(index << 2)
+            trap.watched = watched.get(index, ())
+            trap.store = index in stores
+            traps[index] = trap
+        return _Overlay(program.decoded, traps), frozenset(traps)
@@ -0,0 +1,285 @@
+#====================================================================================
+# MIPS Simulator - hierarquia de caches
+#
+# Descrição: Simula caches de dados (L1 e, opcionalmente, L2) no caminho das
+# leituras e escritas feitas por lw/sw. Cada nível é associativo por conjunto,
+# com tamanho, associatividade e tamanho de linha configuráveis, substituição
+# LRU ou FIFO e política de escrita write-back (com alocação na escrita) ou
+# write-through (sem alocação, por padrão). Só os endereços são simulados: os
+# dados continuam na Memory, que não muda.
+#
+# O estado de cada nível fica em arrays planos (tags, carimbos de tempo e bits
+# de sujeira, um elemento por via), sem objetos por linha nem por acesso.
+#
+# Ciclos de espera: uma falha na L1 espera a latência do nível seguinte (e,
+# se ele também falhar, a do seguinte, até a memória). Escritas repassadas
+# (write-through) e write-backs de linhas sujas vão para um buffer de escrita
+# e não geram espera, mas são contados como tráfego do nível seguinte.
+#
+# Uso:
+#     caches = CacheHierarchy(Cache(8192, 2, 32), Cache(262144, 8, 64, hit_latency=10))
+#     caches.attach(machine)
+#     machine.run()
+#     report = caches.report(machine)
+#====================================================================================
+
+from array import array
+
+from .isa import PRIMARY
+from .profiler import LOAD_OPS, STORE_OPS
+
+POLICIES = ('lru', 'fifo')
+
+# Latência (ciclos) da memória principal
+DEFAULT_MEMORY_LATENCY = 100
+
+# Pontos quentes incluídos no relatório
+DEFAULT_HOTSPOTS = 20
+
+# Opcode das instruções de acesso à memória -> é escrita
+ACCESS_OPCODES = {spec.opcode: spec.name in STORE_OPS for spec in PRIMARY
+                  if spec is not None and (spec.name in LOAD_OPS or spec.name in STORE_OPS)}
+
+_SIZE_SUFFIXES = {'K': 1 << 10, 'M': 1 << 20}
+
+def _parse_size(text):
+    """'32K' -> 32768"""
+    text = text.strip().upper().rstrip('B')
+    factor = _SIZE_SUFFIXES.get(text[-1:], 1)
+    if factor != 1:
+        text = text[:-1]
+    return int(text) * factor
+
+def _power_of_two(value):
+    return value > 0 and not value & (value - 1)
+
+class Cache:
+    """Um nível de cache associativo por conjunto (endereços de 32 bits)"""
+
+    def __init__(self, size=8192, associativity=2, line_size=32, policy='lru', write_back=True,
+                 write_allocate=None, hit_latency=1, name='L1'):
+        if policy not in POLICIES:
+            raise ValueError(f"Política de substituição desconhecida: {policy!r} (use {', '.join(POLICIES)})")
+        if not _power_of_two(line_size) or not _power_of_two(associativity):
+            raise ValueError("Tamanho de linha e associatividade precisam ser potências de 2")
+        sets = size // (line_size * associativity)
+        if not _power_of_two(sets) or sets * line_size * associativity != size:
+            raise ValueError(f"Tamanho de cache inválido: {size} (precisa ser {line_size} x {associativity} "
+                             f"x uma potência de 2)")
+        self.name = name
+        self.size = size
+        self.associativity = associativity
+        self.line_size = line_size
+        self.policy = policy
+        self.write_back = write_back
+        # Padrão: write-back aloca na escrita, write-through não
+        self.write_allocate = write_back if write_allocate is None else write_allocate
+        self.hit_latency = hit_latency
+        self.sets = sets
+        self.line_shift = line_size.bit_length() - 1
+        self.set_mask = sets - 1
+        # Próximo nível (None = memória principal) e latência da memória
+        self.next = None
+        self.memory_latency = DEFAULT_MEMORY_LATENCY
+        self.reset()
+
+    @classmethod
+    def from_spec(cls, spec, name='L1'):
+        """Cache a partir de 'size=32K,ways=4,line=64,policy=lru,write=back,latency=1'
+        (campos omitidos ficam com o valor padrão)"""
+        options = {'name': name}
+        for item in filter(None, spec.split(',')):
+            key, sep, value = item.partition('=')
+            key = key.strip()
+            if not sep:
+                raise ValueError(f"Esperado campo=valor na configuração de cache: {item!r}")
+            if key == 'size':
+                options['size'] = _parse_size(value)
+            elif key == 'ways':
+                options['associativity'] = int(value)
+            elif key == 'line':
+                options['line_size'] = _parse_size(value)
+            elif key == 'policy':
+                options['policy'] = value.strip().lower()
+            elif key == 'write':
+                if value not in ('back', 'through'):
+                    raise ValueError(f"Política de escrita desconhecida: {value!r} (use back ou through)")
+                options['write_back'] = value == 'back'
+            elif key == 'allocate':
+                options['write_allocate'] = value.lower() in ('1', 'yes', 'true', 'sim')
+            elif key == 'latency':
+                options['hit_latency'] = int(value)
+            else:
+                raise ValueError(f"Campo desconhecido na configuração de cache: {key!r}")
+        return cls(**options)
+
+    def reset(self):
+        """Invalida todas as linhas e zera as contagens"""
+        slots = self.sets * self.associativity
+        self.tags = array('q', [-1]) * slots
+        self.stamps = array('Q', bytes(8 * slots))
+        self.dirty = bytearray(slots)
+        self.clock = 0
+        self.reads = 0
+        self.writes = 0
+        self.read_misses = 0
+        self.write_misses = 0
+        self.writebacks = 0
+        self.writes_through = 0
+
+    @property
+    def accesses(self):
+        return self.reads + self.writes
+
+    @property
+    def misses(self):
+        return self.read_misses + self.write_misses
+
+    def _below(self, address, write):
+        """Repassa um acesso ao nível seguinte; retorna a latência até o dado"""
+        following = self.next
+        if following is None:
+            return self.memory_latency
+        return following.hit_latency + following.access(address, write)
+
+    def access(self, address, write):
+        """Lê ou escreve address; retorna os ciclos de espera além do acerto neste nível"""
+        line = address >> self.line_shift
+        ways = self.associativity
+        base = (line & self.set_mask) * ways
+        tags = self.tags
+        self.clock += 1
+        if write:
+            self.writes += 1
+        else:
+            self.reads += 1
+
+        try:
+            slot = tags.index(line, base, base + ways)
+        except ValueError:
+            slot = -1
+        if slot >= 0:
+            if self.policy == 'lru':
+                self.stamps[slot] = self.clock
+            if write:
+                if self.write_back:
+                    self.dirty[slot] = 1
+                else:
+                    self.writes_through += 1
+                    self._below(address, True)
+            return 0
+
+        if write:
+            self.write_misses += 1
+            if not self.write_allocate:
+                self.writes_through += 1
+                self._below(address, True)
+                return 0
+        else:
+            self.read_misses += 1
+
+        # Vítima: uma via livre ou a de menor carimbo (menos usada / mais antiga)
+        try:
+            slot = tags.index(-1, base, base + ways)
+        except ValueError:
+            stamps = self.stamps
+            slot = min(range(base, base + ways), key=stamps.__getitem__)
+            if self.dirty[slot]:
+                self.writebacks += 1
+                self._below(tags[slot] << self.line_shift, True)
+        stall = self._below(line << self.line_shift, False)
+        tags[slot] = line
+        self.stamps[slot] = self.clock
+        if write and self.write_back:
+            self.dirty[slot] = 1
+        else:
+            self.dirty[slot] = 0
+            if write:
+                self.writes_through += 1
+                self._below(address, True)
+        return stall
+
+    def stats(self):
+        """Contagens deste nível (serializável em JSON)"""
+        accesses = self.accesses
+        return {
+            'name': self.name,
+            'size': self.size,
+            'associativity': self.associativity,
+            'line_size': self.line_size,
+            'policy': self.policy,
+            'write_back': self.write_back,
+            'accesses': accesses,
+            'reads': self.reads,
+            'writes': self.writes,
+            'misses': self.misses,
+            'read_misses': self.read_misses,
+            'write_misses': self.write_misses,
+            'hit_rate': (accesses - self.misses) / accesses if accesses else None,
+            'miss_rate': self.misses / accesses if accesses else None,
+            'writebacks': self.writebacks,
+            'writes_through': self.writes_through,
+        }
+
+class CacheHierarchy:
+    """L1 (e L2 opcional) no caminho de lw/sw de uma máquina, com contagem de falhas por endereço"""
+
+    # Usado pelo interpretador para decidir se a instrução acessa a memória
+    opcodes = ACCESS_OPCODES
+
+    def __init__(self, l1=None, l2=None, memory_latency=DEFAULT_MEMORY_LATENCY):
+        self.l1 = l1 if l1 is not None else Cache()
+        self.l2 = l2
+        self.levels = [self.l1] if l2 is None else [self.l1, l2]
+        for level, following in zip(self.levels, self.levels[1:] + [None]):
+            level.next = following
+            level.memory_latency = memory_latency
+        self.memory_latency = memory_latency
+        self.misses = array('Q')
+        self.line_misses = {}
+        self.stall_cycles = 0
+
+    def attach(self, machine):
+        machine.caches = self
+        self.reset(machine)
+
+    def detach(self, machine):
+        machine.caches = None
+
+    def reset(self, machine):
+        """Esvazia os caches e zera as contagens (chamado por Machine.reset)"""
+        for level in self.levels:
+            level.reset()
+        self.misses = array('Q', bytes(8 * len(machine.program)))
+        self.line_misses = {}
+        self.stall_cycles = 0
+
+    def access(self, index, opcode, address):
+        """Simula o acesso a address da instrução de memória da linha index.
+
+        Chamado pelo interpretador depois que a instrução executou: um lw/sw
+        que falhou (endereço desalinhado) ou parou em um ponto de parada não
+        acessou a memória e não é contado.
+        """
+        l1 = self.l1
+        missed = l1.misses
+        self.stall_cycles += l1.access(address, self.opcodes[opcode])
+        if l1.misses != missed:
+            self.misses[index] += 1
+            line = address >> l1.line_shift
+            self.line_misses[line] = self.line_misses.get(line, 0) + 1
+
+    def report(self, machine, hotspots=DEFAULT_HOTSPOTS):
+        """Relatório serializável (JSON): contagens por nível, ciclos de espera e pontos de falha"""
+        misses = self.misses
+        top = sorted((index for index, count in enumerate(misses) if count), key=lambda index: -misses[index])
+        lines = sorted(self.line_misses.items(), key=lambda item: -item[1])[:hotspots]
+        shift = self.l1.line_shift
+        return {
+            'levels': [level.stats() for level in self.levels],
+            'memory_latency': self.memory_latency,
+            'stall_cycles': self.stall_cycles,
+            'hotspots': [{'pc': index << 2, 'misses': misses[index], 'assembly': machine.program.assembly(index)}
+                         for index in top[:hotspots]],
+            'addresses': [{'address': line << shift, 'misses': count} for line, count in lines],
+        }
@@ -0,0 +1,452 @@
+#====================================================================================
+# MIPS Simulator - linha de comando
+#
+# Uso:
+#   python -m mips_sim run prog.txt [outro.txt ...] [--json] [--trace-dir traces/]
+#   python -m mips_sim run prog.txt --profile-dir perfis/ [--profile-format csv]
+#   python -m mips_sim run prog.txt --pipeline [--no-forwarding]
+#   python -m mips_sim run prog.txt --break 0x28 --break "0x40:\$t1 == 10" --watch \$t0 --watch 0x10000000
+#   python -m mips_sim run prog.txt --cache [--l1 size=32K,ways=4] [--l2 size=256K,ways=8,latency=10]
+#   python -m mips_sim multicore prog.txt --cores 4 [--lockstep [--quantum N]] [--json]
+#   python -m mips_sim batch diretorio/ "*.bin" [--workers N] [--output res.jsonl]
+#   python -m mips_sim fuzz [--cases N | --time SEGUNDOS] [--workers N] [--engines compiled,vector] [--json]
+#   python -m mips_sim gui
+#====================================================================================
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from .core import DEFAULT_MAX_INSTRUCTIONS, STATUS_END, STATUS_EXIT, Machine, load_program
+from .loader import FORMATS
+
+
+def format_report(machine):
+    """Relatório de registradores no mesmo formato da janela da GUI"""
+    lines = ["Registrador".ljust(15) + "Valor Decimal".ljust(20) + "Valor Hexadecimal"]
+    for reg_name, value in machine.signed_registers().items():
+        hex_value = f"{value & 0xFFFFFFFF:08x}"
+        lines.append(f"{reg_name.ljust(15)}{str(value).ljust(20)}0x{hex_value}")
+    return '\n'.join(lines)
+
+
+def run_program(path, compiled=False, max_instructions=DEFAULT_MAX_INSTRUCTIONS, timeout=None, fmt=None,
+                trace=None, profile=None, pipeline=None, caches=None, breakpoints=None):
+    """Executa um programa do início ao fim e retorna (machine, resultado).
+
+    Com trace (caminho de arquivo), grava o histórico da execução com
+    mips_sim.trace.TraceRecorder; com profile (caminho .json ou .csv), grava
+    o perfil de mips_sim.profiler.Profiler; com pipeline (um
+    mips_sim.pipeline.PipelineModel), inclui em result['pipeline'] os ciclos
+    estimados e, com caches (um mips_sim.cache.CacheHierarchy), inclui em
+    result['caches'] acertos, falhas e ciclos de espera. Nesses casos a
+    execução passa a usar o interpretador. Com breakpoints (um
+    mips_sim.breakpoints.Breakpoints), a execução para no primeiro ponto
+    atingido e result['stop'] descreve o motivo.
+    """
+    start = time.perf_counter()
+    machine = Machine(load_program(path, fmt), max_instructions=max_instructions, timeout=timeout)
+    recorder = None
+    if trace is not None:
+        from .trace import TraceRecorder
+        recorder = TraceRecorder(trace)
+        recorder.attach(machine)
+    profiler = None
+    if profile is not None:
+        from .profiler import Profiler
+        profiler = Profiler()
+        profiler.attach(machine)
+    if pipeline is not None:
+        pipeline.attach(machine)
+    if caches is not None:
+        caches.attach(machine)
+    if breakpoints is not None:
+        breakpoints.attach(machine)
+    machine.run(compiled=compiled)
+    if recorder is not None:
+        recorder.close(machine)
+    if profiler is not None:
+        if profile.endswith('.csv'):
+            profiler.write_csv(machine, profile)
+        else:
+            profiler.write_json(machine, profile)
+    result = machine.to_dict()
+    result['file'] = path
+    if trace is not None:
+        result['trace'] = trace
+    if profile is not None:
+        result['profile'] = profile
+    if pipeline is not None:
+        result['pipeline'] = pipeline.report(machine)
+    if caches is not None:
+        result['caches'] = caches.report(machine)
+    if breakpoints is not None and breakpoints.hit is not None:
+        result['stop'] = str(breakpoints.hit)
+    result['time'] = time.perf_counter() - start
+    return machine, result
+
+
+def cmd_run(args):
+    try:
+        caches = build_caches(args)
+    except ValueError as e:
+        print(f"Erro na configuração de cache: {e}", file=sys.stderr)
+        return 2
+    try:
+        breakpoints = build_breakpoints(args)
+    except ValueError as e:
+        print(f"Erro nos pontos de parada: {e}", file=sys.stderr)
+        return 2
+    status = 0
+    for path in args.programs:
+        trace = None
+        if args.trace_dir:
+            os.makedirs(args.trace_dir, exist_ok=True)
+            trace = os.path.join(args.trace_dir, os.path.basename(path) + '.trace')
+        profile = None
+        if args.profile_dir:
+            os.makedirs(args.profile_dir, exist_ok=True)
+            profile = os.path.join(args.profile_dir, f"{os.path.basename(path)}.profile.{args.profile_format}")
+        pipeline = None
+        if args.pipeline:
+            from .pipeline import PipelineModel
+            pipeline = PipelineModel(forwarding=args.forwarding)
+        if breakpoints is not None:
+            # Validados antes de executar, para não serem relatados como erro de leitura
+            try:
+                program = load_program(path, args.format)
+            except (OSError, ValueError):
+                program = None      # run_program relata o erro de leitura
+            if program is not None:
+                try:
+                    breakpoints.check(program)
+                except ValueError as e:
+                    status = 1
+                    if args.json:
+                        print(json.dumps({'file': path, 'error': f"ponto de parada inválido: {e}"}))
+                    else:
+                        print(f"Ponto de parada inválido em {path}: {e}", file=sys.stderr)
+                    continue
+        try:
+            machine, result = run_program(path, args.compiled, args.max_instructions, args.timeout, args.format,
+                                          trace, profile, pipeline, caches, breakpoints)
+        except (OSError, ValueError) as e:
+            status = 1
+            if args.json:
+                print(json.dumps({'file': path, 'error': str(e)}))
+            else:
+                print(f"Erro ao ler arquivo {path}: {e}", file=sys.stderr)
+            continue
+
+        if machine.status not in (STATUS_END, STATUS_EXIT):
+            status = 1
+        if args.json:
+            print(json.dumps(result))
+        else:
+            if len(args.programs) > 1:
+                print(f"== {path}")
+            print(format_report(machine))
+            print(f"Status: {machine.status} ({machine.executed} instruções)")
+            if machine.error:
+                print(f"Erro: {machine.error}")
+            if 'stop' in result:
+                print(f"Parada: {result['stop']}")
+            if pipeline is not None and pipeline.instructions:
+                stalls = result['pipeline']['stalls']
+                print(f"Pipeline: {pipeline.cycles} ciclos, CPI {pipeline.cpi:.3f} "
+                      f"(bolhas: load-use {stalls['load_use']}, dados {stalls['data']}, "
+                      f"controle {stalls['control']})")
+            if caches is not None:
+                for level in result['caches']['levels']:
+                    miss_rate = f"{100 * level['miss_rate']:.2f}%" if level['accesses'] else "-"
+                    print(f"Cache {level['name']}: {level['accesses']} acessos, {level['misses']} falhas "
+                          f"({miss_rate}), {level['writebacks']} write-backs")
+                print(f"Ciclos de espera da memória: {result['caches']['stall_cycles']}")
+    return status
+
+
+def build_caches(args):
+    """CacheHierarchy das opções --cache/--l1/--l2 (ou None se nenhuma foi dada)"""
+    if not (args.cache or args.l1 or args.l2):
+        return None
+    from .cache import Cache, CacheHierarchy
+    l1 = Cache.from_spec(args.l1 or '', 'L1')
+    l2 = Cache.from_spec(args.l2, 'L2') if args.l2 else None
+    return CacheHierarchy(l1, l2, args.memory_latency)
+
+
+def build_breakpoints(args):
+    """Breakpoints das opções --break/--watch (ou None se nenhuma foi dada)"""
+    if not (args.breaks or args.watches):
+        return None
+    from .breakpoints import Breakpoints
+
+    def address(text):
+        try:
+            return int(text, 0)
+        except ValueError:
+            raise ValueError(f"Endereço inválido: {text!r}") from None
+
+    points = Breakpoints()
+    for spec in args.breaks:
+        pc, _, condition = spec.partition(':')
+        points.add(address(pc), condition.strip() or None)
+    for spec in args.watches:
+        if spec.startswith('$'):
+            points.watch_register(spec)
+        else:
+            points.watch_memory(address(spec))
+    return points
+
+
+def cmd_batch(args):
+    from .batch import collect_programs, run_programs
+
+    paths = collect_programs(args.programs)
+    if not paths:
+        print("Nenhum programa encontrado", file=sys.stderr)
+        return 1
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    status = 0
+    try:
+        results = run_programs(
+            paths,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            max_instructions=args.max_instructions,
+            timeout=args.timeout,
+            compiled=args.compiled,
+            fmt=args.format,
+        )
+        for result in results:
+            if result['status'] not in (STATUS_END, STATUS_EXIT):
+                status = 1
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return status
+
+
+def cmd_multicore(args):
+    from .multicore import MultiCore
+
+    try:
+        programs = [load_program(path, args.format) for path in args.programs]
+        if len(programs) == 1:
+            programs = programs * (args.cores or 1)
+        system = MultiCore(programs, args.cores, shared_size=args.shared_size,
+                           max_instructions=args.max_instructions, timeout=args.timeout)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    with system:
+        start = time.perf_counter()
+        if args.lockstep:
+            statuses = system.run_lockstep(args.quantum, compiled=args.compiled)
+        else:
+            statuses = system.run_parallel(compiled=args.compiled)
+        elapsed = time.perf_counter() - start
+    result = system.to_dict()
+    result['time'] = elapsed
+    if args.json:
+        print(json.dumps(result))
+    else:
+        paths = args.programs * len(programs) if len(args.programs) == 1 else args.programs
+        for core_id, (machine, path) in enumerate(zip(system.cores, paths)):
+            print(f"== núcleo {core_id} ({path})")
+            print(format_report(machine))
+            print(f"Status: {machine.status} ({machine.executed} instruções)")
+            if machine.error:
+                print(f"Erro: {machine.error}")
+        print(f"Total: {system.executed} instruções em {elapsed:.3f}s")
+    return 0 if all(status in (STATUS_END, STATUS_EXIT) for status in statuses) else 1
+
+
+def cmd_fuzz(args):
+    from .fuzz import ENGINES, available_engines, case_from_report, format_report, fuzz, report
+
+    available = available_engines()
+    engines = available if args.engines is None else [name.strip() for name in args.engines.split(',') if name.strip()]
+    for name in engines:
+        if name not in ENGINES:
+            print(f"Motor desconhecido: {name} (opções: {', '.join(ENGINES)})", file=sys.stderr)
+            return 2
+        if name not in available:
+            print(f"Motor indisponível: {name} (requer NumPy)", file=sys.stderr)
+            return 2
+
+    def show(failure):
+        print(json.dumps(failure) if args.json else format_report(failure), flush=True)
+
+    if args.replay:
+        try:
+            with open(args.replay) as f:
+                failures = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            print(f"Erro ao ler {args.replay}: {e}", file=sys.stderr)
+            return 1
+        found = 0
+        for failure in failures:
+            failure = report(case_from_report(failure), engines)
+            if failure is not None:
+                found += 1
+                show(failure)
+        print(f"{len(failures)} casos repetidos, {found} ainda divergem", file=sys.stderr)
+        return 1 if found else 0
+
+    cases = args.cases
+    if cases is None and args.time is None:
+        cases = 10000
+    # Omitidas, valem os padrões de mips_sim.fuzz
+    options = {key: value for key, value in (('chunk', args.chunksize), ('max_length', args.length),
+                                             ('max_budget', args.budget)) if value is not None}
+    start = time.perf_counter()
+    total = instructions = found = 0
+    skipped = {}
+    try:
+        for result in fuzz(cases=cases, seed=args.seed, workers=args.workers, duration=args.time,
+                           engines=engines, shrink_failures=args.shrink, **options):
+            total += result['cases']
+            instructions += result['instructions']
+            for name, count in result['skipped'].items():
+                skipped[name] = skipped.get(name, 0) + count
+            for failure in result['failures']:
+                found += 1
+                show(failure)
+    except KeyboardInterrupt:
+        pass
+    elapsed = time.perf_counter() - start
+    rate = instructions / elapsed * 60 if elapsed else 0
+    if args.json:
+        print(json.dumps({'summary': {'cases': total, 'engines': engines, 'instructions': instructions,
+                                      'time': elapsed, 'divergences': found, 'skipped': skipped}}))
+    message = (f"{total} casos ({', '.join(engines)}): {instructions} instruções em {elapsed:.1f}s "
+               f"({rate:,.0f} instruções/min), {found} divergências")
+    if skipped:
+        message += "; não executados por falta de suporte: " + ', '.join(
+            f"{name} em {count} casos" for name, count in sorted(skipped.items()))
+    print(message, file=sys.stderr)
+    return 1 if found else 0
+
+
+def cmd_gui(args):
+    # Importado só aqui para que o restante da CLI não dependa do tkinter
+    from .gui import main as gui_main
+    gui_main()
+    return 0
+
+
+def positive_int(text):
+    """Tipo do argparse para contagens que precisam ser maiores que zero"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"valor inteiro inválido: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"precisa ser maior que zero: {value}")
+    return value
+
+
+def add_execution_options(parser):
+    """Opções de carregamento e execução comuns aos subcomandos"""
+    parser.add_argument('--format', choices=FORMATS, default=None,
+                        help='formato dos arquivos (padrão: pela extensão, texto se desconhecida)')
+    parser.add_argument('--compiled', action='store_true', help='executa com o compilador de blocos básicos')
+    parser.add_argument('--max-instructions', type=int, default=DEFAULT_MAX_INSTRUCTIONS,
+                        help=f'limite de instruções por programa (padrão: {DEFAULT_MAX_INSTRUCTIONS})')
+    parser.add_argument('--timeout', type=float, default=None, help='limite de tempo por programa, em segundos')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='mips_sim', description='Simulador MIPS')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='executa programas sem interface gráfica')
+    run.add_argument('programs', nargs='+', help='arquivos de programa (.txt, .hex ou .bin)')
+    run.add_argument('--json', action='store_true', help='saída em JSON (uma linha por programa)')
+    run.add_argument('--trace-dir', default=None,
+                     help='grava o histórico de cada programa em DIR/<programa>.trace (ver mips_sim.trace)')
+    run.add_argument('--profile-dir', default=None,
+                     help='grava o perfil de cada programa em DIR/<programa>.profile.json|csv')
+    run.add_argument('--profile-format', choices=('json', 'csv'), default='json',
+                     help='json: resumo por instrução e pontos quentes; csv: histograma por endereço')
+    run.add_argument('--pipeline', action='store_true',
+                     help='estima os ciclos em um pipeline de 5 estágios (CPI e bolhas; ver mips_sim.pipeline)')
+    run.add_argument('--no-forwarding', dest='forwarding', action='store_false',
+                     help='com --pipeline, modela o pipeline sem adiantamento de dados')
+    run.add_argument('--break', dest='breaks', action='append', default=[], metavar='ENDEREÇO[:CONDIÇÃO]',
+                     help='para antes da instrução no endereço, ex.: 0x28 ou "0x28:$t1 == 10" (repetível)')
+    run.add_argument('--watch', dest='watches', action='append', default=[], metavar='REGISTRADOR|ENDEREÇO',
+                     help='para depois da instrução que mudar o registrador ou a palavra, ex.: $t0 (repetível)')
+    run.add_argument('--cache', action='store_true',
+                     help='simula caches de dados para lw/sw (L1 padrão: 8K, 2 vias, linhas de 32 bytes, LRU)')
+    run.add_argument('--l1', default=None, metavar='SPEC',
+                     help='configuração da L1, ex.: size=32K,ways=4,line=64,policy=fifo,write=through,latency=1')
+    run.add_argument('--l2', default=None, metavar='SPEC', help='adiciona uma L2 com a configuração dada')
+    run.add_argument('--memory-latency', type=int, default=100,
+                     help='ciclos de uma leitura na memória principal (padrão: 100)')
+    add_execution_options(run)
+    run.set_defaults(func=cmd_run)
+
+    batch = sub.add_parser('batch', help='executa diretórios de programas em vários processos (JSON Lines)')
+    batch.add_argument('programs', nargs='+', help='diretórios, arquivos ou padrões glob')
+    batch.add_argument('--workers', type=positive_int, default=None,
+                       help='número de processos (padrão: número de CPUs)')
+    batch.add_argument('--chunksize', type=positive_int, default=1, help='programas enviados por tarefa (padrão: 1)')
+    batch.add_argument('--output', '-o', default=None, help='arquivo de saída (padrão: saída padrão)')
+    add_execution_options(batch)
+    batch.set_defaults(func=cmd_batch)
+
+    multicore = sub.add_parser('multicore', help='executa vários núcleos com memória de dados compartilhada')
+    multicore.add_argument('programs', nargs='+',
+                           help='um programa por núcleo, ou um só programa repetido em --cores núcleos')
+    multicore.add_argument('--cores', type=positive_int, default=None,
+                           help='número de núcleos (o núcleo recebe seu número em $a0 e o total em $a1)')
+    multicore.add_argument('--lockstep', action='store_true',
+                           help='intercala os núcleos em um só processo, com resultado reprodutível')
+    multicore.add_argument('--quantum', type=positive_int, default=1,
+                           help='com --lockstep, instruções de cada núcleo por rodada (padrão: 1)')
+    multicore.add_argument('--shared-size', type=int, default=1 << 20,
+                           help='bytes compartilhados a partir de 0x10000000 (múltiplo de 4096; padrão: 1 MiB)')
+    multicore.add_argument('--json', action='store_true', help='saída em JSON')
+    add_execution_options(multicore)
+    multicore.set_defaults(func=cmd_multicore)
+
+    fuzzer = sub.add_parser('fuzz', help='compara os motores de execução com o interpretador de referência')
+    fuzzer.add_argument('--cases', type=int, default=None,
+                        help='número de programas aleatórios (padrão: 10000, ou sem limite com --time)')
+    fuzzer.add_argument('--time', type=float, default=None, help='para depois de SEGUNDOS segundos')
+    fuzzer.add_argument('--seed', type=int, default=0, help='semente do primeiro caso (padrão: 0)')
+    fuzzer.add_argument('--workers', type=positive_int, default=None,
+                        help='número de processos (padrão: número de CPUs)')
+    # Padrões em mips_sim.fuzz, importado só por cmd_fuzz
+    fuzzer.add_argument('--chunksize', type=positive_int, default=None, help='casos por tarefa (padrão: 200)')
+    fuzzer.add_argument('--engines', default=None,
+                        help='motores separados por vírgula: interpreter, checked, step, compiled, vector (padrão: todos)')
+    fuzzer.add_argument('--length', type=int, default=None,
+                        help='número máximo de instruções por programa (padrão: 32)')
+    fuzzer.add_argument('--budget', type=int, default=None,
+                        help='limite de instruções executadas por caso (padrão: 2000)')
+    fuzzer.add_argument('--no-shrink', dest='shrink', action='store_false',
+                        help='não reduz as divergências a um reprodutor mínimo')
+    fuzzer.add_argument('--replay', default=None, metavar='ARQUIVO',
+                        help='repete as divergências gravadas com --json em vez de gerar casos')
+    fuzzer.add_argument('--json', action='store_true',
+                        help='divergências em JSON (uma por linha), seguidas de uma linha {"summary": ...}')
+    fuzzer.set_defaults(func=cmd_fuzz)
+
+    gui = sub.add_parser('gui', help='abre a interface gráfica')
+    gui.set_defaults(func=cmd_gui)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,330 @@
+#====================================================================================
+# MIPS Simulator - compilador de blocos básicos
+#
+# Descrição: Modo de execução "compilado". O programa decodificado é dividido em
+# blocos básicos (sequências de instruções terminadas por um desvio) e cada
+# bloco vira uma função Python gerada uma única vez, com os registradores
+# usados mantidos em variáveis locais e a máscara de 32 bits já embutida em
+# cada operação. A função devolve o PC seguinte; os alvos dos desvios são
+# calculados na compilação. As funções ficam em cache por programa, indexadas
+# pelo endereço inicial do bloco.
+#
+# Instruções sem gerador de código (jr, syscall, instruções não
+# implementadas...) terminam o bloco e são executadas pelo interpretador, de
+# modo que o estado final é sempre o mesmo de Machine.run.
+#====================================================================================
+
+import re
+import time
+import weakref
+
+from .core import CHECK_INTERVAL, STATUS_BUDGET, STATUS_FAULT, STATUS_TIMEOUT
+from .isa import HI, LO, MASK32, ExecutionError
+
+# Geradores de código indexados pelo nome da instrução (OpSpec.name).
+# Cada gerador recebe a Instruction e devolve a lista de linhas do corpo,
+# lendo e escrevendo os registradores como variáveis locais r0..r33.
+TEMPLATES = {}
+
+# Instruções que acessam a memória (load/store) e podem gerar ExecutionError
+MEMORY_TEMPLATES = set()
+
+def template(name, memory=False):
+    """Decorador que registra o gerador de código de uma instrução"""
+    def decorator(gen):
+        TEMPLATES[name] = gen
+        if memory:
+            MEMORY_TEMPLATES.add(name)
+        return gen
+    return decorator
+
+class BlockFault(Exception):
+    """ExecutionError dentro de um bloco compilado.
+
+    count é o número de instruções do bloco concluídas antes da falha e pc
+    o endereço da instrução que falhou; os registradores já foram gravados.
+    """
+
+    def __init__(self, count, pc, error):
+        super().__init__(str(error))
+        self.count = count
+        self.pc = pc
+        self.error = error
+
+def _reg(num):
+    """Expressão de leitura de um registrador ($zero vira a constante 0)"""
+    return f"r{num}" if num else "0"
+
+def _addr(instr):
+    """Expressão do endereço efetivo (base + deslocamento) em 32 bits"""
+    if instr.rs == 0:
+        return str(instr.simm & MASK32)
+    if instr.simm == 0:
+        return f"r{instr.rs}"
+    return f"(r{instr.rs} + {instr.simm}) & 0xFFFFFFFF"
+
+# Escritas em $zero não geram código
+
+@template('add')
+def _add(i):
+    return [f"r{i.rd} = ({_reg(i.rs)} + {_reg(i.rt)}) & 0xFFFFFFFF"] if i.rd else []
+
+@template('sub')
+def _sub(i):
+    return [f"r{i.rd} = ({_reg(i.rs)} - {_reg(i.rt)}) & 0xFFFFFFFF"] if i.rd else []
+
+@template('and')
+def _and(i):
+    return [f"r{i.rd} = {_reg(i.rs)} & {_reg(i.rt)}"] if i.rd else []
+
+@template('or')
+def _or(i):
+    return [f"r{i.rd} = {_reg(i.rs)} | {_reg(i.rt)}"] if i.rd else []
+
+@template('sll')
+def _sll(i):
+    return [f"r{i.rd} = ({_reg(i.rt)} << {i.shamt}) & 0xFFFFFFFF"] if i.rd else []
+
+@template('slt')
+def _slt(i):
+    # Comparação com sinal: inverter o bit 31 preserva a ordem dos valores
+    return [f"r{i.rd} = 1 if ({_reg(i.rs)} ^ 0x80000000) < ({_reg(i.rt)} ^ 0x80000000) else 0"] if i.rd else []
+
+@template('mult')
+def _mult(i):
+    return [
+        f"t = {_reg(i.rs)} * {_reg(i.rt)}",
+        f"r{HI} = (t >> 32) & 0xFFFFFFFF",
+        f"r{LO} = t & 0xFFFFFFFF",
+    ]
+
+@template('addi')
+def _addi(i):
+    if not i.rt:
+        return []
+    if i.rs == 0:
+        return [f"r{i.rt} = {i.simm & MASK32}"]
+    return [f"r{i.rt} = (r{i.rs} + {i.simm}) & 0xFFFFFFFF"]
+
+@template('slti')
+def _slti(i):
+    # simm convertido para a mesma escala "bit 31 invertido" do registrador
+    return [f"r{i.rt} = 1 if ({_reg(i.rs)} ^ 0x80000000) < {(i.simm & MASK32) ^ 0x80000000} else 0"] if i.rt else []
+
+@template('lui')
+def _lui(i):
+    return [f"r{i.rt} = {i.imm << 16}"] if i.rt else []
+
+@template('lw', memory=True)
+def _lw(i):
+    # A leitura é feita mesmo com destino $zero, pois pode falhar (desalinhamento)
+    if i.rt:
+        return [f"r{i.rt} = load({_addr(i)})"]
+    return [f"load({_addr(i)})"]
+
+@template('sw', memory=True)
+def _sw(i):
+    return [f"store({_addr(i)}, {_reg(i.rt)})"]
+
+# Geradores dos desvios que terminam um bloco, indexados pelo nome da instrução.
+# Recebem a Instruction e o endereço da instrução seguinte (PC+4) e devolvem
+# (linhas do corpo, expressão do próximo PC).
+BRANCHES = {}
+
+def branch(name):
+    """Decorador que registra o gerador de código de um desvio"""
+    def decorator(gen):
+        BRANCHES[name] = gen
+        return gen
+    return decorator
+
+@branch('beq')
+def _beq(i, next_pc):
+    target = (next_pc + (i.simm << 2)) & MASK32
+    return [], f"{target} if {_reg(i.rs)} == {_reg(i.rt)} else {next_pc}"
+
+@branch('bne')
+def _bne(i, next_pc):
+    target = (next_pc + (i.simm << 2)) & MASK32
+    return [], f"{target} if {_reg(i.rs)} != {_reg(i.rt)} else {next_pc}"
+
+@branch('j')
+def _j(i, next_pc):
+    return [], str((next_pc & 0xF0000000) | (i.target << 2))
+
+@branch('jal')
+def _jal(i, next_pc):
+    return [f"r31 = {next_pc}"], str((next_pc & 0xF0000000) | (i.target << 2))
+
+_ASSIGN_RE = re.compile(r"^r(\d+) = (.*)$")
+_REG_RE = re.compile(r"\br(\d+)\b")
+
+def _registers_used(lines):
+    """Registradores lidos antes de serem escritos no bloco e registradores escritos"""
+    read, written = set(), set()
+    for line in lines:
+        match = _ASSIGN_RE.match(line)
+        if match:
+            line = match.group(2)
+        for num in _REG_RE.findall(line):
+            if int(num) not in written:
+                read.add(int(num))
+        if match:
+            written.add(int(match.group(1)))
+    return read, written
+
+class Block:
+    """Bloco básico compilado: endereços [start, end), número de instruções e a função gerada"""
+
+    __slots__ = ('start', 'end', 'count', 'func', 'source')
+
+    def __init__(self, start, end, count, func, source):
+        self.start = start
+        self.end = end
+        self.count = count
+        self.func = func
+        self.source = source
+
+def compile_block(program, start):
+    """Compila o bloco básico que começa no endereço start (ou None se vazio)"""
+    decoded = program.decoded
+    body = []
+    count = 0
+    pc = end = start
+    next_expr = None
+    uses_memory = False
+    while (pc >> 2) < len(program):
+        instr = decoded[pc >> 2]
+        if instr is None:
+            pc += 4  # linhas inválidas são ignoradas, como em Machine.run
+            continue
+        op = instr.op
+        if op is None or op.execute is None:
+            break
+        if op.name in BRANCHES:
+            lines, next_expr = BRANCHES[op.name](instr, pc + 4)
+            body.extend(lines)
+            count += 1
+            end = pc + 4
+            break
+        gen = TEMPLATES.get(op.name)
+        if gen is None:
+            break
+        if op.name in MEMORY_TEMPLATES:
+            # Marca (instruções concluídas, endereço) para o tratamento de falhas
+            body.append(f"f = ({count}, {pc})")
+            uses_memory = True
+        body.extend(gen(instr))
+        count += 1
+        pc = end = pc + 4
+
+    if count == 0:
+        return None
+    if next_expr is None:
+        next_expr = str(end)
+
+    read, written = _registers_used(body + [next_expr])
+    lines = [f"def block_{start}(machine, regs):"]
+    if not uses_memory:
+        for num in sorted(read):
+            lines.append(f"    r{num} = regs[{num}]")
+        lines.extend("    " + line for line in body)
+    else:
+        # Em caso de falha de memória, o estado dos registradores precisa ser o
+        # mesmo do interpretador: todos os registradores escritos são carregados
+        # no início e gravados antes de propagar a falha.
+        lines.append("    load = machine.memory.load_word")
+        lines.append("    store = machine.memory.store_word")
+        for num in sorted(read | written):
+            lines.append(f"    r{num} = regs[{num}]")
+        lines.append("    try:")
+        lines.extend("        " + line for line in body)
+        lines.append("    except ExecutionError as e:")
+        for num in sorted(written):
+            lines.append(f"        regs[{num}] = r{num}")
+        lines.append("        raise BlockFault(f[0], f[1], e)")
+    for num in sorted(written):
+        lines.append(f"    regs[{num}] = r{num}")
+    lines.append(f"    return {next_expr}")
+    source = '\n'.join(lines) + '\n'
+
+    namespace = {'ExecutionError': ExecutionError, 'BlockFault': BlockFault}
+    exec(compile(source, f"<bloco 0x{start:08x}>", 'exec'), namespace)
+    return Block(start, end, count, namespace[f"block_{start}"], source)
+
+# Blocos compilados por programa: {Program: {endereço inicial: Block ou None}}
+_BLOCK_CACHE = weakref.WeakKeyDictionary()
+
+def _program_blocks(program):
+    blocks = _BLOCK_CACHE.get(program)
+    if blocks is None:
+        blocks = _BLOCK_CACHE[program] = {}
+    return blocks
+
+def get_block(program, start):
+    """Bloco que começa em start, compilado na primeira vez e reutilizado depois"""
+    blocks = _program_blocks(program)
+    try:
+        return blocks[start]
+    except KeyError:
+        block = blocks[start] = compile_block(program, start)
+        return block
+
+def run_compiled(machine, max_instructions=None, timeout=None, decoded=None, traps=None):
+    """Executa o programa a partir do PC atual usando blocos compilados.
+
+    Produz o mesmo estado e o mesmo status de Machine.run; instruções sem
+    gerador de código, e blocos que ultrapassariam max_instructions, são
+    executados pelo interpretador. decoded e traps (linhas com armadilhas de
+    mips_sim.breakpoints) vêm de Breakpoints.prepare: blocos que contêm uma
+    dessas linhas também são executados pelo interpretador, com decoded.
+    """
+    program = machine.program
+    blocks = _program_blocks(program)
+    n = len(program)
+    regs = machine.registers
+    deadline = time.perf_counter() + timeout if timeout else None
+    executed = machine.executed
+    next_check = executed + CHECK_INTERVAL
+    # Endereço inicial -> o bloco contém uma linha com armadilha
+    trapped = {}
+    pc = machine.pc
+    status = None
+    while status is None:
+        if (pc >> 2) >= n:
+            status = machine._stop_status(pc)
+            break
+        if max_instructions is not None and executed >= max_instructions:
+            status = STATUS_BUDGET
+            break
+        if deadline is not None and executed >= next_check:
+            next_check = executed + CHECK_INTERVAL
+            if time.perf_counter() > deadline:
+                status = STATUS_TIMEOUT
+                break
+        try:
+            block = blocks[pc]
+        except KeyError:
+            block = blocks[pc] = compile_block(program, pc)
+        if block is not None and traps:
+            blocked = trapped.get(pc)
+            if blocked is None:
+                blocked = trapped[pc] = any(index in traps for index in range(block.start >> 2, block.end >> 2))
+            if blocked:
+                block = None
+        if block is not None and (max_instructions is None or executed + block.count <= max_instructions):
+            try:
+                pc = block.func(machine, regs)
+                executed += block.count
+            except BlockFault as fault:
+                executed += fault.count
+                pc = fault.pc
+                machine.error = str(fault.error)
+                status = STATUS_FAULT
+        else:
+            pc, count, status = machine._interpret(pc, 1, decoded)
+            executed += count
+    machine.pc = pc
+    machine.executed = executed
+    machine.status = status
+    return status
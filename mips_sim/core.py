@@ -0,0 +1,597 @@
+#====================================================================================
+# MIPS Simulator - núcleo de execução
+#
+# Aluno: Pietra Aceituno Cavalheiri           RA:  2586576
+# Aluno: Matheus Otenio                       RA: 2553139
+#
+# Descrição: Estado e lógica de execução do processador MIPS, sem dependência de
+# interface gráfica. Usado tanto pela GUI (Tkinter) quanto pela linha de comando.
+#====================================================================================
+
+import os
+import time
+from array import array
+from collections import OrderedDict
+
+from .isa import (
+    HALT_PC,
+    MASK32,
+    NUM_REGISTERS,
+    BreakpointHit,
+    ExecutionError,
+    REGISTER_NAMES,
+    WatchpointHit,
+    disassemble,
+    lookup,
+    register_name,
+)
+from .loader import read_words
+from .memory import Memory
+from .snapshot import Snapshot
+
+def _nop(machine, regs, instr):
+    """Instruções apenas traduzidas (sem efeito na execução)"""
+
+class Instruction:
+    """Instrução decodificada: todos os campos já convertidos para inteiros"""
+
+    __slots__ = ('word', 'opcode', 'rs', 'rt', 'rd', 'shamt', 'funct', 'imm', 'simm', 'target',
+                 'op', 'handler')
+
+    def __init__(self, word):
+        self.word = word
+        self.opcode = word >> 26
+        self.rs = (word >> 21) & 0x1F
+        self.rt = (word >> 16) & 0x1F
+        self.rd = (word >> 11) & 0x1F
+        self.shamt = (word >> 6) & 0x1F
+        self.funct = word & 0x3F
+        self.imm = word & 0xFFFF
+        # Immediate sinalizado (16 bits, complemento de dois)
+        self.simm = self.imm - 0x10000 if self.imm & 0x8000 else self.imm
+        self.target = word & 0x3FFFFFF
+        # Entrada da tabela de despacho, resolvida uma única vez na decodificação
+        self.op = lookup(self.opcode, self.funct)
+        self.handler = self.op.execute if self.op is not None and self.op.execute else _nop
+
+    @property
+    def bits(self):
+        return f"{self.word:032b}"
+
+    def __repr__(self):
+        return f"Instruction(0x{self.word:08x})"
+
+def decode(bin_instr):
+    """Converte uma linha de 32 caracteres '0'/'1' em Instruction (ou None se inválida)"""
+    if len(bin_instr) != 32:
+        return None
+    try:
+        return Instruction(int(bin_instr, 2))
+    except ValueError:
+        return None
+
+def parse_instruction(bin_instr):
+    """Analisa a instrução binária e retorna um dicionário com os campos parseados"""
+    instr = decode(bin_instr)
+    if instr is None:
+        return None
+    
+    parsed = {
+        'opcode': bin_instr[:6],
+        'rs': bin_instr[6:11],
+        'rt': bin_instr[11:16],
+        'rd': bin_instr[16:21],
+        'shamt': bin_instr[21:26],
+        'funct': bin_instr[26:],
+        'immediate': bin_instr[16:],
+        'address': bin_instr[6:],
+        'rs_num': instr.rs,
+        'rt_num': instr.rt,
+        'rd_num': instr.rd,
+        'shamt_num': instr.shamt,
+        'funct_num': instr.funct,
+        'immediate_num': instr.simm,
+        'address_num': instr.target,
+    }
+    return parsed
+
+def bin_to_assembly(bin_instr):
+    """Traduz instrução binária para assembly e retorna dados parseados"""
+    parsed = parse_instruction(bin_instr)
+    if not parsed:
+        return "   ", None
+    return disassemble(decode(bin_instr)), parsed
+
+
+# Número máximo de traduções para assembly guardadas por Program (cache LRU)
+ASSEMBLY_CACHE_SIZE = 16384
+
+class _LazyDecoded(dict):
+    """Instruções de um programa carregado como palavras, decodificadas no primeiro acesso.
+
+    Indexada como a lista de Program.decoded; só as instruções efetivamente
+    executadas (ou exibidas) viram objetos Instruction.
+    """
+
+    def __init__(self, words):
+        super().__init__()
+        self.words = words
+
+    def __missing__(self, index):
+        if not 0 <= index < len(self.words):
+            raise IndexError(index)
+        instr = self[index] = Instruction(self.words[index])
+        return instr
+
+class Program:
+    """Programa decodificado uma única vez.
+
+    Criado a partir das linhas de texto (cada linha vira uma Instruction, ou
+    None para linhas inválidas) ou, com from_words, de um array de palavras
+    já lido por mips_sim.loader, caso em que as linhas originais não são
+    guardadas e as instruções são decodificadas sob demanda. Execução passo a
+    passo, execução completa e tradução para assembly usam sempre esses
+    registros, sem voltar a trabalhar com strings.
+    """
+
+    def __init__(self, lines=()):
+        self._lines = list(lines)
+        self.words = None
+        self.decoded = [decode(line) for line in self._lines]
+        self._length = len(self.decoded)
+        self._assembly = OrderedDict()
+
+    @classmethod
+    def from_words(cls, words):
+        """Programa a partir de palavras de 32 bits (array('I') ou iterável de int)"""
+        program = cls()
+        program._lines = None
+        program.words = words if isinstance(words, array) else array('I', words)
+        program.decoded = _LazyDecoded(program.words)
+        program._length = len(program.words)
+        return program
+
+    def __len__(self):
+        return self._length
+
+    def line(self, index):
+        """Texto da linha index (gerado a partir da palavra se o original não foi guardado)"""
+        if self._lines is not None:
+            return self._lines[index]
+        return f"{self.words[index]:032b}"
+
+    @property
+    def lines(self):
+        """Todas as linhas do programa como texto"""
+        if self._lines is not None:
+            return self._lines
+        return [f"{word:032b}" for word in self.words]
+
+    def assembly(self, index):
+        """Assembly da linha index, traduzido sob demanda.
+
+        As últimas ASSEMBLY_CACHE_SIZE traduções ficam em um cache LRU, de modo
+        que percorrer um programa enorme não guarda o texto de todas as linhas.
+        """
+        cache = self._assembly
+        text = cache.get(index)
+        if text is not None:
+            cache.move_to_end(index)
+            return text
+        instr = self.decoded[index]
+        text = disassemble(instr) if instr is not None else "   "
+        cache[index] = text
+        if len(cache) > ASSEMBLY_CACHE_SIZE:
+            cache.popitem(last=False)
+        return text
+
+# Cache de programas decodificados, indexado por (caminho, mtime, tamanho, formato)
+_PROGRAM_CACHE = {}
+_PROGRAM_CACHE_SIZE = 64
+
+def load_program(file_path, fmt=None):
+    """Lê um programa (texto, hex ou binário; ver mips_sim.loader), com cache por arquivo"""
+    stat = os.stat(file_path)
+    key = (os.path.realpath(file_path), stat.st_mtime_ns, stat.st_size, fmt)
+    program = _PROGRAM_CACHE.get(key)
+    if program is None:
+        program = Program.from_words(read_words(file_path, fmt))
+        if len(_PROGRAM_CACHE) >= _PROGRAM_CACHE_SIZE:
+            _PROGRAM_CACHE.pop(next(iter(_PROGRAM_CACHE)))
+        _PROGRAM_CACHE[key] = program
+    return program
+
+# Motivos de parada de Machine.run (Machine.status)
+STATUS_END = 'end'          # PC passou da última instrução do programa
+STATUS_EXIT = 'exit'        # syscall de saída ($v0 = 10)
+STATUS_BUDGET = 'budget'    # limite de instruções atingido
+STATUS_TIMEOUT = 'timeout'  # limite de tempo atingido
+STATUS_FAULT = 'fault'      # ExecutionError (ver Machine.error)
+STATUS_BREAK = 'break'      # PC atingiu o endereço de parada (run(stop_at=...)) ou um ponto de parada
+STATUS_WATCH = 'watch'      # ponto de observação disparado (ver mips_sim.breakpoints)
+FINAL_STATUSES = (STATUS_END, STATUS_EXIT, STATUS_FAULT)
+
+# Limite de instruções usado pela GUI e pela linha de comando, para que laços
+# infinitos terminem com um status em vez de travar o programa
+DEFAULT_MAX_INSTRUCTIONS = 10_000_000
+
+# Intervalo (em instruções) entre verificações do limite de tempo
+CHECK_INTERVAL = 4096
+
+class Machine:
+    """Estado de um processador MIPS (registradores, memória e PC) sem interface gráfica.
+
+    O PC é endereçado em bytes: a linha i do programa fica no endereço 4 * i.
+    """
+
+    def __init__(self, program=None, max_instructions=None, timeout=None):
+        self.program = Program([])
+        self.pc = 0
+        self.memory = Memory()
+        self.executed = 0
+        self.status = None
+        self.error = None
+        # Endereço e versão da reserva do último ll (None = sem reserva; ver sc em mips_sim.isa)
+        self.link = None
+        self.max_instructions = max_instructions
+        self.timeout = timeout
+        # Linhas executadas, um bit por linha (None = não registrado; ver track_coverage)
+        self.coverage = None
+        # Gravador de histórico (mips_sim.trace.TraceRecorder), ligado com attach
+        self.tracer = None
+        # Perfil de execução (mips_sim.profiler.Profiler), ligado com attach
+        self.profiler = None
+        # Modelo de tempo do pipeline (mips_sim.pipeline.PipelineModel), ligado com attach
+        self.pipeline = None
+        # Hierarquia de caches de dados (mips_sim.cache.CacheHierarchy), ligada com attach
+        self.caches = None
+        # Pontos de parada e de observação (mips_sim.breakpoints.Breakpoints), ligados com attach
+        self.breakpoints = None
+        self.init_registers()
+        if program is not None:
+            self.load(program)
+
+    def init_registers(self):
+        """Inicializa todos os registradores (32 de uso geral + HI/LO) com 0"""
+        self.registers = [0] * NUM_REGISTERS
+
+    def reset(self):
+        """Reseta todo o estado da simulação, mantendo o programa carregado"""
+        self.pc = 0
+        self.executed = 0
+        self.status = None
+        self.error = None
+        self.link = None
+        self.init_registers()
+        self.memory = Memory()
+        if self.coverage is not None:
+            self.coverage = bytearray((len(self.program) + 7) // 8)
+        if self.tracer is not None:
+            self.tracer.restart(self)
+        if self.profiler is not None:
+            self.profiler.reset(self)
+        if self.pipeline is not None:
+            self.pipeline.reset(self)
+        if self.caches is not None:
+            self.caches.reset(self)
+        if self.breakpoints is not None:
+            self.breakpoints.reset(self)
+
+    def snapshot(self):
+        """Fotografia do estado atual (registradores, PC, contadores e memória).
+
+        As páginas de memória ficam compartilhadas entre a máquina e a
+        fotografia (copy-on-write), então o custo é proporcional às páginas
+        alteradas desde a última fotografia, não ao tamanho da memória.
+        """
+        return Snapshot.capture(self)
+
+    def restore(self, snapshot):
+        """Volta ao estado de uma fotografia, trocando só as páginas alteradas.
+
+        O histórico do tracer, se houver, recomeça do estado restaurado.
+        """
+        snapshot.apply(self)
+        if self.tracer is not None:
+            self.tracer.restart(self)
+
+    def fork(self, snapshot=None):
+        """Nova máquina com o mesmo programa e limites, no estado de snapshot
+        (ou no estado atual); a memória é compartilhada em copy-on-write"""
+        if snapshot is None:
+            snapshot = self.snapshot()
+        machine = Machine(self.program, self.max_instructions, self.timeout)
+        snapshot.apply(machine)
+        return machine
+
+    def track_coverage(self, enabled=True):
+        """Liga (ou desliga) o registro das linhas executadas em self.coverage.
+
+        Com o registro ligado, run usa sempre o interpretador, que marca o bit
+        de cada linha executada; desligado, a execução não tem custo extra.
+        """
+        self.coverage = bytearray((len(self.program) + 7) // 8) if enabled else None
+
+    def line_executed(self, index):
+        """Indica se a linha index já foi executada (requer track_coverage)"""
+        return bool(self.coverage[index >> 3] & (1 << (index & 7)))
+
+    def load(self, program):
+        """Carrega um Program (ou uma lista de linhas binárias) e reseta o estado"""
+        if not isinstance(program, Program):
+            program = Program(program)
+        self.program = program
+        self.reset()
+
+    def load_file(self, file_path, fmt=None):
+        """Carrega um programa a partir de um arquivo (ver load_program)"""
+        self.load(load_program(file_path, fmt))
+
+    @property
+    def instructions(self):
+        """Linhas do programa carregado, como texto"""
+        return self.program.lines
+
+    @property
+    def current_line(self):
+        """Linha do programa apontada pelo PC"""
+        return self.pc >> 2
+
+    @property
+    def finished(self):
+        return self.status in FINAL_STATUSES or (self.pc >> 2) >= len(self.program)
+
+    def _stop_status(self, pc):
+        """Status de parada quando o PC sai do programa"""
+        return STATUS_EXIT if pc == HALT_PC else STATUS_END
+
+    def step(self):
+        """Executa a instrução apontada pelo PC.
+
+        Retorna (assembly, instr) da instrução executada, ou None se o
+        programa terminou ou a instrução falhou. Uma linha que não é uma
+        instrução válida é pulada como em run: o PC avança e o retorno é
+        (assembly, None).
+        """
+        if self.finished:
+            if self.status is None:
+                self.status = self._stop_status(self.pc)
+            return None
+
+        line = self.pc >> 2
+        instr = self.program.decoded[line]
+        assembly = self.program.assembly(line)
+        if instr is None:
+            self.pc += 4
+            if (self.pc >> 2) >= len(self.program):
+                self.status = self._stop_status(self.pc)
+            return assembly, None
+
+        # Endereço do lw/sw lido antes da execução (lw pode sobrescrever a base);
+        # o acesso só é passado aos caches se a instrução executar
+        access = None
+        if self.caches is not None and instr.opcode in self.caches.opcodes:
+            access = (self.registers[instr.rs] + instr.simm) & MASK32
+        self.pc += 4
+        try:
+            if self.tracer is None:
+                instr.handler(self, self.registers, instr)
+            else:
+                self.tracer.execute(self, self.registers, instr, self.pc - 4)
+        except ExecutionError as e:
+            self.pc -= 4
+            self.status = STATUS_FAULT
+            self.error = str(e)
+            return None
+        self.executed += 1
+        if access is not None:
+            self.caches.access(line, instr.opcode, access)
+        if self.coverage is not None:
+            self.coverage[line >> 3] |= 1 << (line & 7)
+        if self.profiler is not None:
+            self.profiler.counts[line] += 1
+        if self.pipeline is not None:
+            self.pipeline.retire(line, instr, self.pc)
+        if (self.pc >> 2) >= len(self.program):
+            self.status = self._stop_status(self.pc)
+        return assembly, instr
+
+    def _interpret(self, pc, limit, decoded=None):
+        """Interpreta até limit instruções a partir de pc.
+
+        Retorna (pc, executadas, status), com status None se o limite foi
+        atingido antes do fim do programa. Linhas inválidas são ignoradas.
+        decoded substitui as instruções do programa (ex.: com as armadilhas
+        de mips_sim.breakpoints, que param com BreakpointHit/WatchpointHit).
+        """
+        if decoded is None:
+            decoded = self.program.decoded
+        n = len(self.program)
+        regs = self.registers
+        executed = 0
+        try:
+            while executed < limit:
+                index = pc >> 2
+                if index >= n:
+                    return pc, executed, self._stop_status(pc)
+                instr = decoded[index]
+                pc += 4
+                if instr is None:
+                    continue
+                self.pc = pc
+                instr.handler(self, regs, instr)
+                pc = self.pc
+                executed += 1
+        except ExecutionError as e:
+            self.error = str(e)
+            return pc - 4, executed, STATUS_FAULT
+        except BreakpointHit:
+            return pc - 4, executed, STATUS_BREAK
+        except WatchpointHit:
+            return self.pc, executed + 1, STATUS_WATCH
+        return pc, executed, None
+
+    def _interpret_checked(self, pc, limit, stop_at, coverage, tracer, counts, pipeline, caches, decoded=None):
+        """Como _interpret, mas para com STATUS_BREAK quando o PC chega a stop_at,
+        marca em coverage (se não for None) as linhas executadas, conta em
+        counts (histograma do profiler) as execuções de cada linha, com um
+        tracer executa cada instrução por ele para gravar o histórico, com
+        um pipeline passa cada instrução executada ao modelo de tempo e, com
+        caches, simula o acesso de cada lw/sw que executou (não os que falharam
+        ou pararam em um ponto de parada). decoded funciona como em _interpret.
+
+        A verificação de stop_at é feita depois de cada instrução, de modo que
+        uma execução iniciada em stop_at avança antes de parar de novo.
+        """
+        if decoded is None:
+            decoded = self.program.decoded
+        n = len(self.program)
+        regs = self.registers
+        memory_opcodes = caches.opcodes if caches is not None else ()
+        executed = 0
+        access = None
+        try:
+            while executed < limit:
+                index = pc >> 2
+                if index >= n:
+                    return pc, executed, self._stop_status(pc)
+                instr = decoded[index]
+                pc += 4
+                if instr is None:
+                    if pc == stop_at:
+                        return pc, executed, STATUS_BREAK
+                    continue
+                # Endereço lido antes (lw pode sobrescrever a base), acesso simulado depois
+                access = None
+                if instr.opcode in memory_opcodes:
+                    access = (regs[instr.rs] + instr.simm) & MASK32
+                self.pc = pc
+                if tracer is None:
+                    instr.handler(self, regs, instr)
+                else:
+                    tracer.execute(self, regs, instr, pc - 4)
+                pc = self.pc
+                executed += 1
+                if access is not None:
+                    caches.access(index, instr.opcode, access)
+                if coverage is not None:
+                    coverage[index >> 3] |= 1 << (index & 7)
+                if counts is not None:
+                    counts[index] += 1
+                if pipeline is not None:
+                    pipeline.retire(index, instr, pc)
+                if pc == stop_at:
+                    return pc, executed, STATUS_BREAK
+        except ExecutionError as e:
+            self.error = str(e)
+            return pc - 4, executed, STATUS_FAULT
+        except BreakpointHit:
+            return pc - 4, executed, STATUS_BREAK
+        except WatchpointHit:
+            # A instrução foi executada: conta como as demais
+            if access is not None:
+                caches.access(index, instr.opcode, access)
+            if coverage is not None:
+                coverage[index >> 3] |= 1 << (index & 7)
+            if counts is not None:
+                counts[index] += 1
+            if pipeline is not None:
+                pipeline.retire(index, instr, self.pc)
+            return self.pc, executed + 1, STATUS_WATCH
+        return pc, executed, None
+
+    def run(self, compiled=False, max_instructions=None, timeout=None, stop_at=None):
+        """Executa a partir do PC atual até o fim do programa ou um dos limites.
+
+        max_instructions limita o total de instruções executadas (contando as
+        já executadas) e timeout o tempo de parede em segundos; se omitidos,
+        valem os limites passados ao construtor. Retorna o status de parada,
+        também guardado em self.status.
+
+        Com compiled=True usa o compilador de blocos básicos (mips_sim.compiler),
+        que produz o mesmo estado final. Com stop_at (endereço em bytes) a
+        execução para com STATUS_BREAK quando o PC chega a esse endereço
+        ("executar até o cursor"). Com stop_at, com track_coverage ligado, com
+        um tracer, um profiler, um modelo de pipeline ou caches o
+        interpretador é sempre usado. Pontos de parada e de observação
+        (self.breakpoints) param com STATUS_BREAK / STATUS_WATCH nos dois modos.
+        """
+        if max_instructions is None:
+            max_instructions = self.max_instructions
+        if timeout is None:
+            timeout = self.timeout
+        coverage = self.coverage
+        tracer = self.tracer
+        profiler = self.profiler
+        counts = profiler.counts if profiler is not None else None
+        pipeline = self.pipeline
+        caches = self.caches
+        checked = (stop_at is not None or coverage is not None or tracer is not None
+                   or profiler is not None or pipeline is not None or caches is not None)
+        decoded = traps = None
+        if self.breakpoints:
+            decoded, traps = self.breakpoints.prepare(self)
+        if compiled and not checked:
+            from .compiler import run_compiled
+            return run_compiled(self, max_instructions, timeout, decoded, traps)
+
+        started = time.perf_counter()
+        executed_before = self.executed
+        deadline = started + timeout if timeout else None
+        pc = self.pc
+        status = None
+        while status is None:
+            limit = CHECK_INTERVAL
+            if max_instructions is not None:
+                limit = min(limit, max_instructions - self.executed)
+                if limit <= 0:
+                    if (pc >> 2) >= len(self.program):
+                        status = self._stop_status(pc)
+                    else:
+                        status = STATUS_BUDGET
+                    break
+            if checked:
+                pc, executed, status = self._interpret_checked(pc, limit, stop_at, coverage, tracer, counts,
+                                                                pipeline, caches, decoded)
+            else:
+                pc, executed, status = self._interpret(pc, limit, decoded)
+            self.executed += executed
+            if status is None and deadline is not None and time.perf_counter() > deadline:
+                status = STATUS_TIMEOUT
+        self.pc = pc
+        self.status = status
+        if profiler is not None:
+            profiler.add_time(time.perf_counter() - started, self.executed - executed_before)
+        return status
+
+    def register(self, name):
+        """Valor (sem sinal) de um registrador pelo nome, ex.: '$t0'"""
+        return self.registers[REGISTER_NAMES.index(name)]
+
+    def signed_registers(self):
+        """Retorna os registradores (nome -> inteiro de 32 bits com sinal) para exibição"""
+        result = {}
+        for num, value in enumerate(self.registers):
+            if value > 0x7FFFFFFF:
+                value -= 0x100000000
+            result[REGISTER_NAMES[num]] = value
+        return result
+
+    def to_dict(self):
+        """Resumo serializável (JSON) do estado da máquina"""
+        return {
+            'instructions': self.executed,
+            'pc': self.pc,
+            'status': self.status,
+            'error': self.error,
+            'registers': self.signed_registers(),
+            'memory': {str(addr): value for addr, value in self.memory.words()},
+        }
+
+    def execute_instruction(self, instr):
+        """Executa uma Instruction pela sua entrada na tabela de despacho (mips_sim.isa).
+
+        Não avança o PC: como no laço de execução, self.pc deve apontar para a
+        instrução seguinte (PC+4) antes da chamada.
+        """
+        instr.handler(self, self.registers, instr)
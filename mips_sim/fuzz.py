@@ -0,0 +1,436 @@
+#====================================================================================
+# MIPS Simulator - fuzzing diferencial dos motores de execução
+#
+# Descrição: Gera programas aleatórios válidos a partir das instruções das
+# tabelas de mips_sim.isa e executa cada um no interpretador de referência (um
+# laço simples sobre Machine.execute_instruction) e nos motores acelerados: o
+# laço rápido de Machine.run, o laço com verificações (usado com cobertura,
+# tracer etc.), Machine.step, o compilador de blocos básicos e a simulação
+# vetorizada (mips_sim.vector, se o NumPy estiver instalado). Um estado final
+# (status, PC, instruções executadas, registradores com HI/LO e memória)
+# diferente do da referência é uma divergência, e o caso é reduzido a um
+# reprodutor mínimo. Os casos são distribuídos em um pool de processos; cada
+# tarefa recebe só um intervalo de sementes e devolve as divergências.
+#
+# Uso:
+#     python -m mips_sim fuzz --cases 100000 [--workers N] [--engines compiled,vector]
+#     python -m mips_sim fuzz --time 60 --json > divergencias.jsonl
+#     python -m mips_sim fuzz --replay divergencias.jsonl
+#====================================================================================
+
+import itertools
+import os
+import random
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .bench.workloads import encode
+from .core import STATUS_BUDGET, STATUS_FAULT, Machine, Program
+from .isa import HI, LO, MASK32, NUM_REGISTERS, PRIMARY, SPECIAL, ExecutionError, register_name
+from .memory import Memory
+
+# Registradores usados pelos programas gerados: poucos, para que as instruções
+# dependam umas das outras. $gp aponta para a área de dados e nunca é escrito.
+REGISTERS = (0, 2, 8, 9, 10, 11, 12, 13, 14, 15, 31)
+GP = 28
+DATA_BASE = 0x10000000
+# Palavras da área de dados alcançadas a partir de $gp: poucas, para que haja
+# leituras do que foi escrito e pares ll/sc no mesmo endereço
+DATA_WORDS = 16
+# Fração dos acessos à memória com base aleatória (endereços desalinhados, outras páginas)
+WILD_ACCESS = 0.1
+NOP = 0  # sll $zero, $zero, 0
+
+# Valores iniciais "de borda" sorteados para os registradores
+EDGE_VALUES = (0, 1, 2, 4, 10, 0x7FFF, 0x8000, 0xFFFF, 0x7FFFFFFF, 0x80000000, 0xFFFFFFFF, DATA_BASE)
+
+DEFAULT_LENGTH = 32
+DEFAULT_BUDGET = 2000
+DEFAULT_CHUNK = 200
+# Limite de execuções de cada caso durante a redução
+DEFAULT_SHRINK_CHECKS = 2000
+
+MEMORY_OPS = ('lw', 'sw', 'll', 'sc')
+
+SPECS = {spec.name: spec for spec in PRIMARY + SPECIAL if spec is not None}
+
+# Caso de teste: words e registers são tuplas (34 registradores, com HI/LO)
+Case = namedtuple('Case', 'seed words registers budget')
+# Estado final comparado entre os motores (memory = Memory.digest)
+Outcome = namedtuple('Outcome', 'status pc executed registers memory')
+
+# Motores comparados com a referência: nome -> função(program, registers, budget) -> Outcome
+ENGINES = {}
+
+def engine(name):
+    """Decorador que registra um motor de execução a ser comparado com a referência"""
+    def decorator(func):
+        ENGINES[name] = func
+        return func
+    return decorator
+
+def _machine(program, registers):
+    machine = Machine(program)
+    machine.registers[:] = registers
+    return machine
+
+def _outcome(machine):
+    return Outcome(machine.status, machine.pc, machine.executed, tuple(machine.registers),
+                   machine.memory.digest())
+
+def reference(program, registers, budget):
+    """Interpretador de referência: uma instrução por vez, por Machine.execute_instruction"""
+    machine = _machine(program, registers)
+    decoded = program.decoded
+    n = len(program)
+    while True:
+        if (machine.pc >> 2) >= n:
+            machine.status = machine._stop_status(machine.pc)
+            break
+        if machine.executed >= budget:
+            machine.status = STATUS_BUDGET
+            break
+        instr = decoded[machine.pc >> 2]
+        machine.pc += 4
+        if instr is None:
+            continue
+        try:
+            machine.execute_instruction(instr)
+        except ExecutionError as e:
+            machine.pc -= 4
+            machine.status = STATUS_FAULT
+            machine.error = str(e)
+            break
+        machine.executed += 1
+    return _outcome(machine)
+
+@engine('interpreter')
+def _run_interpreter(program, registers, budget):
+    machine = _machine(program, registers)
+    machine.run(max_instructions=budget)
+    return _outcome(machine)
+
+@engine('checked')
+def _run_checked(program, registers, budget):
+    # Com cobertura ligada Machine.run usa o laço com verificações
+    machine = _machine(program, registers)
+    machine.track_coverage()
+    machine.run(max_instructions=budget)
+    return _outcome(machine)
+
+@engine('step')
+def _run_step(program, registers, budget):
+    # step só devolve None ao terminar ou falhar; linhas inválidas são puladas
+    machine = _machine(program, registers)
+    while machine.executed < budget and machine.step() is not None:
+        pass
+    if machine.status is None:
+        machine.status = machine._stop_status(machine.pc) if machine.finished else STATUS_BUDGET
+    return _outcome(machine)
+
+@engine('compiled')
+def _run_compiled(program, registers, budget):
+    machine = _machine(program, registers)
+    machine.run(compiled=True, max_instructions=budget)
+    return _outcome(machine)
+
+@engine('vector')
+def _run_vector(program, registers, budget):
+    from .vector import BatchMachine
+
+    batch = BatchMachine(program, [registers])
+    final = batch.run(budget)
+    memory = Memory()
+    for address, column in batch.memory.items():
+        if column[0]:
+            memory.store_word(address, int(column[0]))
+    return Outcome(batch.statuses()[0], int(batch.pc[0]), int(batch.executed[0]),
+                   tuple(int(value) for value in final[0]), memory.digest())
+
+def available_engines():
+    """Motores que podem ser usados neste ambiente (vector só com NumPy)"""
+    names = list(ENGINES)
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        names.remove('vector')
+    return names
+
+def supported_instructions(name):
+    """Instruções que o motor name executa (None = todas as das tabelas)"""
+    if name == 'vector':
+        from .vector import KERNELS
+        return {op for op in SPECS if op in KERNELS or SPECS[op].execute is None}
+    return None
+
+def _runs(name, program):
+    """O motor name executa todas as instruções de program?"""
+    supported = supported_instructions(name)
+    if supported is None:
+        return True
+    decoded = program.decoded
+    return all(decoded[i] is None or decoded[i].op is None or decoded[i].op.name in supported
+               for i in range(len(program)))
+
+# Geração de casos
+
+def _random_value(rng):
+    r = rng.random()
+    if r < 0.4:
+        return rng.choice(EDGE_VALUES)
+    if r < 0.7:
+        return rng.randrange(-16, 17) & MASK32
+    return rng.getrandbits(32)
+
+def _random_immediate(rng):
+    return rng.randrange(-16, 17) if rng.random() < 0.5 else rng.getrandbits(16)
+
+def random_instruction(rng, name, line, length):
+    """Palavra da instrução name na linha line de um programa com length linhas.
+
+    Desvios e saltos vão para uma linha do programa ou logo depois do fim;
+    quase todos os acessos à memória usam $gp com deslocamento alinhado.
+    """
+    reg = lambda: rng.choice(REGISTERS)
+    if name in MEMORY_OPS:
+        if rng.random() < WILD_ACCESS:
+            return encode(name, rs=reg(), rt=reg(), imm=_random_immediate(rng))
+        return encode(name, rs=GP, rt=reg(), imm=4 * rng.randrange(DATA_WORDS))
+    if name in ('beq', 'bne'):
+        target = rng.randrange(-1, length + 2)
+        return encode(name, rs=reg(), rt=reg(), imm=target - (line + 1))
+    if name in ('j', 'jal'):
+        return encode(name, target=rng.randrange(length + 1))
+    if name == 'jr':
+        return encode(name, rs=31 if rng.random() < 0.7 else reg())
+    if name == 'sll':
+        return encode(name, rt=reg(), rd=reg(), shamt=rng.randrange(32))
+    if SPECS[name].opcode == 0:
+        return encode(name, rs=reg(), rt=reg(), rd=reg())
+    return encode(name, rs=reg(), rt=reg(), imm=_random_immediate(rng))
+
+def make_case(seed, names, max_length=DEFAULT_LENGTH, max_budget=DEFAULT_BUDGET):
+    """Caso de teste determinado pela semente: programa, registradores iniciais e orçamento"""
+    rng = random.Random(seed)
+    length = rng.randint(1, max_length)
+    words = tuple(random_instruction(rng, rng.choice(names), line, length) for line in range(length))
+    registers = [0] * NUM_REGISTERS
+    for num in REGISTERS[1:] + (HI, LO):
+        registers[num] = _random_value(rng)
+    registers[GP] = DATA_BASE
+    if rng.random() < 0.2:
+        registers[2] = 10  # syscall encerra o programa
+    budget = rng.randint(1, max_budget) if rng.random() < 0.2 else max_budget
+    return Case(seed, words, tuple(registers), budget)
+
+# Comparação e redução
+
+def run_case(case, engines):
+    """Executa case na referência e nos motores dados.
+
+    Retorna (esperado, {motor: resultado}, pulados): o dicionário só tem os
+    motores que divergiram (um motor que lança uma exceção diverge com o
+    texto da exceção como resultado) e pulados lista os motores que não
+    suportam alguma instrução do programa e por isso não foram executados.
+    """
+    program = Program.from_words(case.words)
+    expected = reference(program, case.registers, case.budget)
+    diverged = {}
+    skipped = []
+    for name in engines:
+        if not _runs(name, program):
+            skipped.append(name)
+            continue
+        try:
+            got = ENGINES[name](program, case.registers, case.budget)
+        except Exception as e:
+            got = f"{type(e).__name__}: {e}"
+        if got != expected:
+            diverged[name] = got
+    return expected, diverged, skipped
+
+def shrink(case, engines, max_checks=DEFAULT_SHRINK_CHECKS):
+    """Reduz case a um reprodutor mínimo que ainda diverge em algum dos motores.
+
+    Diminui o orçamento (busca binária), remove trechos do programa (de
+    metades até instruções isoladas), troca instruções por nop e zera
+    registradores iniciais, repetindo enquanto algo mudar.
+    """
+    checks = 0
+
+    def diverges(candidate):
+        nonlocal checks
+        checks += 1
+        return bool(run_case(candidate, engines)[1])
+
+    changed = True
+    while changed and checks < max_checks:
+        changed = False
+
+        low, high = 0, case.budget
+        while high - low > 1 and checks < max_checks:
+            middle = (low + high) // 2
+            if diverges(case._replace(budget=middle)):
+                high = middle
+            else:
+                low = middle
+        if high < case.budget:
+            case = case._replace(budget=high)
+            changed = True
+
+        size = max(len(case.words) // 2, 1)
+        while size and checks < max_checks:
+            start = 0
+            while start < len(case.words) and checks < max_checks:
+                words = case.words[:start] + case.words[start + size:]
+                if words and diverges(case._replace(words=words)):
+                    case = case._replace(words=words)
+                    changed = True
+                else:
+                    start += size
+            size //= 2
+
+        for index, word in enumerate(case.words):
+            if word != NOP and checks < max_checks:
+                words = case.words[:index] + (NOP,) + case.words[index + 1:]
+                if diverges(case._replace(words=words)):
+                    case = case._replace(words=words)
+                    changed = True
+
+        for num, value in enumerate(case.registers):
+            if value and checks < max_checks:
+                registers = case.registers[:num] + (0,) + case.registers[num + 1:]
+                if diverges(case._replace(registers=registers)):
+                    case = case._replace(registers=registers)
+                    changed = True
+    return case
+
+def _outcome_dict(outcome):
+    if isinstance(outcome, str):
+        return {'exception': outcome}
+    result = outcome._asdict()
+    result['registers'] = list(outcome.registers)
+    return result
+
+def report(case, engines):
+    """Divergências de case como dicionário serializável (None se não houver)"""
+    expected, diverged, skipped = run_case(case, engines)
+    if not diverged:
+        return None
+    program = Program.from_words(case.words)
+    return {
+        'seed': case.seed,
+        'budget': case.budget,
+        'registers': list(case.registers),
+        'words': [f"0x{word:08x}" for word in case.words],
+        'assembly': [program.assembly(i) for i in range(len(program))],
+        'expected': _outcome_dict(expected),
+        'diverged': {name: _outcome_dict(got) for name, got in diverged.items()},
+        'skipped': skipped,
+    }
+
+def case_from_report(failure):
+    """Case a partir de um dicionário gerado por report (para repetir a execução)"""
+    return Case(failure['seed'], tuple(int(word, 16) for word in failure['words']),
+                tuple(failure['registers']), failure['budget'])
+
+def format_report(failure):
+    """Texto legível de uma divergência: programa, estado inicial e diferenças"""
+    lines = [f"Divergência (semente {failure['seed']}, orçamento {failure['budget']} instruções)"]
+    initial = [f"{register_name(num)}=0x{value:08x}" for num, value in enumerate(failure['registers']) if value]
+    lines.append("  registradores iniciais: " + (' '.join(initial) or "todos 0"))
+    for i, (word, text) in enumerate(zip(failure['words'], failure['assembly'])):
+        lines.append(f"  0x{4 * i:08x}  {word}  {text}")
+    expected = failure['expected']
+    for name, got in failure['diverged'].items():
+        if 'exception' in got:
+            lines.append(f"  {name}: exceção {got['exception']}")
+            continue
+        for field in ('status', 'pc', 'executed', 'memory'):
+            if got[field] != expected[field]:
+                lines.append(f"  {name}: {field} = {got[field]} (referência: {expected[field]})")
+        for num, (value, wanted) in enumerate(zip(got['registers'], expected['registers'])):
+            if value != wanted:
+                lines.append(f"  {name}: {register_name(num)} = 0x{value:08x} (referência: 0x{wanted:08x})")
+    if failure.get('skipped'):
+        lines.append(f"  não executados (instruções sem suporte): {', '.join(failure['skipped'])}")
+    return '\n'.join(lines)
+
+# Execução em paralelo
+
+def fuzz_range(first_seed, count, engines=None, max_length=DEFAULT_LENGTH, max_budget=DEFAULT_BUDGET,
+               shrink_failures=True):
+    """Executa os casos das sementes [first_seed, first_seed + count).
+
+    Retorna {'first_seed', 'cases', 'instructions', 'failures', 'skipped'},
+    onde instructions soma as instruções executadas pela referência e pelos
+    motores, failures lista os relatórios (report) das divergências, já
+    reduzidas se shrink_failures for verdadeiro, e skipped conta, por motor,
+    os casos que ele não executou por não suportar alguma instrução. Se algum
+    motor não suporta todas as instruções, as sementes ímpares sorteiam só
+    as que todos suportam.
+    """
+    if engines is None:
+        engines = available_engines()
+    every = sorted(SPECS)
+    common = set(every)
+    for name in engines:
+        common &= supported_instructions(name) or common
+    common = sorted(common)
+    instructions = 0
+    failures = []
+    skipped = Counter()
+    for seed in range(first_seed, first_seed + count):
+        case = make_case(seed, common if seed % 2 else every, max_length, max_budget)
+        expected, diverged, not_run = run_case(case, engines)
+        skipped.update(not_run)
+        instructions += expected.executed * (len(engines) - len(not_run) + 1)
+        if diverged:
+            if shrink_failures:
+                case = shrink(case, list(diverged))
+            failure = report(case, list(diverged))
+            if failure is not None:
+                failures.append(failure)
+    return {'first_seed': first_seed, 'cases': count, 'instructions': instructions, 'failures': failures,
+            'skipped': dict(skipped)}
+
+def _fuzz_chunk(first_seed, count, options):
+    """Tarefa executada em um processo do pool: um intervalo de sementes"""
+    return fuzz_range(first_seed, count, **options)
+
+def fuzz(cases=None, seed=0, workers=None, chunk=DEFAULT_CHUNK, duration=None, **options):
+    """Gera os resultados de fuzz_range para intervalos de chunk sementes, à medida que terminam.
+
+    Para depois de cases casos a partir de seed e/ou depois de duration
+    segundos (sem nenhum dos dois, continua indefinidamente). workers é o
+    número de processos (padrão: os.cpu_count()); com workers=1 tudo roda no
+    processo atual. options são repassadas a fuzz_range.
+    """
+    deadline = time.monotonic() + duration if duration else None
+    end = seed + cases if cases is not None else None
+
+    def ranges():
+        first = seed
+        while (end is None or first < end) and (deadline is None or time.monotonic() < deadline):
+            count = chunk if end is None else min(chunk, end - first)
+            yield first, count
+            first += count
+
+    if workers == 1:
+        for first, count in ranges():
+            yield fuzz_range(first, count, **options)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    tasks = ranges()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Poucas tarefas pendentes por processo, para respeitar duration
+        pending = {pool.submit(_fuzz_chunk, first, count, options)
+                   for first, count in itertools.islice(tasks, 2 * workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for first, count in itertools.islice(tasks, 1):
+                    pending.add(pool.submit(_fuzz_chunk, first, count, options))
+                yield future.result()
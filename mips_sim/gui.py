@@ -0,0 +1,883 @@
+#====================================================================================
+# MIPS Simulator - interface gráfica
+#
+# Aluno: Pietra Aceituno Cavalheiri           RA:  2586576
+# Aluno: Matheus Otenio                       RA: 2553139
+#
+# Descrição: Interface Tkinter do simulador. Todo o estado de execução fica no
+# Machine de mips_sim.core; este módulo só é importado quando a GUI é aberta.
+#====================================================================================
+
+
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from tkinter import ttk
+
+from .core import (
+    DEFAULT_MAX_INSTRUCTIONS,
+    STATUS_BREAK,
+    STATUS_BUDGET,
+    STATUS_EXIT,
+    STATUS_FAULT,
+    STATUS_TIMEOUT,
+    STATUS_WATCH,
+    Machine,
+    load_program,
+    register_name,
+)
+from .breakpoints import Breakpoints
+from .pipeline import PipelineModel
+from .profiler import Profiler
+from .trace import TraceRecorder
+from .views import VirtualListView
+from .worker import CANCELLED, DONE, ExecutionWorker
+
+# Intervalo (ms) entre leituras das fotografias publicadas pela thread de execução
+POLL_MS = 50
+
+# Execução animada: taxa máxima de quadros e opções de instruções por quadro
+ANIMATION_FPS = 30
+ANIMATION_BATCHES = (1, 10, 100, 1000, 10000, 100000)
+ANIMATION_DEFAULT_BATCH = 100
+
+# Linhas de pontos quentes exibidas na aba de perfil
+PROFILE_HOTSPOTS = 100
+
+# Cores dos valores de registradores (normal / alterado na última atualização)
+REGISTER_COLOR = '#e74c3c'
+REGISTER_CHANGED_COLOR = '#2980b9'
+
+class MIPSSimulator(tk.Tk):
+
+    def __init__(self):
+        super().__init__()
+        self.title("🚀 Simulador MIPS")
+        self.geometry("1200x800")
+        self.configure(bg='#f0f0f0')
+        
+        # Definir estilo moderno
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        self.style.configure('TButton', font=('Arial', 10), padding=6)
+        self.style.configure('TFrame', background='#f0f0f0')
+        self.style.map('TButton', 
+                      foreground=[('active', 'white'), ('disabled', 'gray')],
+                      background=[('active', '#45a049'), ('disabled', '#cccccc')])
+        
+        self.machine = Machine()
+        # Linhas executadas ficam no bitmap machine.coverage, não em tags do Text;
+        # o registro só é ligado com "Marcar executadas" (ver toggle_coverage)
+        # Bitmap da última fotografia da thread de execução, exibido enquanto ela é dona do Machine
+        self.worker_coverage = None
+        # Valores exibidos em cada label de registrador e registradores realçados,
+        # para reconfigurar só os labels que mudaram
+        self.shown_registers = [None] * 32
+        self.changed_registers = set()
+        # Identificador do after() da execução animada (None quando parada)
+        self.animation_job = None
+        # Thread de "Executar Tudo" / "Até o cursor" (None quando não há execução)
+        self.worker = None
+        # Gravador do histórico, usado por "Voltar" (None quando desligado)
+        self.recorder = None
+        # Perfil da execução, exibido na aba "Perfil" (None quando desligado)
+        self.profiler = None
+        # Modelo de tempo do pipeline, exibido na aba "Pipeline" (None quando desligado)
+        self.pipeline = None
+        # Pontos de parada e de observação (sem custo na execução enquanto vazios)
+        self.breakpoints = Breakpoints()
+        self.breakpoints.attach(self.machine)
+        self.create_widgets()
+    
+    def create_widgets(self):
+        # Controles superiores
+        self.dark_bg = '#2c3e50'
+        self.light_bg = '#ecf0f1'
+        self.highlight_color = '#3498db'
+
+        control_frame = ttk.Frame(self, padding=10)
+        control_frame.pack(fill=tk.X)
+
+        button_style = {'style': 'TButton', 'padding': 8}
+        self.load_btn = ttk.Button(control_frame, text="📂 Carregar", command=self.load_file, **button_style)
+        self.back_btn = ttk.Button(control_frame, text="⏮ Voltar", command=self.step_back, state=tk.DISABLED, **button_style)
+        self.step_btn = ttk.Button(control_frame, text="⏭ Passo", command=self.next_step, state=tk.DISABLED, **button_style)
+        self.run_all_btn = ttk.Button(control_frame, text="⚡ Executar Tudo", command=self.run_all, state=tk.DISABLED, **button_style)
+        self.animate_btn = ttk.Button(control_frame, text="▶ Animar", command=self.toggle_animation, state=tk.DISABLED, **button_style)
+        self.run_to_btn = ttk.Button(control_frame, text="⤵ Até o cursor", command=self.run_to_cursor, state=tk.DISABLED, **button_style)
+        self.pause_btn = ttk.Button(control_frame, text="⏸ Pausar", command=self.toggle_pause, state=tk.DISABLED, **button_style)
+        self.cancel_btn = ttk.Button(control_frame, text="⏹ Cancelar", command=self.cancel_run, state=tk.DISABLED, **button_style)
+        self.reset_btn = ttk.Button(control_frame, text="🔄 Reset", command=self.reset_simulator, state=tk.DISABLED, **button_style)
+        
+        # Layout dos botões
+        self.load_btn.pack(side=tk.LEFT, padx=5)
+        self.back_btn.pack(side=tk.LEFT, padx=5)
+        self.step_btn.pack(side=tk.LEFT, padx=5)
+        self.run_all_btn.pack(side=tk.LEFT, padx=5)
+        self.animate_btn.pack(side=tk.LEFT, padx=5)
+        self.run_to_btn.pack(side=tk.LEFT, padx=5)
+        self.pause_btn.pack(side=tk.LEFT, padx=5)
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        self.reset_btn.pack(side=tk.LEFT, padx=5)
+
+        # Velocidade da execução animada (instruções executadas por quadro)
+        ttk.Label(control_frame, text="Instruções/quadro:").pack(side=tk.LEFT, padx=(15, 5))
+        self.batch_var = tk.StringVar(value=str(ANIMATION_DEFAULT_BATCH))
+        ttk.Combobox(control_frame, textvariable=self.batch_var, width=8,
+                     values=ANIMATION_BATCHES).pack(side=tk.LEFT)
+
+        # Gravação do histórico (permite voltar instruções; deixa a execução mais lenta)
+        self.trace_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Gravar histórico", variable=self.trace_var,
+                        command=self.toggle_trace).pack(side=tk.LEFT, padx=(15, 5))
+
+        # Marcação das linhas executadas (desligada, a execução usa o interpretador rápido ou o compilador)
+        self.coverage_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Marcar executadas", variable=self.coverage_var,
+                        command=self.toggle_coverage).pack(side=tk.LEFT, padx=5)
+
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        # Área de código binário
+        code_frame = ttk.Frame(self.notebook)
+        self.notebook.add(code_frame, text='📝 Código Binário')
+        code_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        # Área de código com scroll: só as linhas visíveis são renderizadas
+        self.code_view = VirtualListView(code_frame, font=('Courier', 10))
+        self.code_view.grid(row=0, column=0, sticky='nsew')
+        code_frame.grid_rowconfigure(0, weight=1)
+        code_frame.grid_columnconfigure(0, weight=1)
+        self.code_text = self.code_view.text
+        # Duplo clique liga/desliga um ponto de parada na linha
+        self.code_text.bind('<Double-Button-1>', self.toggle_breakpoint_at)
+        # Linha realçada como atual (None quando o programa terminou)
+        self.current_row = None
+        
+        # Painel de registradores
+        register_frame = ttk.Frame(self.notebook)
+        self.notebook.add(register_frame, text='🧮 Registradores')
+        
+        self.register_labels = []
+        for i in range(32):
+            reg_name = register_name(i)
+            row = i // 4
+            col = (i % 4) * 2
+            
+            lbl_frame = ttk.Frame(register_frame, padding=5)
+            lbl_frame.grid(row=row, column=col, padx=5, pady=2, sticky='w')
+            
+            ttk.Label(lbl_frame, text=f"{reg_name}:", 
+                     font=('Arial', 10, 'bold'), 
+                     foreground='#2c3e50').pack(side=tk.LEFT)
+            
+            lbl_value = ttk.Label(lbl_frame, text="0", 
+                                font=('Consolas', 10), 
+                                foreground=REGISTER_COLOR,
+                                width=12)
+            lbl_value.pack(side=tk.LEFT)
+            self.register_labels.append(lbl_value)
+
+        self.create_profile_tab()
+        self.create_pipeline_tab()
+        self.create_breakpoints_tab()
+
+         # Painel de informações
+        info_frame = ttk.Frame(self, padding=10)
+        info_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.translation_label = ttk.Label(
+            info_frame, 
+            text="📋 Instrução Traduzida:",
+            font=('Arial', 11, 'bold'),
+            foreground='#27ae60'
+        )
+        self.translation_label.pack(anchor=tk.W)
+        
+        self.details_label = ttk.Label(
+            info_frame,
+            text="🔍 Detalhes:",
+            font=('Arial', 10),
+            foreground='#7f8c8d'
+        )
+        self.details_label.pack(anchor=tk.W)
+        
+        # Configurar tags para realce
+        self.code_text.tag_configure('current', background='yellow', foreground='black')
+        self.code_text.tag_configure('executed', background='#e0e0e0')
+        self.code_text.tag_configure('breakpoint', foreground='#c0392b', font=('Courier', 10, 'bold'))
+    
+    def create_profile_tab(self):
+        """Aba com contagens por instrução, pontos quentes e instruções por segundo"""
+        profile_frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(profile_frame, text='📈 Perfil')
+        self.profile_tab = profile_frame
+
+        top = ttk.Frame(profile_frame)
+        top.pack(fill=tk.X)
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="Perfilar execução", variable=self.profile_var,
+                        command=self.toggle_profile).pack(side=tk.LEFT)
+        ttk.Button(top, text="Atualizar", command=self.refresh_profile).pack(side=tk.LEFT, padx=10)
+        self.profile_summary = ttk.Label(top, text="Perfil desligado.", font=('Arial', 10))
+        self.profile_summary.pack(side=tk.LEFT, padx=10)
+
+        tables = ttk.Frame(profile_frame)
+        tables.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.opcode_table = ttk.Treeview(tables, columns=('count', 'percent'), height=15)
+        self.opcode_table.heading('#0', text='Instrução')
+        self.opcode_table.heading('count', text='Execuções')
+        self.opcode_table.heading('percent', text='%')
+        self.opcode_table.column('#0', width=140)
+        self.opcode_table.column('count', width=100, anchor=tk.E)
+        self.opcode_table.column('percent', width=60, anchor=tk.E)
+        self.opcode_table.pack(side=tk.LEFT, fill=tk.Y)
+
+        self.hotspot_table = ttk.Treeview(tables, columns=('count', 'percent', 'assembly'), height=15)
+        for column, title, width in (('count', 'Execuções', 100), ('percent', '%', 60), ('assembly', 'Assembly', 260)):
+            self.hotspot_table.heading(column, text=title)
+            self.hotspot_table.column(column, width=width, anchor=tk.W if column == 'assembly' else tk.E)
+        self.hotspot_table.heading('#0', text='Endereço')
+        self.hotspot_table.column('#0', width=110)
+        vsb = ttk.Scrollbar(tables, orient='vertical', command=self.hotspot_table.yview)
+        self.hotspot_table.configure(yscrollcommand=vsb.set)
+        self.hotspot_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+        vsb.pack(side=tk.LEFT, fill=tk.Y)
+
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+
+    def create_pipeline_tab(self):
+        """Aba com ciclos, CPI, bolhas e o diagrama do pipeline das últimas instruções"""
+        pipeline_frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(pipeline_frame, text='⏱ Pipeline')
+        self.pipeline_tab = pipeline_frame
+
+        top = ttk.Frame(pipeline_frame)
+        top.pack(fill=tk.X)
+        self.pipeline_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="Modelar pipeline", variable=self.pipeline_var,
+                        command=self.toggle_pipeline).pack(side=tk.LEFT)
+        self.forwarding_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(top, text="Adiantamento (forwarding)", variable=self.forwarding_var,
+                        command=self.toggle_pipeline).pack(side=tk.LEFT, padx=10)
+        self.pipeline_summary = ttk.Label(top, text="Modelo de pipeline desligado.", font=('Arial', 10))
+        self.pipeline_summary.pack(side=tk.LEFT, padx=10)
+
+        self.pipeline_text = tk.Text(pipeline_frame, wrap=tk.NONE, font=('Consolas', 11), height=12,
+                                     bg=self.light_bg, state=tk.DISABLED)
+        self.pipeline_text.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+
+    def create_breakpoints_tab(self):
+        """Aba com a lista de pontos de parada e de observação"""
+        frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(frame, text='🔴 Pontos de parada')
+
+        form = ttk.Frame(frame)
+        form.pack(fill=tk.X)
+        ttk.Label(form, text="Endereço:").grid(row=0, column=0, sticky='w')
+        self.break_address_var = tk.StringVar()
+        ttk.Entry(form, textvariable=self.break_address_var, width=12).grid(row=0, column=1, padx=5)
+        ttk.Label(form, text="Condição:").grid(row=0, column=2, sticky='w')
+        self.break_condition_var = tk.StringVar()
+        ttk.Entry(form, textvariable=self.break_condition_var, width=24).grid(row=0, column=3, padx=5)
+        ttk.Button(form, text="Adicionar ponto de parada", command=self.add_breakpoint).grid(row=0, column=4, padx=5)
+
+        ttk.Label(form, text="Registrador:").grid(row=1, column=0, sticky='w', pady=(5, 0))
+        self.watch_register_var = tk.StringVar()
+        ttk.Combobox(form, textvariable=self.watch_register_var, width=10,
+                     values=[register_name(i) for i in range(1, 34)]).grid(row=1, column=1, padx=5, pady=(5, 0))
+        ttk.Button(form, text="Observar registrador", command=self.add_register_watch).grid(
+            row=1, column=2, columnspan=2, sticky='w', padx=5, pady=(5, 0))
+
+        ttk.Label(form, text="Memória:").grid(row=2, column=0, sticky='w', pady=(5, 0))
+        self.watch_address_var = tk.StringVar()
+        ttk.Entry(form, textvariable=self.watch_address_var, width=12).grid(row=2, column=1, padx=5, pady=(5, 0))
+        ttk.Button(form, text="Observar palavra", command=self.add_memory_watch).grid(
+            row=2, column=2, columnspan=2, sticky='w', padx=5, pady=(5, 0))
+
+        self.breakpoint_table = ttk.Treeview(frame, columns=('detail',), height=12)
+        self.breakpoint_table.heading('#0', text='Ponto')
+        self.breakpoint_table.heading('detail', text='Detalhe')
+        self.breakpoint_table.column('#0', width=220)
+        self.breakpoint_table.column('detail', width=400)
+        self.breakpoint_table.pack(fill=tk.BOTH, expand=True, pady=(10, 5))
+
+        buttons = ttk.Frame(frame)
+        buttons.pack(fill=tk.X)
+        ttk.Button(buttons, text="Remover selecionado", command=self.remove_selected_point).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Remover todos", command=self.clear_points).pack(side=tk.LEFT, padx=10)
+
+    def refresh_breakpoints(self):
+        """Atualiza a lista de pontos e as marcas no código"""
+        table = self.breakpoint_table
+        table.delete(*table.get_children())
+        points = self.breakpoints
+        program = self.machine.program
+        for pc, condition in sorted(points.breakpoints.items()):
+            line = pc >> 2
+            assembly = program.assembly(line) if line < len(program) else "(fora do programa)"
+            detail = f"{assembly}  se {condition}" if condition else assembly
+            table.insert('', tk.END, iid=f"break:{pc}", text=f"Parada em 0x{pc:08x}", values=(detail,))
+        for number in sorted(points.registers):
+            table.insert('', tk.END, iid=f"register:{number}", text=f"Observa {register_name(number)}",
+                         values=("para quando o valor muda",))
+        for address in sorted(points.addresses):
+            table.insert('', tk.END, iid=f"memory:{address}", text=f"Observa 0x{address:08x}",
+                         values=("para quando a palavra muda",))
+        self.code_view.render()
+
+    def _parse_address(self, text):
+        """Endereço em bytes a partir de decimal ou hexadecimal (0x...)"""
+        try:
+            return int(text.strip(), 0)
+        except ValueError:
+            messagebox.showwarning("Aviso", f"Endereço inválido: {text!r}")
+            return None
+
+    def add_breakpoint(self):
+        pc = self._parse_address(self.break_address_var.get())
+        if pc is None:
+            return
+        try:
+            self.breakpoints.add(pc, self.break_condition_var.get().strip() or None)
+        except ValueError as e:
+            messagebox.showwarning("Aviso", str(e))
+            return
+        self.refresh_breakpoints()
+
+    def toggle_breakpoint_at(self, event):
+        """Duplo clique no código: liga/desliga o ponto de parada da linha"""
+        line = self.code_view.index_at(event.y)
+        if line is not None and line < len(self.machine.program):
+            try:
+                self.breakpoints.toggle(4 * line)
+            except ValueError as e:
+                messagebox.showwarning("Aviso", str(e))
+                return 'break'
+            self.refresh_breakpoints()
+        return 'break'
+
+    def add_register_watch(self):
+        try:
+            self.breakpoints.watch_register(self.watch_register_var.get().strip())
+        except ValueError as e:
+            messagebox.showwarning("Aviso", str(e))
+            return
+        self.refresh_breakpoints()
+
+    def add_memory_watch(self):
+        address = self._parse_address(self.watch_address_var.get())
+        if address is None:
+            return
+        self.breakpoints.watch_memory(address)
+        self.refresh_breakpoints()
+
+    def remove_selected_point(self):
+        for iid in self.breakpoint_table.selection():
+            kind, value = iid.split(':')
+            if kind == 'break':
+                self.breakpoints.remove(int(value))
+            elif kind == 'register':
+                self.breakpoints.unwatch_register(int(value))
+            else:
+                self.breakpoints.unwatch_memory(int(value))
+        self.refresh_breakpoints()
+
+    def clear_points(self):
+        self.breakpoints.clear()
+        self.refresh_breakpoints()
+
+    def on_tab_changed(self, event):
+        if self.notebook.select() == str(self.profile_tab):
+            self.refresh_profile()
+        elif self.notebook.select() == str(self.pipeline_tab):
+            self.refresh_pipeline()
+
+    def toggle_pipeline(self):
+        """Liga, desliga ou reconfigura o modelo de pipeline (as contagens recomeçam do zero)"""
+        self.stop_animation()
+        self.stop_worker()
+        if self.pipeline is not None:
+            self.pipeline.detach(self.machine)
+            self.pipeline = None
+        if self.pipeline_var.get():
+            self.pipeline = PipelineModel(forwarding=self.forwarding_var.get())
+            self.pipeline.attach(self.machine)
+        self.refresh_pipeline()
+
+    def refresh_pipeline(self):
+        """Atualiza o resumo e o diagrama do pipeline das últimas instruções executadas"""
+        if self.pipeline is None:
+            self.pipeline_summary.config(text="Modelo de pipeline desligado.")
+            diagram = ""
+        else:
+            pipeline = self.pipeline
+            cpi = f"{pipeline.cpi:.3f}" if pipeline.instructions else "-"
+            self.pipeline_summary.config(
+                text=f"{pipeline.cycles} ciclos  |  {pipeline.instructions} instruções  |  CPI {cpi}  |  "
+                     f"bolhas: load-use {pipeline.load_use_stalls}, dados {pipeline.data_stalls}, "
+                     f"controle {pipeline.control_stalls}")
+            diagram = pipeline.format_diagram(self.machine)
+        self.pipeline_text.config(state=tk.NORMAL)
+        self.pipeline_text.delete('1.0', tk.END)
+        self.pipeline_text.insert('1.0', diagram)
+        self.pipeline_text.config(state=tk.DISABLED)
+
+    def toggle_profile(self):
+        """Liga ou desliga o perfil (com ele ligado a execução fica um pouco mais lenta)"""
+        self.stop_animation()
+        self.stop_worker()
+        if self.profile_var.get():
+            self.profiler = Profiler()
+            self.profiler.attach(self.machine)
+        else:
+            self.profiler.detach(self.machine)
+            self.profiler = None
+        self.refresh_profile()
+
+    def refresh_profile(self):
+        """Preenche a aba de perfil com as contagens atuais"""
+        self.opcode_table.delete(*self.opcode_table.get_children())
+        self.hotspot_table.delete(*self.hotspot_table.get_children())
+        if self.profiler is None:
+            self.profile_summary.config(text="Perfil desligado.")
+            return
+
+        report = self.profiler.report(self.machine, PROFILE_HOTSPOTS)
+        total = report['instructions'] or 1
+        ips = f"{report['ips']:,.0f} instr/s" if report['ips'] else "-"
+        self.profile_summary.config(
+            text=f"{report['instructions']} instruções  |  {report['loads']} leituras, "
+                 f"{report['stores']} escritas na memória  |  {ips}")
+        for name, count in report['opcodes'].items():
+            self.opcode_table.insert('', tk.END, text=name, values=(count, f"{100 * count / total:.1f}"))
+        for spot in report['hotspots']:
+            self.hotspot_table.insert('', tk.END, text=f"0x{spot['pc']:08x}",
+                                      values=(spot['count'], f"{100 * spot['count'] / total:.1f}", spot['assembly']))
+
+    def reset_simulator(self):
+        """Reseta todo o estado da simulação"""
+        self.stop_animation()
+        self.stop_worker()
+        self.machine.reset()
+        self.update_register_display(highlight=False)
+        self.clear_highlights()
+        self.highlight_current_line()
+        self.refresh_pipeline()
+        self.translation_label.config(text="Instrução Traduzida:")
+        self.details_label.config(text="Detalhes da Decodificação:")
+        # Mantém o botão Reset habilitado se houver código
+        if len(self.machine.program):
+            self.step_btn.config(state=tk.NORMAL)
+            self.run_all_btn.config(state=tk.NORMAL)
+            self.animate_btn.config(state=tk.NORMAL)
+            self.run_to_btn.config(state=tk.NORMAL)
+            self.reset_btn.config(state=tk.NORMAL)
+        else:
+            self.reset_btn.config(state=tk.DISABLED)
+    
+    def load_file(self):
+        file_path = filedialog.askopenfilename(filetypes=[
+            ("Programas MIPS", "*.txt *.hex *.bin"),
+            ("Arquivos de texto", "*.txt"),
+            ("Dump hexadecimal", "*.hex"),
+            ("Imagem binária", "*.bin"),
+        ])
+        if not file_path:
+            return
+        
+        try:
+            self.stop_animation()
+            self.stop_worker()
+            self.machine.load(load_program(file_path))
+            # Pontos de parada que caíram em linhas inválidas do novo programa
+            invalid = self.breakpoints.invalid_lines(self.machine.program)
+            for pc in invalid:
+                self.breakpoints.remove(pc)
+            if invalid:
+                messagebox.showwarning("Aviso", "Pontos de parada removidos (linhas sem instrução válida): "
+                                       + ", ".join(f"0x{pc:08x}" for pc in invalid))
+            # Habilitar todos os botões relevantes
+            self.step_btn.config(state=tk.NORMAL)
+            self.run_all_btn.config(state=tk.NORMAL)
+            self.animate_btn.config(state=tk.NORMAL)
+            self.run_to_btn.config(state=tk.NORMAL)
+            self.reset_btn.config(state=tk.NORMAL)  # essa linha tava faltando tb
+            self.update_register_display(highlight=False)
+            self.show_code()
+            self.clear_highlights()
+            self.refresh_pipeline()
+            self.refresh_breakpoints()
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao ler arquivo:\n{str(e)}")
+    
+    def show_code(self):
+        program = self.machine.program
+        self.code_view.set_source(program.line, len(program), self.code_row_tags)
+        self.highlight_current_line()
+
+    def code_row_tags(self, index):
+        """Tags de uma linha visível do código: executada (bitmap) e/ou atual"""
+        # Com a thread de execução viva o Machine é dela: usa o bitmap da última fotografia
+        coverage = self.worker_coverage if self.worker is not None else self.machine.coverage
+        executed = coverage is not None and coverage[index >> 3] & (1 << (index & 7))
+        tags = ('executed',) if executed else ()
+        if index == self.current_row:
+            tags += ('current',)
+        if 4 * index in self.breakpoints.breakpoints:
+            tags += ('breakpoint',)
+        return tags
+    
+    def highlight_current_line(self, pc=None):
+        """Realça a linha do PC da máquina, ou de pc (fotografia da thread de execução)"""
+        if pc is None:
+            pc = None if self.machine.finished else self.machine.pc
+        line = None if pc is None else pc >> 2
+        self.current_row = line if line is not None and line < len(self.machine.program) else None
+        if self.current_row is not None:
+            self.code_view.see(self.current_row)
+        self.code_view.render()
+    
+    def clear_highlights(self):
+        """Redesenha o código; as linhas executadas vêm de machine.coverage, zerado no reset"""
+        self.code_view.render()
+    
+    def next_step(self):
+        if self.machine.finished:
+            self.show_register_report()
+            messagebox.showinfo("Fim", "Execução concluída!")
+            self.step_btn.config(state=tk.DISABLED)
+            return
+        
+        line = self.machine.current_line
+        bin_instr = self.machine.program.line(line)
+        self.highlight_current_line()
+        
+        result = self.machine.step()
+        if result is None:
+            if self.machine.status == STATUS_FAULT:
+                messagebox.showerror("Erro", f"Erro de execução:\n{self.machine.error}")
+            else:
+                messagebox.showinfo("Completo", " Execução concluída! ")
+            return
+        
+        assembly, _ = result
+        self.translation_label.config(text=f"Instrução Traduzida: {assembly}")
+        self.details_label.config(text=f"Decodificando: {bin_instr}")
+        # Só os registradores alterados são redesenhados; o Tk pinta a janela
+        # ao voltar para o mainloop, sem forçar um update() síncrono por passo
+        self.update_register_display()
+        self.code_view.render()
+        if self.pipeline is not None:
+            self.refresh_pipeline()
+
+    def run_all(self):
+        if not len(self.machine.program):
+            messagebox.showwarning("Aviso", "Nenhum código carregado!")
+            return
+
+        # Parado em um ponto de parada/observação: continua de onde parou
+        if self.machine.status in (STATUS_BREAK, STATUS_WATCH):
+            self.start_worker()
+            return
+
+        self.reset_simulator()
+        
+        self.show_assembly()
+
+        # Executar todas as instruções em segundo plano (com limite, para que
+        # laços infinitos terminem mesmo sem cancelamento)
+        self.start_worker()
+
+    def run_to_cursor(self):
+        """Executa a partir do PC atual até a linha do cursor no código"""
+        line = self.code_view.selected
+        if line is None:
+            messagebox.showwarning("Aviso", "Clique em uma linha do código para escolher o destino.")
+            return
+        if self.machine.finished:
+            self.reset_simulator()
+        self.start_worker(stop_at=4 * line)
+
+    def start_worker(self, stop_at=None):
+        self.stop_animation()
+        coverage = self.machine.coverage
+        self.worker_coverage = bytes(coverage) if coverage is not None else None
+        self.worker = ExecutionWorker(self.machine, max_instructions=DEFAULT_MAX_INSTRUCTIONS, stop_at=stop_at)
+        for button in (self.load_btn, self.back_btn, self.step_btn, self.run_all_btn, self.animate_btn, self.run_to_btn):
+            button.config(state=tk.DISABLED)
+        self.pause_btn.config(text="⏸ Pausar", state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.details_label.config(text="Executando...")
+        self.worker.start()
+        self.after(POLL_MS, self.poll_worker, self.worker)
+
+    def stop_worker(self):
+        """Cancela a execução em segundo plano, se houver, e espera a thread terminar"""
+        if self.worker is None:
+            return
+        self.worker.cancel()
+        self.worker.join()
+        self.worker = None
+        self.end_worker_buttons()
+
+    def toggle_pause(self):
+        if self.worker is None:
+            return
+        if self.worker.paused:
+            self.worker.resume()
+            self.pause_btn.config(text="⏸ Pausar")
+        else:
+            self.worker.pause()
+            self.pause_btn.config(text="▶ Continuar")
+
+    def cancel_run(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def end_worker_buttons(self):
+        for button in (self.load_btn, self.step_btn, self.run_all_btn, self.animate_btn, self.run_to_btn):
+            button.config(state=tk.NORMAL)
+        self.back_btn.config(state=tk.NORMAL if self.recorder is not None else tk.DISABLED)
+        self.pause_btn.config(text="⏸ Pausar", state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.DISABLED)
+
+    def toggle_trace(self):
+        """Liga ou desliga a gravação do histórico a partir do estado atual"""
+        self.stop_animation()
+        self.stop_worker()
+        if self.trace_var.get():
+            self.recorder = TraceRecorder()
+            self.recorder.attach(self.machine)
+            self.back_btn.config(state=tk.NORMAL)
+        else:
+            self.recorder.detach(self.machine)
+            self.recorder = None
+            self.back_btn.config(state=tk.DISABLED)
+
+    def toggle_coverage(self):
+        """Liga ou desliga a marcação das linhas executadas a partir do estado atual"""
+        self.stop_animation()
+        self.stop_worker()
+        self.machine.track_coverage(self.coverage_var.get())
+        self.code_view.render()
+
+    def step_back(self):
+        """Desfaz a última instrução executada usando o histórico gravado"""
+        if self.recorder is None:
+            return
+        self.stop_animation()
+        undone = self.recorder.step_back(self.machine)
+        if not undone:
+            messagebox.showinfo("Histórico", "Início do histórico gravado.")
+            return
+        line = undone[-1].pc >> 2
+        self.translation_label.config(text=f"Instrução Desfeita: {self.machine.program.assembly(line)}")
+        self.details_label.config(text=f"Instruções executadas: {self.machine.executed}")
+        self.update_register_display()
+        self.highlight_current_line()
+        self.step_btn.config(state=tk.NORMAL)
+
+    def poll_worker(self, worker):
+        """Aplica a fotografia mais recente da thread de execução e reagenda a leitura"""
+        if worker is not self.worker:
+            return  # execução já encerrada por stop_worker
+        snapshot = None
+        while not worker.snapshots.empty():
+            snapshot = worker.snapshots.get_nowait()
+        if snapshot is None:
+            self.after(POLL_MS, self.poll_worker, worker)
+            return
+
+        self.update_register_display(registers=snapshot.registers)
+        self.worker_coverage = snapshot.coverage
+        self.highlight_current_line(snapshot.pc)
+        if snapshot.state not in (DONE, CANCELLED):
+            self.details_label.config(text=f"Instruções executadas: {snapshot.executed}")
+            self.after(POLL_MS, self.poll_worker, worker)
+            return
+
+        # A thread terminou: o Machine volta a pertencer à interface
+        worker.join()
+        self.worker = None
+        self.end_worker_buttons()
+        self.refresh_profile()
+        self.refresh_pipeline()
+        if snapshot.state == CANCELLED:
+            self.details_label.config(text=f"Execução cancelada após {snapshot.executed} instruções.")
+        elif snapshot.status in (STATUS_BREAK, STATUS_WATCH):
+            self.show_stop(snapshot.executed)
+        else:
+            self.highlight_current_line()
+            self.show_register_report()
+            self.show_run_status(snapshot.status)
+
+    def show_stop(self, executed):
+        """Mostra por que a execução parou em um ponto de parada, de observação ou no cursor"""
+        hit = self.breakpoints.hit
+        reason = str(hit) if hit is not None else "Parado no cursor"
+        self.details_label.config(text=f"{reason} após {executed} instruções.")
+
+    def show_run_status(self, status):
+        """Mostra o motivo de parada de uma execução completa"""
+        executed = self.machine.executed
+        if status == STATUS_BUDGET:
+            messagebox.showwarning("Interrompido", f"Limite de {executed} instruções atingido.")
+        elif status == STATUS_TIMEOUT:
+            messagebox.showwarning("Interrompido", f"Tempo limite atingido após {executed} instruções.")
+        elif status == STATUS_FAULT:
+            messagebox.showerror("Erro", f"Erro de execução:\n{self.machine.error}")
+        elif status == STATUS_EXIT:
+            messagebox.showinfo("Concluído", f"Programa encerrado por syscall ({executed} instruções).")
+        else:
+            messagebox.showinfo("Concluído", "Execução completa!")
+
+    def toggle_animation(self):
+        if self.animation_job is None:
+            self.start_animation()
+        else:
+            self.stop_animation()
+
+    def start_animation(self):
+        """Executa o programa em lotes a partir do PC atual, redesenhando a cada quadro"""
+        if self.machine.finished:
+            self.reset_simulator()
+        self.step_btn.config(state=tk.DISABLED)
+        self.run_all_btn.config(state=tk.DISABLED)
+        self.animate_btn.config(text="⏸ Parar")
+        self.animation_job = self.after_idle(self.animation_frame)
+
+    def stop_animation(self):
+        if self.animation_job is None:
+            return
+        self.after_cancel(self.animation_job)
+        self.animation_job = None
+        self.stop_animation_buttons()
+
+    def animation_batch(self):
+        try:
+            return max(1, int(self.batch_var.get()))
+        except ValueError:
+            return ANIMATION_DEFAULT_BATCH
+
+    def animation_frame(self):
+        """Um quadro da execução animada: executa um lote e redesenha uma vez.
+
+        O lote tem no máximo o tempo de um quadro; o próximo quadro é agendado
+        descontando o tempo gasto, de modo que a taxa de redesenho fica limitada
+        a ANIMATION_FPS independente do número de instruções por quadro.
+        """
+        frame = 1.0 / ANIMATION_FPS
+        started = time.perf_counter()
+        machine = self.machine
+        limit = min(machine.executed + self.animation_batch(), DEFAULT_MAX_INSTRUCTIONS)
+        status = machine.run(max_instructions=limit, timeout=frame)
+        if status in (STATUS_BUDGET, STATUS_TIMEOUT) and machine.executed < DEFAULT_MAX_INSTRUCTIONS:
+            status = None
+
+        self.update_register_display()
+        self.highlight_current_line()
+        line = machine.current_line
+        if line < len(machine.program):
+            self.translation_label.config(text=f"Instrução Traduzida: {machine.program.assembly(line)}")
+        self.details_label.config(text=f"Instruções executadas: {machine.executed}")
+
+        if status is None:
+            elapsed = time.perf_counter() - started
+            self.animation_job = self.after(max(1, int((frame - elapsed) * 1000)), self.animation_frame)
+            return
+
+        self.animation_job = None
+        self.stop_animation_buttons()
+        self.refresh_profile()
+        self.refresh_pipeline()
+        if status in (STATUS_BREAK, STATUS_WATCH):
+            self.show_stop(machine.executed)
+            return
+        self.show_register_report()
+        self.show_run_status(status)
+
+    def stop_animation_buttons(self):
+        self.animate_btn.config(text="▶ Animar")
+        self.run_all_btn.config(state=tk.NORMAL)
+        self.step_btn.config(state=tk.NORMAL)
+
+    def show_register_report(self):
+        """Exibe relatório completo dos registradores em nova janela"""
+
+        report_window = tk.Toplevel(self)
+        report_window.title("📊 Relatório de Registradores")
+        report_window.geometry("800x500")
+        
+        # Frame principal com scroll
+        main_frame = tk.Frame(report_window)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Canvas e scrollbar
+        canvas = tk.Canvas(main_frame)
+        scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas)
+        
+        # Configurar scroll
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(
+                scrollregion=canvas.bbox("all")
+            )
+        )
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # Layout
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Cabeçalho
+        tk.Label(scrollable_frame, 
+                text="Registrador".ljust(15) + "Valor Decimal".ljust(20) + "Valor Hexadecimal",
+                font=('Courier', 10, 'bold')).pack(anchor='w')
+        
+        # Conteúdo dos registradores
+        for reg_name, value in self.machine.signed_registers().items():
+            hex_value = f"{value & 0xFFFFFFFF:08x}"
+            
+            line = f"{reg_name.ljust(15)}{str(value).ljust(20)}0x{hex_value}"
+            tk.Label(scrollable_frame, 
+                    text=line,
+                    font=('Courier', 10)).pack(anchor='w')
+
+    def show_assembly(self):
+        # Criar nova janela para exibir o assembly, traduzido só para as linhas
+        # visíveis (Program.assembly guarda as traduções recentes em cache LRU)
+        asm_window = tk.Toplevel(self)
+        asm_window.title("📜 Código Assembly")
+        asm_window.geometry("600x500")
+        
+        program = self.machine.program
+        asm_view = VirtualListView(asm_window, row_text=program.assembly, count=len(program),
+                                   font=('Consolas', 11), bg=self.dark_bg, fg='white')
+        asm_view.pack(fill=tk.BOTH, expand=True)
+    
+    def update_register_display(self, highlight=True, registers=None):
+        """Atualiza só os labels cujo valor mudou, realçando os alterados"""
+        if registers is None:
+            registers = self.machine.registers
+        shown = self.shown_registers
+        labels = self.register_labels
+        changed = {num for num in range(32) if registers[num] != shown[num]}
+        color = REGISTER_CHANGED_COLOR if highlight else REGISTER_COLOR
+        for num in self.changed_registers - changed:
+            labels[num].config(foreground=REGISTER_COLOR)
+        for num in changed:
+            shown[num] = registers[num]
+            labels[num].config(text=str(registers[num]), foreground=color)
+        self.changed_registers = changed if highlight else set()
+
+
+def main():
+    simulator = MIPSSimulator()
+    simulator.mainloop()
+
+if __name__ == "__main__":
+    main()
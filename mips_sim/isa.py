@@ -0,0 +1,274 @@
+#====================================================================================
+# MIPS Simulator - conjunto de instruções
+#
+# Descrição: Tabelas de despacho indexadas pelos campos inteiros da instrução.
+# A tabela primária tem 64 entradas (opcode) e a secundária, usada pelas
+# instruções Tipo R (opcode 0), tem 64 entradas indexadas pelo funct. Cada
+# entrada guarda o nome, o formato do assembly e a função que executa a
+# instrução, de modo que executor e tradutor consultam a mesma tabela.
+#
+# Para adicionar uma instrução basta registrá-la:
+#
+#     @instruction('xor', opcode=0, funct=0b100110, fmt="xor {rd}, {rs}, {rt}")
+#     def _xor(machine, regs, instr):
+#         ...
+#====================================================================================
+
+import string
+
+# Nomes convencionais dos registradores, indexados pelo número (32 = HI, 33 = LO).
+# Usados apenas para exibição; a execução acessa os registradores pelo índice.
+REGISTER_NAMES = (
+    "$zero", "$at", "$v0", "$v1", "$a0", "$a1", "$a2", "$a3",
+    "$t0", "$t1", "$t2", "$t3", "$t4", "$t5", "$t6", "$t7",
+    "$s0", "$s1", "$s2", "$s3", "$s4", "$s5", "$s6", "$s7",
+    "$t8", "$t9", "$k0", "$k1", "$gp", "$sp", "$fp", "$ra",
+    "$hi", "$lo",
+)
+HI = 32
+LO = 33
+NUM_REGISTERS = 34
+MASK32 = 0xFFFFFFFF
+
+# Valor atribuído ao PC pela chamada de sistema exit; fica fora de qualquer
+# programa, de modo que o laço de execução termina sem testar uma flag a cada passo
+HALT_PC = 1 << 40
+
+class ExecutionError(Exception):
+    """Falha durante a execução de uma instrução (ex.: desvio para endereço desalinhado)"""
+
+class BreakpointHit(Exception):
+    """Ponto de parada atingido: a instrução não foi executada (ver mips_sim.breakpoints)"""
+
+class WatchpointHit(Exception):
+    """Ponto de observação disparado: a instrução foi executada e mudou o valor observado"""
+
+def register_name(num):
+    """Mapeia números de registradores para nomes convencionais"""
+    if 0 <= num < NUM_REGISTERS:
+        return REGISTER_NAMES[num]
+    return f"${num}"
+
+# Expressão Python de cada campo que pode aparecer no formato do assembly
+_FORMAT_FIELDS = {
+    'rs': 'R[i.rs]',
+    'rt': 'R[i.rt]',
+    'rd': 'R[i.rd]',
+    'shamt': 'i.shamt',
+    'imm': 'i.simm',
+    'target': 'i.target',
+}
+
+def _compile_format(fmt):
+    """Transforma um formato como "add {rd}, {rs}, {rt}" em uma função instr -> str.
+
+    A função é gerada uma única vez, no registro da instrução, como uma
+    f-string que lê os campos diretamente da Instruction.
+    """
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(fmt):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is not None:
+            if field not in _FORMAT_FIELDS:
+                raise ValueError(f"Campo desconhecido no formato {fmt!r}: {field}")
+            parts.append('{' + _FORMAT_FIELDS[field] + '}')
+    source = 'lambda i: f' + repr(''.join(parts))
+    return eval(source, {'R': REGISTER_NAMES})
+
+class OpSpec:
+    """Entrada das tabelas de despacho"""
+
+    __slots__ = ('name', 'opcode', 'funct', 'fmt', 'format', 'execute')
+
+    def __init__(self, name, opcode, funct, fmt, execute):
+        self.name = name
+        self.opcode = opcode
+        self.funct = funct
+        self.fmt = fmt
+        self.format = _compile_format(fmt)
+        self.execute = execute
+
+    def __repr__(self):
+        return f"OpSpec({self.name!r})"
+
+# Tabela primária (por opcode) e secundária das instruções Tipo R (por funct)
+PRIMARY = [None] * 64
+SPECIAL = [None] * 64
+
+def lookup(opcode, funct):
+    """Retorna a OpSpec da instrução (ou None se não implementada)"""
+    if opcode == 0:
+        return SPECIAL[funct]
+    return PRIMARY[opcode]
+
+def instruction(name, opcode, funct=None, fmt=None):
+    """Decorador que registra a função de execução de uma instrução.
+
+    A função recebe (machine, regs, instr), onde regs é a lista de
+    registradores da máquina e instr a Instruction decodificada. Durante a
+    execução machine.pc já aponta para a instrução seguinte (PC+4); desvios
+    alteram machine.pc.
+    """
+    def decorator(execute):
+        define(name, opcode, funct, fmt, execute)
+        return execute
+    return decorator
+
+def define(name, opcode, funct=None, fmt=None, execute=None):
+    """Registra uma instrução nas tabelas; execute=None a torna só traduzível"""
+    spec = OpSpec(name, opcode, funct, fmt if fmt is not None else name, execute)
+    if opcode == 0:
+        SPECIAL[funct] = spec
+    else:
+        PRIMARY[opcode] = spec
+    return spec
+
+def disassemble(instr):
+    """Traduz uma Instruction decodificada para assembly"""
+    # A entrada já foi resolvida na decodificação (Instruction.op)
+    spec = instr.op
+    if spec is None:
+        if instr.opcode == 0:
+            return f"Instrução não implementada (FUNCT: {instr.funct:06b})"
+        return f"Instrução não implementada (OPCODE: {instr.opcode:06b})"
+    return spec.format(instr)
+
+def _signed(value):
+    """Interpreta um valor de 32 bits sem sinal como inteiro com sinal"""
+    return value - 0x100000000 if value & 0x80000000 else value
+
+# Escritas em $zero (índice 0) são descartadas por todas as instruções
+
+# Instruções Tipo R
+
+@instruction('add', 0, 0b100000, "add {rd}, {rs}, {rt}")
+def _add(machine, regs, instr):
+    if instr.rd:
+        regs[instr.rd] = (regs[instr.rs] + regs[instr.rt]) & MASK32
+
+@instruction('sub', 0, 0b100010, "sub {rd}, {rs}, {rt}")
+def _sub(machine, regs, instr):
+    if instr.rd:
+        regs[instr.rd] = (regs[instr.rs] - regs[instr.rt]) & MASK32
+
+@instruction('mult', 0, 0b011000, "mult {rs}, {rt}")
+def _mult(machine, regs, instr):
+    result = regs[instr.rs] * regs[instr.rt]
+    # Implementação simplificada (operandos sem sinal)
+    regs[HI] = (result >> 32) & MASK32
+    regs[LO] = result & MASK32
+
+@instruction('and', 0, 0b100100, "and {rd}, {rs}, {rt}")
+def _and(machine, regs, instr):
+    if instr.rd:
+        regs[instr.rd] = regs[instr.rs] & regs[instr.rt]
+
+@instruction('or', 0, 0b100101, "or {rd}, {rs}, {rt}")
+def _or(machine, regs, instr):
+    if instr.rd:
+        regs[instr.rd] = regs[instr.rs] | regs[instr.rt]
+
+@instruction('sll', 0, 0b000000, "sll {rd}, {rt}, {shamt}")
+def _sll(machine, regs, instr):
+    if instr.rd:
+        regs[instr.rd] = (regs[instr.rt] << instr.shamt) & MASK32
+
+@instruction('slt', 0, 0b101010, "slt {rd}, {rs}, {rt}")
+def _slt(machine, regs, instr):
+    if instr.rd:
+        regs[instr.rd] = 1 if _signed(regs[instr.rs]) < _signed(regs[instr.rt]) else 0
+
+@instruction('jr', 0, 0b001000, "jr {rs}")
+def _jr(machine, regs, instr):
+    target = regs[instr.rs]
+    if target & 3:
+        raise ExecutionError(f"jr para endereço desalinhado: 0x{target:08x}")
+    machine.pc = target
+
+@instruction('syscall', 0, 0b001100, "syscall")
+def _syscall(machine, regs, instr):
+    # $v0 = 10: encerra o programa (convenção do SPIM/MARS); demais códigos são ignorados
+    if regs[2] == 10:
+        machine.pc = HALT_PC
+
+# Instruções Tipo I
+
+@instruction('addi', 0b001000, fmt="addi {rt}, {rs}, {imm}")
+def _addi(machine, regs, instr):
+    if instr.rt:
+        regs[instr.rt] = (regs[instr.rs] + instr.simm) & MASK32
+
+@instruction('slti', 0b001010, fmt="slti {rt}, {rs}, {imm}")
+def _slti(machine, regs, instr):
+    if instr.rt:
+        regs[instr.rt] = 1 if _signed(regs[instr.rs]) < instr.simm else 0
+
+@instruction('lw', 0b100011, fmt="lw {rt}, {imm}({rs})")
+def _lw(machine, regs, instr):
+    value = machine.memory.load_word((regs[instr.rs] + instr.simm) & MASK32)
+    if instr.rt:
+        regs[instr.rt] = value
+
+@instruction('sw', 0b101011, fmt="sw {rt}, {imm}({rs})")
+def _sw(machine, regs, instr):
+    machine.memory.store_word((regs[instr.rs] + instr.simm) & MASK32, regs[instr.rt])
+
+# Load-linked / store-conditional: ll guarda em machine.link o endereço e a
+# versão da reserva (Memory.load_linked); sc só escreve se nenhuma escrita de
+# outro núcleo tocou o grânulo desde o ll (Memory.store_conditional), mesmo
+# que o valor tenha voltado ao lido, e devolve 1 (sucesso) ou 0 em rt
+
+@instruction('ll', 0b110000, fmt="ll {rt}, {imm}({rs})")
+def _ll(machine, regs, instr):
+    address = (regs[instr.rs] + instr.simm) & MASK32
+    value, version = machine.memory.load_linked(address)
+    machine.link = (address, version)
+    if instr.rt:
+        regs[instr.rt] = value
+
+@instruction('sc', 0b111000, fmt="sc {rt}, {imm}({rs})")
+def _sc(machine, regs, instr):
+    address = (regs[instr.rs] + instr.simm) & MASK32
+    if address & 3:
+        raise ExecutionError(f"sc em endereço desalinhado: 0x{address:08x}")
+    link = machine.link
+    machine.link = None
+    if link is not None and link[0] == address:
+        done = machine.memory.store_conditional(address, link[1], regs[instr.rt])
+    else:
+        done = False
+    if instr.rt:
+        regs[instr.rt] = 1 if done else 0
+
+@instruction('lui', 0b001111, fmt="lui {rt}, {imm}")
+def _lui(machine, regs, instr):
+    # Tratar immediate como valor não sinalizado
+    if instr.rt:
+        regs[instr.rt] = instr.imm << 16
+
+# Desvios condicionais: alvo = PC+4 + (immediate << 2)
+
+@instruction('beq', 0b000100, fmt="beq {rs}, {rt}, {imm}")
+def _beq(machine, regs, instr):
+    if regs[instr.rs] == regs[instr.rt]:
+        machine.pc = (machine.pc + (instr.simm << 2)) & MASK32
+
+@instruction('bne', 0b000101, fmt="bne {rs}, {rt}, {imm}")
+def _bne(machine, regs, instr):
+    if regs[instr.rs] != regs[instr.rt]:
+        machine.pc = (machine.pc + (instr.simm << 2)) & MASK32
+
+# Instruções Tipo J: alvo = 4 bits altos de PC+4 | (target << 2)
+
+@instruction('j', 0b000010, fmt="j {target}")
+def _j(machine, regs, instr):
+    machine.pc = (machine.pc & 0xF0000000) | (instr.target << 2)
+
+@instruction('jal', 0b000011, fmt="jal {target}")
+def _jal(machine, regs, instr):
+    regs[31] = machine.pc
+    machine.pc = (machine.pc & 0xF0000000) | (instr.target << 2)
+
+# Chamadas de sistema (exemplo não padrão)
+
+define('print_int', 0b000001, fmt="print_int {rt}")
@@ -0,0 +1,155 @@
+#====================================================================================
+# MIPS Simulator - leitura de programas
+#
+# Descrição: Lê arquivos de programa direto para um array('I') de palavras de
+# 32 bits, sem guardar as linhas originais. Formatos aceitos:
+#
+#   text  texto com uma instrução de 32 caracteres '0'/'1' por linha (como os
+#         final*.txt); linhas em branco e comentários (# ou //) são ignorados
+#   hex   texto com palavras hexadecimais (ex.: 2108000a ou 0x2108000a),
+#         separadas por espaços ou quebras de linha; aceita comentários #
+#   bin   imagem binária crua, palavras big-endian
+#
+# Os formatos hex e bin são convertidos em bloco (bytes.fromhex / array) em vez
+# de linha por linha.
+#====================================================================================
+
+import os
+import re
+import sys
+from array import array
+
+FORMATS = ('text', 'hex', 'bin')
+
+# Uma instrução do formato texto: exatamente 32 caracteres '0'/'1' (sem sinal nem '_', que int() aceitaria)
+_BINARY_LINE = re.compile(r'[01]{32}')
+
+# Extensões reconhecidas por detect_format; o restante é lido como texto
+_EXTENSIONS = {
+    '.bin': 'bin',
+    '.hex': 'hex',
+}
+
+def _word_array(data=b''):
+    """array('I') de palavras de 32 bits a partir de bytes big-endian"""
+    words = array('I')
+    if data:
+        words.frombytes(data)
+        if sys.byteorder == 'little':
+            words.byteswap()
+    return words
+
+def detect_format(file_path):
+    """Formato do arquivo a partir da extensão ('text' por padrão)"""
+    return _EXTENSIONS.get(os.path.splitext(file_path)[1].lower(), 'text')
+
+def read_binary(file_path):
+    """Lê uma imagem binária big-endian"""
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    if len(data) % 4:
+        raise ValueError(f"{file_path}: tamanho ({len(data)} bytes) não é múltiplo de 4")
+    return _word_array(data)
+
+def _strip_comment(line):
+    for marker in ('#', '//'):
+        index = line.find(marker)
+        if index >= 0:
+            line = line[:index]
+    return line
+
+def read_hex(file_path):
+    """Lê um dump hexadecimal (uma ou mais palavras por linha)"""
+    with open(file_path, 'r') as file:
+        text = file.read()
+    if '#' in text or '//' in text:
+        text = '\n'.join(_strip_comment(line) for line in text.splitlines())
+    tokens = text.lower().replace('0x', ' ').split()
+    for token in tokens:
+        if len(token) > 8:
+            raise ValueError(f"{file_path}: palavra hexadecimal inválida: {token}")
+    try:
+        return _word_array(bytes.fromhex(''.join(token.zfill(8) for token in tokens)))
+    except ValueError:
+        raise ValueError(f"{file_path}: dump hexadecimal inválido") from None
+
+def iter_text_words(file):
+    """Gera as palavras de um arquivo texto de instruções binárias, linha a linha.
+
+    Linhas em branco e comentários são ignorados; nenhuma linha é guardada.
+    """
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line or line[0] == '#' or line.startswith('//'):
+            continue
+        if '#' in line or '//' in line:
+            line = _strip_comment(line).strip()
+        if len(line) != 32:
+            raise ValueError(f"linha {number}: instrução deve ter 32 bits, tem {len(line)}")
+        if _BINARY_LINE.fullmatch(line) is None:
+            raise ValueError(f"linha {number}: instrução binária inválida: {line}")
+        yield int(line, 2)
+
+# Linhas convertidas por vez em read_text
+TEXT_CHUNK_LINES = 65536
+
+def _text_chunk_words(lines):
+    """Converte um bloco de linhas já limpas em palavras de uma só vez.
+
+    As linhas são concatenadas em um único número binário, convertido com
+    int(..., 2) e to_bytes, o que evita uma chamada de int() por linha. A
+    regra é a mesma de iter_text_words (_BINARY_LINE): cada linha com 32
+    caracteres, todos '0' ou '1'; senão levanta ValueError.
+    """
+    if set(map(len, lines)) != {32}:
+        raise ValueError
+    joined = ''.join(lines)
+    # Caracteres não ASCII fazem encode levantar UnicodeEncodeError (um ValueError)
+    if joined.encode('ascii').translate(None, b'01'):
+        raise ValueError
+    return _word_array(int(joined, 2).to_bytes(4 * len(lines), 'big'))
+
+def read_text(file_path):
+    """Lê um arquivo texto de instruções binárias em modo streaming.
+
+    O arquivo é processado em blocos de TEXT_CHUNK_LINES linhas; nenhuma
+    linha é guardada depois de convertida.
+    """
+    words = _word_array()
+    with open(file_path, 'r') as file:
+        while True:
+            chunk = file.readlines(TEXT_CHUNK_LINES * 34)
+            if not chunk:
+                break
+            text = ''.join(chunk)
+            if '#' in text or '//' in text:
+                lines = [_strip_comment(line).strip() for line in chunk]
+                lines = [line for line in lines if line]
+            else:
+                # Caminho rápido: sem comentários, split() já descarta linhas em branco
+                lines = text.split()
+            if not lines:
+                continue
+            try:
+                words.extend(_text_chunk_words(lines))
+            except ValueError:
+                # Reprocessa linha a linha só para apontar a linha com erro
+                file.seek(0)
+                for _ in iter_text_words(file):
+                    pass
+                raise ValueError(f"{file_path}: instrução binária inválida") from None
+    return words
+
+_READERS = {
+    'text': read_text,
+    'hex': read_hex,
+    'bin': read_binary,
+}
+
+def read_words(file_path, fmt=None):
+    """Lê um programa no formato fmt (ou detectado pela extensão) como array de palavras"""
+    if fmt is None:
+        fmt = detect_format(file_path)
+    if fmt not in _READERS:
+        raise ValueError(f"Formato desconhecido: {fmt} (use um de {', '.join(FORMATS)})")
+    return _READERS[fmt](file_path)
@@ -0,0 +1,327 @@
+#====================================================================================
+# MIPS Simulator - memória paginada
+#
+# Descrição: Memória de 32 bits endereçada em bytes, dividida em páginas de
+# 4 KiB alocadas sob demanda como bytearray. Leituras de páginas nunca escritas
+# devolvem 0 sem alocar nada. Palavras são big-endian e precisam estar
+# alinhadas em 4 bytes. Cada página escrita é marcada como suja (dirty), o que
+# permite copiar ou restaurar apenas o que mudou.
+#
+# Imagens de dados grandes podem ser mapeadas de um arquivo com mmap
+# (Memory.map_file): as páginas passam a ser fatias somente leitura do
+# mapeamento, copiadas para um bytearray na primeira escrita (copy-on-write),
+# e o arquivo nunca é alterado.
+#
+# Um buffer gravável (ex.: multiprocessing.shared_memory) pode ser mapeado com
+# Memory.map_buffer: as escritas vão direto para o buffer, de modo que várias
+# memórias (uma por processo) enxergam os mesmos dados. Com Memory.share o
+# intervalo é escrito também por outros núcleos: as páginas ficam somente
+# leitura, e as escritas passam por SharedRange, que as faz com um lock e
+# invalida as reservas de ll (load_linked / store_conditional) dos núcleos.
+#
+# Fotografias (Memory.freeze / Memory.restore) trocam as páginas privadas
+# (bytearray) por objetos bytes imutáveis compartilhados entre a memória e a
+# fotografia; a primeira escrita em uma página compartilhada a copia para um
+# novo bytearray (copy-on-write), de modo que tirar e restaurar fotografias só
+# copia as páginas que mudaram. Páginas mapeadas (memoryview) não são
+# copiadas: as de map_file nunca mudam, e as de map_buffer/share continuam
+# ligadas ao buffer, cujo conteúdo a fotografia não congela.
+#====================================================================================
+
+import hashlib
+import mmap
+import struct
+from contextlib import nullcontext
+
+from .isa import MASK32, ExecutionError
+
+PAGE_SHIFT = 12
+PAGE_SIZE = 1 << PAGE_SHIFT
+OFFSET_MASK = PAGE_SIZE - 1
+
+_WORD = struct.Struct('>I')
+_PAIR = struct.Struct('>II')
+
+# Grânulo da reserva de ll/sc em memória compartilhada: 64 bytes (uma linha de
+# cache); uma escrita em qualquer palavra do grânulo faz o sc seguinte falhar
+RESERVATION_SHIFT = 6
+
+class SharedRange:
+    """Intervalo [base, end) escrito por vários núcleos (ver Memory.share).
+
+    buffer é a visão gravável dos dados e versions um contador de 32 bits por
+    grânulo de 2 ** RESERVATION_SHIFT bytes, também compartilhado. Toda
+    escrita no intervalo é feita com lock adquirido e incrementa o contador
+    do grânulo; o ll guarda o contador e o sc só escreve se ele não mudou.
+    lock precisa ser reentrante (ex.: multiprocessing.RLock) ou None quando
+    todos os núcleos rodam no mesmo processo.
+    """
+
+    def __init__(self, base, buffer, versions, lock=None):
+        self.base = base
+        self.buffer = buffer
+        self.end = base + len(buffer)
+        self.versions = versions
+        self.lock = lock if lock is not None else nullcontext()
+
+    def __contains__(self, address):
+        return self.base <= address < self.end
+
+    def version(self, address):
+        return self.versions[(address - self.base) >> RESERVATION_SHIFT]
+
+    def store_word(self, address, value):
+        granule = (address - self.base) >> RESERVATION_SHIFT
+        with self.lock:
+            _WORD.pack_into(self.buffer, address - self.base, value & MASK32)
+            self.versions[granule] = (self.versions[granule] + 1) & MASK32
+
+    def write(self, address, data):
+        """Copia os bytes de data para address, invalidando as reservas dos grânulos tocados"""
+        offset = address - self.base
+        versions = self.versions
+        with self.lock:
+            self.buffer[offset:offset + len(data)] = data
+            for granule in range(offset >> RESERVATION_SHIFT, ((offset + len(data) - 1) >> RESERVATION_SHIFT) + 1):
+                versions[granule] = (versions[granule] + 1) & MASK32
+
+    def release(self):
+        self.buffer.release()
+        self.versions.release()
+
+class Memory:
+    """Memória paginada: {número da página: bytearray de PAGE_SIZE bytes}
+
+    Páginas compartilhadas com uma fotografia são bytes e as mapeadas de um
+    arquivo são memoryviews somente leitura; as escritas as substituem por
+    uma cópia privada.
+    """
+
+    def __init__(self):
+        self.pages = {}
+        self.dirty = set()
+        self._mappings = []
+        # Páginas da última fotografia (freeze/restore) de que self.dirty é a diferença
+        self._base = None
+        # Intervalo escrito também por outros núcleos (SharedRange, ver share)
+        self.shared = None
+
+    def load_word(self, address):
+        """Lê a palavra de 32 bits (sem sinal) no endereço alinhado address"""
+        if address & 3:
+            raise ExecutionError(f"lw em endereço desalinhado: 0x{address:08x}")
+        page = self.pages.get(address >> PAGE_SHIFT)
+        if page is None:
+            return 0
+        return _WORD.unpack_from(page, address & OFFSET_MASK)[0]
+
+    def store_word(self, address, value):
+        """Escreve a palavra value no endereço alinhado address"""
+        if address & 3:
+            raise ExecutionError(f"sw em endereço desalinhado: 0x{address:08x}")
+        number = address >> PAGE_SHIFT
+        page = self.pages.get(number)
+        if page is None:
+            page = self.pages[number] = bytearray(PAGE_SIZE)
+        try:
+            _WORD.pack_into(page, address & OFFSET_MASK, value & MASK32)
+        except TypeError:
+            if self.shared is not None and address in self.shared:
+                self.shared.store_word(address, value)
+                return
+            # Página compartilhada com uma fotografia: copia antes de escrever
+            page = self.pages[number] = bytearray(page)
+            _WORD.pack_into(page, address & OFFSET_MASK, value & MASK32)
+        self.dirty.add(number)
+
+    def load_linked(self, address):
+        """Lê a palavra em address para um ll; retorna (valor, versão da reserva)
+
+        Fora de um intervalo compartilhado a versão é sempre 0: só o próprio
+        núcleo escreve ali e o sc sempre consegue.
+        """
+        if address & 3:
+            raise ExecutionError(f"ll em endereço desalinhado: 0x{address:08x}")
+        shared = self.shared
+        # A versão é lida antes do valor: uma escrita entre os dois faz o sc falhar
+        version = shared.version(address) if shared is not None and address in shared else 0
+        return self.load_word(address), version
+
+    def store_conditional(self, address, version, value):
+        """Escreve value em address se a reserva do ll (version) ainda vale; retorna se escreveu"""
+        if address & 3:
+            raise ExecutionError(f"sc em endereço desalinhado: 0x{address:08x}")
+        shared = self.shared
+        if shared is None or address not in shared:
+            self.store_word(address, value)
+            return True
+        with shared.lock:
+            if shared.version(address) != version:
+                return False
+            # Por self.store_word, para que um tracer (mips_sim.trace) registre a escrita
+            self.store_word(address, value)
+            return True
+
+    def load_byte(self, address):
+        page = self.pages.get(address >> PAGE_SHIFT)
+        if page is None:
+            return 0
+        return page[address & OFFSET_MASK]
+
+    def store_byte(self, address, value):
+        number = address >> PAGE_SHIFT
+        page = self.pages.get(number)
+        if page is None:
+            page = self.pages[number] = bytearray(PAGE_SIZE)
+        try:
+            page[address & OFFSET_MASK] = value & 0xFF
+        except TypeError:
+            if self.shared is not None and address in self.shared:
+                self.shared.write(address, bytes((value & 0xFF,)))
+                return
+            page = self.pages[number] = bytearray(page)
+            page[address & OFFSET_MASK] = value & 0xFF
+        self.dirty.add(number)
+
+    def load_image(self, base, data):
+        """Copia os bytes de data para a memória a partir do endereço base"""
+        view = memoryview(data).cast('B')
+        address = base
+        offset = 0
+        while offset < len(view):
+            number = address >> PAGE_SHIFT
+            start = address & OFFSET_MASK
+            size = min(PAGE_SIZE - start, len(view) - offset)
+            page = self.pages.get(number)
+            if page is None:
+                page = self.pages[number] = bytearray(PAGE_SIZE)
+            elif self.shared is not None and address in self.shared:
+                self.shared.write(address, view[offset:offset + size])
+                page = None
+            elif isinstance(page, bytes) or (isinstance(page, memoryview) and page.readonly):
+                page = self.pages[number] = bytearray(page)
+            if page is not None:
+                page[start:start + size] = view[offset:offset + size]
+            self.dirty.add(number)
+            address += size
+            offset += size
+
+    def map_file(self, base, file_path):
+        """Mapeia um arquivo (copy-on-write) na memória a partir de base, alinhado à página.
+
+        As páginas completas apontam direto para o mmap, somente leitura e sem
+        cópia; a primeira escrita em uma delas a copia para a memória do simulador.
+        """
+        if base & OFFSET_MASK:
+            raise ValueError(f"Endereço base não alinhado à página: 0x{base:08x}")
+        with open(file_path, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mappings.append(mapping)
+        view = memoryview(mapping)
+        full = len(view) - (len(view) & OFFSET_MASK)
+        self.map_buffer(base, view[:full])
+        if full < len(view):
+            self.load_image(base + full, view[full:])
+
+    def map_buffer(self, base, buffer):
+        """Usa buffer (com tamanho múltiplo da página) como as páginas a partir de base.
+
+        Nada é copiado: leituras e escritas nesse intervalo vão direto para o
+        buffer (se ele for somente leitura, a primeira escrita copia a página).
+        Para liberá-lo, use unmap_buffer.
+        """
+        view = memoryview(buffer).cast('B')
+        if base & OFFSET_MASK or len(view) & OFFSET_MASK:
+            raise ValueError(f"Buffer não alinhado à página: 0x{base:08x} ({len(view)} bytes)")
+        first = base >> PAGE_SHIFT
+        for index, offset in enumerate(range(0, len(view), PAGE_SIZE)):
+            self.pages[first + index] = view[offset:offset + PAGE_SIZE]
+            self.dirty.add(first + index)
+
+    def share(self, base, buffer, versions, lock=None):
+        """Como map_buffer, para um intervalo escrito também por outros núcleos.
+
+        versions é o buffer compartilhado com os contadores de SharedRange
+        (4 bytes por grânulo de 2 ** RESERVATION_SHIFT bytes) e lock o lock
+        reentrante comum a todos os processos. As páginas são mapeadas somente
+        leitura, de modo que toda escrita passa por SharedRange. Para soltar
+        os buffers, use unmap_buffer.
+        """
+        view = memoryview(buffer).cast('B')
+        self.map_buffer(base, view.toreadonly())
+        self.shared = SharedRange(base, view, memoryview(versions).cast('B').cast('I'), lock)
+
+    def unmap_buffer(self, base, size):
+        """Troca as páginas mapeadas com map_buffer por cópias privadas, soltando o buffer"""
+        if self.shared is not None and self.shared.base == base:
+            self.shared.release()
+            self.shared = None
+        first = base >> PAGE_SHIFT
+        for number in range(first, first + (size >> PAGE_SHIFT)):
+            page = self.pages.get(number)
+            if isinstance(page, memoryview):
+                self.pages[number] = bytearray(page)
+                page.release()
+
+    def words(self):
+        """Palavras diferentes de zero, como pares (endereço, valor) em ordem de endereço"""
+        for number in sorted(self.pages):
+            page = self.pages[number]
+            base = number << PAGE_SHIFT
+            for offset, (value,) in enumerate(_WORD.iter_unpack(page)):
+                if value:
+                    yield base + (offset << 2), value
+
+    def digest(self):
+        """SHA-256 do conteúdo (palavras diferentes de zero), independente da paginação"""
+        sha = hashlib.sha256()
+        for address, value in self.words():
+            sha.update(_PAIR.pack(address, value))
+        return sha.hexdigest()
+
+    def freeze(self):
+        """Fotografia do conteúdo: {número da página: bytes}, compartilhada com a memória.
+
+        As páginas privadas (bytearray) são convertidas em bytes e passam a ser
+        usadas também pela própria memória; as que já eram compartilhadas não
+        são copiadas, nem as mapeadas (memoryview), que a fotografia guarda por
+        referência: as de map_file nunca mudam e as de um buffer compartilhado
+        (map_buffer/share) continuam mostrando o conteúdo atual do buffer. A
+        partir daqui self.dirty lista o que mudou desde a fotografia.
+        """
+        pages = self.pages
+        for number, page in pages.items():
+            if type(page) is bytearray:
+                pages[number] = bytes(page)
+        frozen = dict(pages)
+        self.dirty.clear()
+        self._base = frozen
+        return frozen
+
+    def restore(self, frozen):
+        """Volta ao conteúdo de uma fotografia criada por freeze.
+
+        Se a memória veio dessa mesma fotografia, só as páginas escritas desde
+        então (self.dirty) são trocadas; caso contrário o dicionário de páginas
+        é copiado (só referências, os bytes continuam compartilhados).
+        """
+        if self._base is frozen:
+            pages = self.pages
+            for number in self.dirty:
+                page = frozen.get(number)
+                if page is None:
+                    pages.pop(number, None)
+                else:
+                    pages[number] = page
+        else:
+            self.pages = dict(frozen)
+        self.dirty.clear()
+        self._base = frozen
+
+    def clear_dirty(self):
+        self.dirty.clear()
+        self._base = None
+
+    @property
+    def page_count(self):
+        return len(self.pages)
@@ -0,0 +1,243 @@
+#====================================================================================
+# MIPS Simulator - vários núcleos com memória compartilhada
+#
+# Descrição: N núcleos MIPS (cada um um Machine, com registradores, PC e
+# memória privada próprios) que enxergam o mesmo intervalo de dados
+# [shared_base, shared_base + shared_size). Esse intervalo é um segmento de
+# multiprocessing.shared_memory mapeado diretamente nas páginas de cada
+# memória (Memory.map_buffer), de modo que lw/sw de qualquer núcleo, em
+# qualquer processo, leem e escrevem os mesmos bytes.
+#
+# Cada núcleo recebe o seu número em $a0 e o total de núcleos em $a1, e pode
+# rodar um programa próprio ou o mesmo programa dos demais. As operações
+# atômicas ll/sc (mips_sim.isa) são load-linked / store-conditional: o sc
+# falha se qualquer escrita (sw ou sc de outro núcleo) tocou o grânulo desde
+# o ll. Para isso o segmento guarda, depois dos dados, os contadores de
+# versão de Memory.share, e toda escrita no intervalo os incrementa com um
+# lock comum a todos os processos.
+#
+# Dois modos de execução:
+#   - run_lockstep: todos os núcleos no processo atual, intercalados de
+#     quantum em quantum instruções, sempre na mesma ordem; o resultado é
+#     determinístico (reprodutível);
+#   - run_parallel: um processo por núcleo, de verdade em paralelo; a ordem
+#     dos acessos à memória compartilhada depende do escalonamento do sistema.
+#
+# Uso:
+#     with MultiCore(program, cores=4) as system:
+#         system.run_parallel()
+#         print(system.load_word(0x10000000))
+#====================================================================================
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .core import FINAL_STATUSES, STATUS_TIMEOUT, Machine, Program
+from .memory import PAGE_SHIFT, PAGE_SIZE, RESERVATION_SHIFT
+
+# Intervalo de dados compartilhado (o segmento de dados padrão do MIPS)
+DEFAULT_SHARED_BASE = 0x10000000
+DEFAULT_SHARED_SIZE = 1 << 20
+
+# Registradores com o número do núcleo e o total de núcleos
+CORE_ID_REGISTER = 4    # $a0
+CORE_COUNT_REGISTER = 5 # $a1
+
+# Instruções de cada núcleo por rodada no modo lockstep
+DEFAULT_QUANTUM = 1
+
+class MultiCore:
+    """Núcleos MIPS com um intervalo de memória compartilhado (multiprocessing.shared_memory)"""
+
+    def __init__(self, programs, cores=None, shared_base=DEFAULT_SHARED_BASE, shared_size=DEFAULT_SHARED_SIZE,
+                 max_instructions=None, timeout=None):
+        if isinstance(programs, Program):
+            programs = [programs] * (cores or 1)
+        elif cores is not None and len(programs) != cores:
+            raise ValueError(f"{len(programs)} programas para {cores} núcleos")
+        if not programs:
+            raise ValueError("É preciso pelo menos um núcleo")
+        if shared_base & (PAGE_SIZE - 1) or shared_size <= 0 or shared_size & (PAGE_SIZE - 1):
+            raise ValueError(f"Intervalo compartilhado não alinhado à página: 0x{shared_base:08x} "
+                             f"({shared_size} bytes)")
+        self.shared_base = shared_base
+        self.shared_size = shared_size
+        self.max_instructions = max_instructions
+        self.timeout = timeout
+        # Dados seguidos dos contadores de versão das reservas de ll/sc (4 bytes por grânulo)
+        self.shm = shared_memory.SharedMemory(create=True, size=shared_size + _versions_size(shared_size))
+        self.cores = [Machine(program, max_instructions, timeout) for program in programs]
+        for core_id in range(len(self.cores)):
+            self._init_core(core_id)
+
+    def _init_core(self, core_id):
+        machine = self.cores[core_id]
+        _share(machine.memory, self.shm, self.shared_base, self.shared_size)
+        machine.registers[CORE_ID_REGISTER] = core_id
+        machine.registers[CORE_COUNT_REGISTER] = len(self.cores)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Libera o segmento compartilhado; cada núcleo fica com uma cópia privada do conteúdo final"""
+        if self.shm is None:
+            return
+        for machine in self.cores:
+            machine.memory.unmap_buffer(self.shared_base, self.shared_size)
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+    def reset(self):
+        """Volta todos os núcleos ao início e zera a memória compartilhada"""
+        self.shm.buf[:] = bytes(len(self.shm.buf))
+        for core_id, machine in enumerate(self.cores):
+            machine.reset()
+            self._init_core(core_id)
+
+    def load_word(self, address):
+        """Palavra da memória compartilhada (ou privada do núcleo 0, fora do intervalo)"""
+        return self.cores[0].memory.load_word(address)
+
+    @property
+    def finished(self):
+        return all(machine.status in FINAL_STATUSES for machine in self.cores)
+
+    @property
+    def executed(self):
+        return sum(machine.executed for machine in self.cores)
+
+    def run_lockstep(self, quantum=DEFAULT_QUANTUM, max_instructions=None, timeout=None, compiled=False):
+        """Executa os núcleos no processo atual, quantum instruções de cada um por rodada.
+
+        A ordem é sempre a dos núcleos, então duas execuções com os mesmos
+        programas dão o mesmo resultado. max_instructions e timeout valem
+        por núcleo (padrão: os do construtor). Retorna os status dos núcleos.
+        """
+        if max_instructions is None:
+            max_instructions = self.max_instructions
+        if timeout is None:
+            timeout = self.timeout
+        deadline = time.perf_counter() + timeout if timeout else None
+        running = [machine for machine in self.cores if machine.status not in FINAL_STATUSES]
+        while running:
+            for machine in running:
+                limit = machine.executed + quantum
+                if max_instructions is not None:
+                    limit = min(limit, max_instructions)
+                machine.run(compiled=compiled, max_instructions=limit)
+            running = [machine for machine in running if machine.status not in FINAL_STATUSES
+                       and (max_instructions is None or machine.executed < max_instructions)]
+            if deadline is not None and running and time.perf_counter() > deadline:
+                for machine in running:
+                    machine.status = STATUS_TIMEOUT
+                break
+        return [machine.status for machine in self.cores]
+
+    def run_parallel(self, max_instructions=None, timeout=None, compiled=False):
+        """Executa cada núcleo em um processo próprio, todos ao mesmo tempo.
+
+        Os núcleos continuam do estado atual: registradores, PC, contagem,
+        reserva do ll e páginas da memória privada são enviados a cada
+        processo. Ao final, registradores, PC, status, reserva e memória
+        privada de cada processo são copiados de volta para self.cores.
+        Retorna os status dos núcleos.
+        """
+        if max_instructions is None:
+            max_instructions = self.max_instructions
+        if timeout is None:
+            timeout = self.timeout
+        lock = multiprocessing.RLock()
+        # Todos os núcleos precisam rodar ao mesmo tempo (um pode esperar pelo outro)
+        with ProcessPoolExecutor(max_workers=len(self.cores), initializer=_init_worker,
+                                 initargs=(lock,)) as pool:
+            futures = [pool.submit(_run_core, self.shm.name, self.shared_base, self.shared_size,
+                                   _program_source(machine.program), machine.registers, machine.pc,
+                                   machine.executed, machine.link,
+                                   _private_pages(machine.memory, self.shared_base, self.shared_size),
+                                   max_instructions, timeout, compiled)
+                       for machine in self.cores]
+            results = [future.result() for future in futures]
+        for machine, result in zip(self.cores, results):
+            machine.registers[:] = result['registers']
+            machine.pc = result['pc']
+            machine.executed = result['executed']
+            machine.status = result['status']
+            machine.error = result['error']
+            machine.link = result['link']
+            for number, page in result['pages'].items():
+                machine.memory.pages[number] = bytearray(page)
+        return [machine.status for machine in self.cores]
+
+    def to_dict(self):
+        """Resumo serializável (JSON): estado de cada núcleo e palavras da memória compartilhada"""
+        end = self.shared_base + self.shared_size
+        memory = self.cores[0].memory
+        return {
+            'cores': [{key: value for key, value in machine.to_dict().items() if key != 'memory'}
+                      for machine in self.cores],
+            'shared_memory': {str(address): value for address, value in memory.words()
+                              if self.shared_base <= address < end},
+        }
+
+def _versions_size(shared_size):
+    return (shared_size >> RESERVATION_SHIFT) * 4
+
+def _share(memory, shm, shared_base, shared_size, lock=None):
+    """Mapeia o segmento shm (dados e contadores de versão) em memory"""
+    versions = shm.buf[shared_size:shared_size + _versions_size(shared_size)]
+    memory.share(shared_base, shm.buf[:shared_size], versions, lock)
+
+# Funções executadas nos processos de run_parallel
+
+_lock = None
+
+def _init_worker(lock):
+    global _lock
+    _lock = lock
+
+def _program_source(program):
+    """Palavras (ou linhas de texto) do programa, para enviar a outro processo"""
+    return program.words if program.words is not None else program.lines
+
+def _private_pages(memory, shared_base, shared_size):
+    """Páginas de memory fora do intervalo compartilhado, como bytes (para enviar a outro processo)"""
+    first = shared_base >> PAGE_SHIFT
+    last = first + (shared_size >> PAGE_SHIFT)
+    return {number: bytes(page) for number, page in memory.pages.items() if not first <= number < last}
+
+def _run_core(name, shared_base, shared_size, source, registers, pc, executed, link, pages, max_instructions,
+              timeout, compiled):
+    """Executa um núcleo sobre o segmento compartilhado name; devolve o estado final"""
+    program = Program(source) if isinstance(source, list) else Program.from_words(source)
+    shm = shared_memory.SharedMemory(name=name)
+    machine = Machine(program, max_instructions, timeout)
+    memory = machine.memory
+    try:
+        for number, page in pages.items():
+            memory.pages[number] = bytearray(page)
+        _share(memory, shm, shared_base, shared_size, _lock)
+        machine.registers[:] = registers
+        machine.pc = pc
+        machine.executed = executed
+        machine.link = link
+        machine.run(compiled=compiled)
+        return {
+            'registers': machine.registers,
+            'pc': machine.pc,
+            'executed': machine.executed,
+            'status': machine.status,
+            'error': machine.error,
+            'link': machine.link,
+            'pages': _private_pages(memory, shared_base, shared_size),
+        }
+    finally:
+        # As páginas mapeadas precisam ser soltas antes de fechar o segmento
+        memory.unmap_buffer(shared_base, shared_size)
+        shm.close()
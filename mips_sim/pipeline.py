@@ -0,0 +1,227 @@
+#====================================================================================
+# MIPS Simulator - modelo de tempo do pipeline de 5 estágios
+#
+# Descrição: Estima os ciclos que o programa levaria em um pipeline MIPS
+# clássico (IF, ID, EX, MEM, WB), em ordem e com uma instrução por ciclo.
+# O modelo acompanha a sequência de instruções executadas pelo simulador
+# funcional (não executa nada por conta própria) e calcula, para cada uma,
+# o ciclo em que entra em EX:
+#
+#   - dependências de dados: com adiantamento (forwarding) o resultado de
+#     uma instrução de ULA está disponível para o EX seguinte e o de um load
+#     só um ciclo depois (bolha de load-use); sem adiantamento o consumidor
+#     espera o WB do produtor (escrita na 1ª metade do ciclo, leitura na 2ª);
+#   - desvios: previsão "não tomado"; desvios condicionais tomados custam
+#     branch_penalty ciclos e saltos (j, jal, jr) jump_penalty ciclos.
+#
+# Com o modelo desligado (machine.pipeline = None) a execução não muda.
+#
+# Uso:
+#     model = PipelineModel()
+#     model.attach(machine)
+#     machine.run()
+#     print(model.report(machine)['cpi'])
+#     print(model.format_diagram(machine))
+#====================================================================================
+
+from array import array
+from collections import deque
+
+from .isa import HI, LO
+
+# Estágios, na ordem
+STAGES = ('IF', 'ID', 'EX', 'MEM', 'WB')
+
+# Tipos de controle
+CONTROL_NONE = 0
+CONTROL_BRANCH = 1
+CONTROL_JUMP = 2
+
+# Penalidades padrão: desvios resolvidos em EX, saltos em ID
+DEFAULT_BRANCH_PENALTY = 2
+DEFAULT_JUMP_PENALTY = 1
+
+# Instruções mantidas para o diagrama
+DEFAULT_HISTORY = 8
+
+# Nome -> (campos lidos em EX, campos lidos em MEM, campos escritos, é load, controle).
+# Campos são nomes de atributos da Instruction ou números fixos de registradores.
+OPERANDS = {
+    'add': (('rs', 'rt'), (), ('rd',), False, CONTROL_NONE),
+    'sub': (('rs', 'rt'), (), ('rd',), False, CONTROL_NONE),
+    'and': (('rs', 'rt'), (), ('rd',), False, CONTROL_NONE),
+    'or': (('rs', 'rt'), (), ('rd',), False, CONTROL_NONE),
+    'slt': (('rs', 'rt'), (), ('rd',), False, CONTROL_NONE),
+    'sll': (('rt',), (), ('rd',), False, CONTROL_NONE),
+    'mult': (('rs', 'rt'), (), (HI, LO), False, CONTROL_NONE),
+    'jr': (('rs',), (), (), False, CONTROL_JUMP),
+    'syscall': ((2,), (), (), False, CONTROL_NONE),
+    'addi': (('rs',), (), ('rt',), False, CONTROL_NONE),
+    'slti': (('rs',), (), ('rt',), False, CONTROL_NONE),
+    'lw': (('rs',), (), ('rt',), True, CONTROL_NONE),
+    'sw': (('rs',), ('rt',), (), False, CONTROL_NONE),
+    'll': (('rs',), (), ('rt',), True, CONTROL_NONE),
+    'sc': (('rs',), ('rt',), ('rt',), True, CONTROL_NONE),
+    'lui': ((), (), ('rt',), False, CONTROL_NONE),
+    'beq': (('rs', 'rt'), (), (), False, CONTROL_BRANCH),
+    'bne': (('rs', 'rt'), (), (), False, CONTROL_BRANCH),
+    'j': ((), (), (), False, CONTROL_JUMP),
+    'jal': ((), (), (31,), False, CONTROL_JUMP),
+}
+
+def _fields(instr, names):
+    return tuple(name if isinstance(name, int) else getattr(instr, name) for name in names)
+
+class PipelineModel:
+    """Contador de ciclos de um pipeline de 5 estágios, alimentado pelas instruções executadas"""
+
+    def __init__(self, forwarding=True, branch_penalty=DEFAULT_BRANCH_PENALTY,
+                 jump_penalty=DEFAULT_JUMP_PENALTY, history=DEFAULT_HISTORY):
+        self.forwarding = forwarding
+        self.branch_penalty = branch_penalty
+        self.jump_penalty = jump_penalty
+        self.history = deque(maxlen=history)
+        self.stalls = array('Q')
+        self._info = {}
+        self._clear()
+
+    def _clear(self):
+        self.instructions = 0
+        self.load_use_stalls = 0
+        self.data_stalls = 0
+        self.control_stalls = 0
+        self.last_ex = 2          # o primeiro IF é no ciclo 1, logo o primeiro EX é no 3
+        self.next_fetch = 1
+        self.ready = [0] * 34     # ciclo de EX a partir do qual cada registrador está disponível
+        self.from_load = [False] * 34
+        self.history.clear()
+
+    def attach(self, machine):
+        machine.pipeline = self
+        self.reset(machine)
+
+    def detach(self, machine):
+        machine.pipeline = None
+
+    def reset(self, machine):
+        """Zera as contagens para o programa de machine (chamado por Machine.reset)"""
+        self._clear()
+        self.stalls = array('Q', bytes(8 * len(machine.program)))
+        self._info = {}
+
+    def _operands(self, instr):
+        """(lidos em EX, escritos, é load, controle) da instrução, conforme o adiantamento"""
+        entry = OPERANDS.get(instr.op.name) if instr.op is not None else None
+        if entry is None:
+            return (), (), False, CONTROL_NONE
+        ex_reads, mem_reads, writes, load, control = entry
+        # Com adiantamento o dado de um sw chega a tempo no MEM; sem ele é lido no ID como os demais
+        reads = ex_reads if self.forwarding else ex_reads + mem_reads
+        reads = tuple(reg for reg in _fields(instr, reads) if reg)
+        writes = tuple(reg for reg in _fields(instr, writes) if reg)
+        return reads, writes, load, control
+
+    def retire(self, index, instr, next_pc):
+        """Contabiliza a instrução da linha index, que acabou de executar e levou o PC a next_pc"""
+        info = self._info.get(index)
+        if info is None:
+            info = self._info[index] = self._operands(instr)
+        reads, writes, load, control = info
+
+        fetch = self.next_fetch
+        earliest = fetch + 2
+        if self.last_ex + 1 > earliest:
+            earliest = self.last_ex + 1
+        ex = earliest
+        ready = self.ready
+        load_use = False
+        for reg in reads:
+            if ready[reg] > ex:
+                ex = ready[reg]
+                load_use = self.from_load[reg]
+        stall = ex - earliest
+        if stall:
+            if load_use and self.forwarding:
+                self.load_use_stalls += stall
+            else:
+                self.data_stalls += stall
+
+        if writes:
+            available = ex + (2 if load else 1) if self.forwarding else ex + 3
+            for reg in writes:
+                ready[reg] = available
+                self.from_load[reg] = load
+
+        penalty = 0
+        if control:
+            if control == CONTROL_JUMP:
+                penalty = self.jump_penalty
+            elif next_pc != (index << 2) + 4:
+                penalty = self.branch_penalty
+            self.control_stalls += penalty
+
+        # Enquanto esta instrução espera no ID, a seguinte fica presa no IF
+        following = fetch + 1 if fetch + 1 > ex - 1 else ex - 1
+        self.next_fetch = following + penalty
+        self.last_ex = ex
+        self.instructions += 1
+        if stall or penalty:
+            self.stalls[index] += stall + penalty
+        self.history.append((index, fetch, ex, penalty))
+
+    @property
+    def cycles(self):
+        """Ciclos até o WB da última instrução"""
+        return self.last_ex + 2 if self.instructions else 0
+
+    @property
+    def cpi(self):
+        return self.cycles / self.instructions if self.instructions else None
+
+    def report(self, machine, hotspots=20):
+        """Relatório serializável (JSON): ciclos, CPI, bolhas por causa e por instrução"""
+        stalls = self.stalls
+        top = sorted((index for index, count in enumerate(stalls) if count), key=lambda index: -stalls[index])
+        return {
+            'cycles': self.cycles,
+            'instructions': self.instructions,
+            'cpi': self.cpi,
+            'forwarding': self.forwarding,
+            'stalls': {
+                'load_use': self.load_use_stalls,
+                'data': self.data_stalls,
+                'control': self.control_stalls,
+            },
+            'hotspots': [{'pc': index << 2, 'stalls': stalls[index], 'assembly': machine.program.assembly(index)}
+                         for index in top[:hotspots]],
+        }
+
+    def diagram(self):
+        """Estágio de cada instrução recente em cada ciclo: (primeiro ciclo, [(index, {ciclo: estágio})]).
+
+        Ciclos extras no ID (bolhas por dependência) aparecem como '--'.
+        """
+        rows = []
+        for index, fetch, ex, _ in self.history:
+            stages = {fetch: 'IF', fetch + 1: 'ID'}
+            for cycle in range(fetch + 2, ex):
+                stages[cycle] = '--'
+            stages[ex] = 'EX'
+            stages[ex + 1] = 'MEM'
+            stages[ex + 2] = 'WB'
+            rows.append((index, stages))
+        first = min((min(stages) for _, stages in rows), default=1)
+        return first, rows
+
+    def format_diagram(self, machine, width=24):
+        """Diagrama de pipeline das instruções recentes como texto"""
+        first, rows = self.diagram()
+        if not rows:
+            return ""
+        last = max(max(stages) for _, stages in rows)
+        cycles = range(first, last + 1)
+        lines = [f"{'':<{width}}" + ''.join(f"{cycle:>5}" for cycle in cycles)]
+        for index, stages in rows:
+            label = machine.program.assembly(index)[:width - 1]
+            lines.append(f"{label:<{width}}" + ''.join(f"{stages.get(cycle, ''):>5}" for cycle in cycles))
+        return '\n'.join(lines)
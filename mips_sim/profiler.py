@@ -0,0 +1,119 @@
+#====================================================================================
+# MIPS Simulator - perfil de execução
+#
+# Descrição: Conta quantas vezes cada endereço do programa foi executado e o
+# tempo de host gasto em Machine.run. Contagens por instrução (opcode/funct),
+# leituras e escritas na memória e pontos quentes são derivados desse
+# histograma só na hora de montar o relatório, de modo que o laço de
+# execução faz um único incremento por instrução. Com o perfil desligado
+# (machine.profiler = None) o interpretador rápido é usado sem nenhum custo.
+#
+# Uso:
+#     profiler = Profiler()
+#     profiler.attach(machine)
+#     machine.run()
+#     report = profiler.report(machine)
+#     profiler.write_csv(machine, 'perfil.csv')
+#====================================================================================
+
+import csv
+import json
+from array import array
+
+from .isa import lookup
+
+# Nomes das instruções contadas como leitura / escrita na memória
+LOAD_OPS = frozenset(('lw', 'lh', 'lhu', 'lb', 'lbu', 'll'))
+STORE_OPS = frozenset(('sw', 'sh', 'sb', 'sc'))
+
+# Pontos quentes incluídos no relatório
+DEFAULT_HOTSPOTS = 20
+
+def op_name(instr):
+    """Nome da instrução para o perfil (ou o opcode/funct se não implementada)"""
+    spec = lookup(instr.opcode, instr.funct)
+    if spec is not None:
+        return spec.name
+    if instr.opcode == 0:
+        return f"funct {instr.funct:06b}"
+    return f"opcode {instr.opcode:06b}"
+
+class Profiler:
+    """Histograma de execução por endereço e tempo de host de um Machine"""
+
+    def __init__(self):
+        self.counts = array('Q')
+        self.time = 0.0
+        self.timed_instructions = 0
+
+    def attach(self, machine):
+        """Começa a perfilar machine (zera as contagens)"""
+        machine.profiler = self
+        self.reset(machine)
+
+    def detach(self, machine):
+        machine.profiler = None
+
+    def reset(self, machine):
+        """Zera as contagens para o programa de machine (chamado por Machine.reset)"""
+        self.counts = array('Q', bytes(8 * len(machine.program)))
+        self.time = 0.0
+        self.timed_instructions = 0
+
+    def add_time(self, elapsed, instructions):
+        """Registra o tempo de host de uma chamada a Machine.run"""
+        self.time += elapsed
+        self.timed_instructions += instructions
+
+    @property
+    def instructions(self):
+        return sum(self.counts)
+
+    def opcode_counts(self, program):
+        """{nome da instrução: execuções}, em ordem decrescente"""
+        totals = {}
+        decoded = program.decoded
+        for index, count in enumerate(self.counts):
+            if count:
+                name = op_name(decoded[index])
+                totals[name] = totals.get(name, 0) + count
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    def hotspots(self, program, limit=DEFAULT_HOTSPOTS):
+        """Lista [(pc, execuções, assembly)] dos endereços mais executados"""
+        counts = self.counts
+        top = sorted((index for index, count in enumerate(counts) if count),
+                     key=lambda index: -counts[index])
+        if limit is not None:
+            top = top[:limit]
+        return [(index << 2, counts[index], program.assembly(index)) for index in top]
+
+    def report(self, machine, hotspots=DEFAULT_HOTSPOTS):
+        """Relatório serializável (JSON) do perfil"""
+        program = machine.program
+        opcodes = self.opcode_counts(program)
+        return {
+            'instructions': self.instructions,
+            'time': self.time,
+            'ips': self.timed_instructions / self.time if self.time else None,
+            'loads': sum(count for name, count in opcodes.items() if name in LOAD_OPS),
+            'stores': sum(count for name, count in opcodes.items() if name in STORE_OPS),
+            'opcodes': opcodes,
+            'hotspots': [{'pc': pc, 'count': count, 'assembly': text}
+                         for pc, count, text in self.hotspots(program, hotspots)],
+        }
+
+    def write_json(self, machine, path, hotspots=DEFAULT_HOTSPOTS):
+        with open(path, 'w') as f:
+            json.dump(self.report(machine, hotspots), f, indent=2)
+
+    def write_csv(self, machine, path):
+        """Histograma completo por endereço: pc, linha, execuções, instrução, assembly"""
+        program = machine.program
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('pc', 'line', 'count', 'op', 'assembly'))
+            for index, count in enumerate(self.counts):
+                if count:
+                    writer.writerow((f"0x{index << 2:08x}", index + 1, count,
+                                     op_name(program.decoded[index]), program.assembly(index)))
@@ -0,0 +1,113 @@
+#====================================================================================
+# MIPS Simulator - fotografias do estado da máquina
+#
+# Descrição: Snapshot guarda registradores (incluindo HI/LO), PC, contadores e
+# as páginas de memória de um Machine. As páginas são objetos bytes
+# compartilhados com a memória (copy-on-write, ver Memory.freeze), então
+# fotografar, restaurar e derivar várias execuções de um mesmo estado só
+# copia as páginas que mudaram. Páginas mapeadas (Memory.map_file, ou o
+# intervalo compartilhado de mips_sim.multicore) são guardadas por
+# referência, sem cópia, e continuam ligadas ao arquivo ou ao segmento. to_bytes/from_bytes dão uma forma serializada
+# compacta (zlib, páginas zeradas omitidas) para gravar em disco.
+#
+# Uso:
+#     inicio = machine.snapshot()
+#     ...
+#     machine.restore(inicio)            # volta ao estado fotografado
+#     outra = machine.fork(inicio)       # nova máquina a partir da fotografia
+#====================================================================================
+
+import struct
+import zlib
+
+from .isa import NUM_REGISTERS
+from .memory import PAGE_SIZE
+
+MAGIC = b'MIPSSNAP'
+VERSION = 1
+
+# magic, versão, pc, instruções executadas, registradores, número de páginas
+_HEADER = struct.Struct(f'>8sHQQ{NUM_REGISTERS}II')
+_PAGE_NUMBER = struct.Struct('>I')
+_TEXT_SIZE = struct.Struct('>H')
+_ZERO_PAGE = bytes(PAGE_SIZE)
+
+def _pack_text(text):
+    data = (text or '').encode('utf-8')
+    return _TEXT_SIZE.pack(len(data)) + data
+
+def _unpack_text(data, offset):
+    (size,) = _TEXT_SIZE.unpack_from(data, offset)
+    offset += _TEXT_SIZE.size
+    return data[offset:offset + size].decode('utf-8') or None, offset + size
+
+class Snapshot:
+    """Estado completo de um Machine; pages é {número da página: bytes}"""
+
+    __slots__ = ('pc', 'executed', 'status', 'error', 'registers', 'pages')
+
+    def __init__(self, pc, executed, status, error, registers, pages):
+        self.pc = pc
+        self.executed = executed
+        self.status = status
+        self.error = error
+        self.registers = tuple(registers)
+        self.pages = pages
+
+    @classmethod
+    def capture(cls, machine):
+        return cls(machine.pc, machine.executed, machine.status, machine.error,
+                   machine.registers, machine.memory.freeze())
+
+    def apply(self, machine):
+        """Coloca machine no estado fotografado (sem mexer em coverage/tracer)"""
+        machine.registers[:] = self.registers
+        machine.pc = self.pc
+        machine.executed = self.executed
+        machine.status = self.status
+        machine.error = self.error
+        machine.link = None
+        machine.memory.restore(self.pages)
+
+    def __repr__(self):
+        return f"Snapshot(pc=0x{self.pc:x}, executed={self.executed}, pages={len(self.pages)})"
+
+    def to_bytes(self):
+        """Forma serializada compacta (zlib); páginas totalmente zeradas são omitidas"""
+        pages = [(number, page) for number, page in sorted(self.pages.items()) if page != _ZERO_PAGE]
+        parts = [
+            _HEADER.pack(MAGIC, VERSION, self.pc, self.executed, *self.registers, len(pages)),
+            _pack_text(self.status),
+            _pack_text(self.error),
+        ]
+        for number, page in pages:
+            parts.append(_PAGE_NUMBER.pack(number))
+            parts.append(page)
+        return zlib.compress(b''.join(parts))
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = zlib.decompress(data)
+        magic, version, pc, executed, *rest = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Fotografia inválida ou de versão desconhecida")
+        registers, count = rest[:NUM_REGISTERS], rest[NUM_REGISTERS]
+        offset = _HEADER.size
+        status, offset = _unpack_text(data, offset)
+        error, offset = _unpack_text(data, offset)
+        pages = {}
+        for _ in range(count):
+            (number,) = _PAGE_NUMBER.unpack_from(data, offset)
+            offset += _PAGE_NUMBER.size
+            pages[number] = data[offset:offset + PAGE_SIZE]
+            offset += PAGE_SIZE
+        return cls(pc, executed, status, error, registers, pages)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
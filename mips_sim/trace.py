@@ -0,0 +1,399 @@
+#====================================================================================
+# MIPS Simulator - gravação do histórico de execução
+#
+# Descrição: Registra cada instrução executada como um registro binário de
+# tamanho fixo (seq, PC, tipo, destino, valor antigo, valor novo) em um
+# buffer circular que, com um arquivo, é despejado em disco quando enche.
+# Fotografias completas do estado (checkpoints) são tiradas periodicamente.
+# Com isso é possível voltar passos ("step back"), voltar até a última
+# escrita de um registrador ou endereço ("reverse-continue") e reconstruir o
+# estado de qualquer instrução a partir do arquivo, sem executar de novo.
+#
+# A gravação só custa algo quando ligada: Machine usa o interpretador rápido
+# sempre que machine.tracer é None.
+#
+# Uso:
+#     recorder = TraceRecorder('execucao.trace')
+#     recorder.attach(machine)
+#     machine.run()
+#     recorder.step_back(machine)
+#     recorder.reverse_continue(machine, register=12)   # última escrita em $t4
+#     recorder.close()
+#====================================================================================
+
+import os
+import pickle
+import struct
+from collections import namedtuple
+
+from .isa import HI, LO, MASK32, WatchpointHit
+from .memory import Memory
+from .snapshot import Snapshot
+
+# seq (número da instrução), pc, tipo, destino (registrador ou endereço), antigo, novo
+RECORD = struct.Struct('<QIBIII')
+
+# Tipos de registro. Uma instrução gera um registro por escrita, ou um único
+# registro KIND_NONE se não alterou nada (desvios, nops)
+KIND_NONE = 0
+KIND_REG = 1
+KIND_WORD = 2
+KIND_BYTE = 3
+
+# Registros mantidos no buffer (sem arquivo: tamanho do histórico)
+DEFAULT_CAPACITY = 1 << 16
+
+# Instruções entre dois checkpoints
+DEFAULT_CHECKPOINT_INTERVAL = 100_000
+
+TraceRecord = namedtuple('TraceRecord', 'seq pc kind target old new')
+
+# Estado completo (mips_sim.snapshot.Snapshot): index é o primeiro registro
+# gravado depois do checkpoint
+Checkpoint = namedtuple('Checkpoint', 'seq index snapshot')
+
+class TraceRecorder:
+    """Histórico de execução de um Machine.
+
+    Sem path, o histórico é circular e guarda os últimos capacity registros.
+    Com path, o buffer é gravado no arquivo sempre que enche (e em flush/close)
+    e o histórico é completo; os checkpoints vão para path + '.ckpt'.
+    """
+
+    def __init__(self, path=None, capacity=DEFAULT_CAPACITY,
+                 checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self.path = path
+        self.capacity = capacity
+        self.checkpoint_interval = checkpoint_interval
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.file = open(path, 'w+b') if path else None
+        self.count = 0      # registros gravados (arquivo + buffer)
+        self.flushed = 0    # registros já no arquivo
+        self._first = 0     # primeiro registro disponível (sem arquivo, ver _append)
+        self.seq = 0        # número da próxima instrução a ser executada
+        self.checkpoints = []
+        # Checkpoint -> Snapshot.to_bytes já calculado, para flush não recomprimir
+        self._saved = {}
+        self._pending = []
+        self._memory = None
+
+    @classmethod
+    def open(cls, path):
+        """Abre um trace gravado (e seus checkpoints) para reconstrução offline"""
+        recorder = cls.__new__(cls)
+        recorder.path = path
+        recorder.capacity = 0
+        recorder.checkpoint_interval = None
+        recorder.buffer = bytearray()
+        recorder.file = open(path, 'rb')
+        recorder.count = recorder.flushed = os.path.getsize(path) // RECORD.size
+        recorder._first = 0
+        with open(path + '.ckpt', 'rb') as f:
+            recorder.checkpoints = [Checkpoint(seq, index, Snapshot.from_bytes(data))
+                                    for seq, index, data in pickle.load(f)]
+        recorder.seq = recorder.checkpoints[-1].seq
+        recorder._saved = {}
+        recorder._pending = []
+        recorder._memory = None
+        return recorder
+
+    # Gravação
+
+    def attach(self, machine):
+        """Começa a gravar a execução de machine a partir do estado atual"""
+        machine.tracer = self
+        self.restart(machine)
+
+    def detach(self, machine):
+        machine.tracer = None
+        self._unhook()
+        self.flush()
+
+    def restart(self, machine):
+        """Descarta o histórico e recomeça do estado atual (chamado por Machine.reset)"""
+        self._truncate(0)
+        self.seq = machine.executed
+        self.checkpoints = []
+        self.checkpoint(machine)
+
+    def checkpoint(self, machine):
+        """Guarda uma fotografia completa do estado (páginas compartilhadas em copy-on-write)"""
+        self.checkpoints.append(Checkpoint(self.seq, self.count, machine.snapshot()))
+
+    def execute(self, machine, regs, instr, pc):
+        """Executa instr (no endereço pc) gravando suas escritas.
+
+        Chamado pelo laço de execução no lugar de instr.handler; machine.pc já
+        vale pc + 4. Registradores são comparados antes e depois (só rd, rt,
+        $ra, HI e LO podem mudar); escritas na memória são capturadas pelos
+        métodos store_* da memória, embrulhados enquanto a gravação está ligada.
+        """
+        memory = machine.memory
+        if memory is not self._memory:
+            self._hook(memory)
+        pending = self._pending
+        pending.clear()
+        rd = instr.rd
+        rt = instr.rt
+        old_rd = regs[rd]
+        old_rt = regs[rt]
+        old_ra = regs[31]
+        old_hi = regs[HI]
+        old_lo = regs[LO]
+
+        # Um ponto de observação para depois da instrução: ela é gravada antes de parar
+        stop = None
+        try:
+            instr.handler(machine, regs, instr)
+        except WatchpointHit as hit:
+            stop = hit
+
+        seq = self.seq
+        append = self._append
+        written = len(pending)
+        if regs[rd] != old_rd:
+            append(seq, pc, KIND_REG, rd, old_rd, regs[rd])
+            written += 1
+        if rt != rd and regs[rt] != old_rt:
+            append(seq, pc, KIND_REG, rt, old_rt, regs[rt])
+            written += 1
+        if rd != 31 and rt != 31 and regs[31] != old_ra:
+            append(seq, pc, KIND_REG, 31, old_ra, regs[31])
+            written += 1
+        if regs[HI] != old_hi:
+            append(seq, pc, KIND_REG, HI, old_hi, regs[HI])
+            written += 1
+        if regs[LO] != old_lo:
+            append(seq, pc, KIND_REG, LO, old_lo, regs[LO])
+            written += 1
+        for kind, address, old, new in pending:
+            append(seq, pc, kind, address, old, new)
+        if not written:
+            append(seq, pc, KIND_NONE, 0, 0, 0)
+
+        self.seq = seq = seq + 1
+        if self.checkpoint_interval and seq % self.checkpoint_interval == 0:
+            self.checkpoint(machine)
+        if stop is not None:
+            raise stop
+
+    def _hook(self, memory):
+        """Embrulha store_word/store_byte de memory para registrar as escritas"""
+        self._unhook()
+        store_word = memory.store_word
+        store_byte = memory.store_byte
+        pending = self._pending
+
+        def traced_store_word(address, value):
+            old = memory.load_word(address) if not address & 3 else 0
+            store_word(address, value)
+            pending.append((KIND_WORD, address, old, value & MASK32))
+
+        def traced_store_byte(address, value):
+            old = memory.load_byte(address)
+            store_byte(address, value)
+            pending.append((KIND_BYTE, address, old, value & 0xFF))
+
+        memory.store_word = traced_store_word
+        memory.store_byte = traced_store_byte
+        self._memory = memory
+
+    def _unhook(self):
+        if self._memory is not None:
+            del self._memory.store_word
+            del self._memory.store_byte
+            self._memory = None
+
+    # Armazenamento dos registros
+
+    def _append(self, seq, pc, kind, target, old, new):
+        if self.file is None:
+            if self.count - self._first >= self.capacity:
+                self._drop_oldest()
+            slot = self.count % self.capacity
+        else:
+            slot = self.count - self.flushed
+            if slot == self.capacity:
+                self.flush()
+                slot = 0
+        RECORD.pack_into(self.buffer, slot * RECORD.size, seq, pc, kind, target, old, new)
+        self.count += 1
+
+    def _drop_oldest(self):
+        """Buffer circular cheio: descarta a instrução mais antiga inteira.
+
+        Descartar registro a registro deixaria a instrução mais antiga com só
+        parte das suas escritas, e step_back a desfaria pela metade.
+        """
+        capacity = self.capacity
+        first = self._first
+        seq = RECORD.unpack_from(self.buffer, (first % capacity) * RECORD.size)[0]
+        while first < self.count and RECORD.unpack_from(self.buffer, (first % capacity) * RECORD.size)[0] == seq:
+            first += 1
+        self._first = first
+
+    @property
+    def first(self):
+        """Índice do registro mais antigo ainda disponível (sempre o início de uma instrução)"""
+        return self._first
+
+    def __len__(self):
+        return self.count - self.first
+
+    def record(self, index):
+        """Registro de índice index (0 = primeiro registro gravado)"""
+        if not self.first <= index < self.count:
+            raise IndexError(index)
+        if self.file is None:
+            return TraceRecord._make(RECORD.unpack_from(self.buffer, (index % self.capacity) * RECORD.size))
+        if index >= self.flushed:
+            return TraceRecord._make(RECORD.unpack_from(self.buffer, (index - self.flushed) * RECORD.size))
+        self.file.seek(index * RECORD.size)
+        return TraceRecord._make(RECORD.unpack(self.file.read(RECORD.size)))
+
+    def records(self, start=None):
+        """Registros disponíveis a partir do índice start, em ordem"""
+        start = self.first if start is None else start
+        for index in range(start, self.count):
+            yield self.record(index)
+
+    def _truncate(self, index):
+        """Descarta os registros de índice >= index"""
+        if self.file is not None and index < self.flushed:
+            self.file.truncate(index * RECORD.size)
+            self.flushed = index
+        self.count = index
+        self._first = min(self._first, index)
+        while self.checkpoints and self.checkpoints[-1].index > index:
+            self.checkpoints.pop()
+
+    def flush(self):
+        """Grava no arquivo os registros do buffer e a lista de checkpoints"""
+        if self.file is None or self.file.mode == 'rb':
+            return
+        self.file.seek(self.flushed * RECORD.size)
+        self.file.write(self.buffer[:(self.count - self.flushed) * RECORD.size])
+        self.file.flush()
+        self.flushed = self.count
+        # As fotografias vão serializadas com Snapshot.to_bytes: páginas
+        # mapeadas (map_file, map_buffer, memória compartilhada) são
+        # memoryview e não podem ser gravadas com pickle
+        saved = {}
+        for checkpoint in self.checkpoints:
+            data = self._saved.get(checkpoint)
+            saved[checkpoint] = data if data is not None else checkpoint.snapshot.to_bytes()
+        self._saved = saved
+        with open(self.path + '.ckpt', 'wb') as f:
+            pickle.dump([(checkpoint.seq, checkpoint.index, saved[checkpoint])
+                         for checkpoint in self.checkpoints], f)
+
+    def close(self, machine=None):
+        """Encerra a gravação; com machine, guarda o estado final como último checkpoint"""
+        if machine is not None:
+            if machine.tracer is self:
+                machine.tracer = None
+            self.checkpoint(machine)
+        self._unhook()
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+    # Navegação no histórico
+
+    def _undo(self, machine, record):
+        if record.kind == KIND_REG:
+            machine.registers[record.target] = record.old
+        elif record.kind == KIND_WORD:
+            Memory.store_word(machine.memory, record.target, record.old)
+        elif record.kind == KIND_BYTE:
+            Memory.store_byte(machine.memory, record.target, record.old)
+
+    def _redo(self, machine, record):
+        if record.kind == KIND_REG:
+            machine.registers[record.target] = record.new
+        elif record.kind == KIND_WORD:
+            Memory.store_word(machine.memory, record.target, record.new)
+        elif record.kind == KIND_BYTE:
+            Memory.store_byte(machine.memory, record.target, record.new)
+
+    def step_back(self, machine):
+        """Desfaz a última instrução gravada.
+
+        Retorna os registros desfeitos (em ordem inversa), ou [] no início do
+        histórico. O histórico desfeito é descartado: continuar a execução
+        grava um novo futuro.
+        """
+        index = self.count - 1
+        if index < self.first:
+            return []
+        seq = self.record(index).seq
+        undone = []
+        while index >= self.first:
+            record = self.record(index)
+            if record.seq != seq:
+                break
+            self._undo(machine, record)
+            undone.append(record)
+            index -= 1
+        self._truncate(index + 1)
+        self.seq = seq
+        machine.pc = undone[-1].pc
+        machine.executed = seq
+        machine.status = None
+        machine.error = None
+        # A reserva do ll não é gravada; como em Snapshot.apply, voltar a descarta
+        machine.link = None
+        return undone
+
+    def reverse_continue(self, machine, register=None, address=None):
+        """Volta até a última instrução que escreveu em register ou na palavra em address.
+
+        A máquina fica no estado anterior a essa instrução (PC apontando para
+        ela). Retorna o registro da escrita encontrada, ou None se o início do
+        histórico foi atingido sem encontrá-la. Sem register nem address, volta
+        ao início do histórico.
+        """
+        word = address & ~3 if address is not None else None
+        while True:
+            undone = self.step_back(machine)
+            if not undone:
+                return None
+            for record in undone:
+                if record.kind == KIND_REG and record.target == register:
+                    return record
+                if record.kind in (KIND_WORD, KIND_BYTE) and record.target & ~3 == word:
+                    return record
+
+    def seek(self, machine, seq):
+        """Reconstrói em machine o estado antes da instrução seq, sem executar nada.
+
+        Restaura o checkpoint mais próximo e reaplica as escritas gravadas
+        depois dele. Serve para inspecionar o histórico e para traces abertos
+        com TraceRecorder.open; o histórico gravado não é alterado (para voltar
+        e continuar gravando use step_back).
+        """
+        checkpoint = None
+        for candidate in self.checkpoints:
+            if candidate.seq <= seq and candidate.index >= self.first:
+                checkpoint = candidate
+        if checkpoint is None:
+            raise ValueError(f"instrução {seq} fora do histórico gravado")
+
+        checkpoint.snapshot.apply(machine)
+        pc = checkpoint.snapshot.pc
+        for index in range(checkpoint.index, self.count):
+            record = self.record(index)
+            if record.seq >= seq:
+                pc = record.pc
+                break
+            self._redo(machine, record)
+        else:
+            # Sem registros de seq em diante: só um checkpoint sabe o PC desse estado
+            if seq != checkpoint.seq:
+                raise ValueError(f"instrução {seq} fora do histórico gravado")
+        machine.pc = pc
+        machine.executed = seq
+        machine.status = None
+        machine.error = None
+        machine.link = None
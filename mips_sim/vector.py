@@ -0,0 +1,298 @@
+#====================================================================================
+# MIPS Simulator - simulação vetorizada de várias instâncias (NumPy)
+#
+# Descrição: Executa o mesmo programa em N instâncias ao mesmo tempo, cada uma
+# com seus próprios registradores, PC e memória. O banco de registradores é uma
+# matriz NumPy (N, 34) (colunas 32 e 33 = HI/LO) e cada instrução é aplicada a
+# todas as instâncias que estão no mesmo PC com operações vetoriais.
+#
+# Quando o fluxo de controle diverge (desvios tomados só por algumas
+# instâncias), a cada passo é executada a instrução do menor PC entre as
+# instâncias ativas, apenas para as instâncias nesse PC (máscara); as demais
+# esperam e voltam a andar juntas quando os PCs se reencontram.
+#
+# Requer NumPy, importado apenas por este módulo:
+#
+#     from mips_sim.vector import run_batch
+#     final = run_batch(program, initial_registers)   # matriz (N, 34)
+#====================================================================================
+
+import numpy as np
+
+from .core import (
+    DEFAULT_MAX_INSTRUCTIONS,
+    STATUS_BUDGET,
+    STATUS_END,
+    STATUS_EXIT,
+    STATUS_FAULT,
+    Program,
+)
+from .isa import HALT_PC, HI, LO, MASK32, NUM_REGISTERS
+
+# Códigos de status por instância (Machine.status equivalente)
+RUNNING = 0
+_STATUS_CODES = {1: STATUS_END, 2: STATUS_EXIT, 3: STATUS_BUDGET, 4: STATUS_FAULT}
+END, EXIT, BUDGET, FAULT = 1, 2, 3, 4
+
+# Funções vetoriais por nome de instrução (OpSpec.name). Cada uma recebe o
+# BatchMachine, a Instruction e idx, os índices das instâncias que a executam
+# (slice(None) quando são todas), com pc[idx] já avançado para PC+4.
+KERNELS = {}
+
+def kernel(name):
+    """Decorador que registra a versão vetorial de uma instrução"""
+    def decorator(func):
+        KERNELS[name] = func
+        return func
+    return decorator
+
+def _select(idx, mask):
+    """Índices de idx onde mask é verdadeira"""
+    if isinstance(idx, slice):
+        return np.flatnonzero(mask)
+    return idx[mask]
+
+def _set(regs, idx, num, value):
+    # Escritas em $zero são descartadas
+    if num:
+        regs[idx, num] = value
+
+@kernel('add')
+def _add(b, i, idx):
+    _set(b.regs, idx, i.rd, b.regs[idx, i.rs] + b.regs[idx, i.rt])
+
+@kernel('sub')
+def _sub(b, i, idx):
+    _set(b.regs, idx, i.rd, b.regs[idx, i.rs] - b.regs[idx, i.rt])
+
+@kernel('and')
+def _and(b, i, idx):
+    _set(b.regs, idx, i.rd, b.regs[idx, i.rs] & b.regs[idx, i.rt])
+
+@kernel('or')
+def _or(b, i, idx):
+    _set(b.regs, idx, i.rd, b.regs[idx, i.rs] | b.regs[idx, i.rt])
+
+@kernel('sll')
+def _sll(b, i, idx):
+    _set(b.regs, idx, i.rd, b.regs[idx, i.rt] << np.uint32(i.shamt))
+
+@kernel('slt')
+def _slt(b, i, idx):
+    rs = b.regs[idx, i.rs].astype(np.int32)
+    rt = b.regs[idx, i.rt].astype(np.int32)
+    _set(b.regs, idx, i.rd, rs < rt)
+
+@kernel('mult')
+def _mult(b, i, idx):
+    # Implementação simplificada (operandos sem sinal), como no interpretador
+    product = b.regs[idx, i.rs].astype(np.uint64) * b.regs[idx, i.rt].astype(np.uint64)
+    b.regs[idx, HI] = (product >> np.uint64(32)).astype(np.uint32)
+    b.regs[idx, LO] = product.astype(np.uint32)
+
+@kernel('addi')
+def _addi(b, i, idx):
+    _set(b.regs, idx, i.rt, b.regs[idx, i.rs] + np.uint32(i.simm & MASK32))
+
+@kernel('slti')
+def _slti(b, i, idx):
+    _set(b.regs, idx, i.rt, b.regs[idx, i.rs].astype(np.int32) < i.simm)
+
+@kernel('lui')
+def _lui(b, i, idx):
+    _set(b.regs, idx, i.rt, np.uint32(i.imm << 16))
+
+def _addresses(b, i, idx):
+    """Endereços efetivos; instâncias com endereço desalinhado entram em falha"""
+    addr = b.regs[idx, i.rs] + np.uint32(i.simm & MASK32)
+    bad = (addr & np.uint32(3)) != 0
+    if bad.any():
+        faulted = _select(idx, bad)
+        b.status[faulted] = FAULT
+        b.pc[faulted] -= 4
+        b.errors.update((int(k), f"acesso desalinhado à memória: 0x{int(a):08x}")
+                        for k, a in zip(faulted, addr[bad]))
+        idx = _select(idx, ~bad)
+        addr = addr[~bad]
+    return addr, idx
+
+@kernel('lw')
+def _lw(b, i, idx):
+    addr, idx = _addresses(b, i, idx)
+    if isinstance(idx, slice) or len(idx):
+        _set(b.regs, idx, i.rt, b.load(addr, idx))
+
+@kernel('sw')
+def _sw(b, i, idx):
+    addr, idx = _addresses(b, i, idx)
+    if isinstance(idx, slice) or len(idx):
+        b.store(addr, idx, b.regs[idx, i.rt])
+
+# ll/sc: cada instância guarda o endereço reservado pelo último ll (-1 = sem
+# reserva). As instâncias não compartilham memória, então, como em
+# Memory.store_conditional fora de um intervalo compartilhado, o sc consegue
+# sempre que a reserva é do mesmo endereço.
+
+@kernel('ll')
+def _ll(b, i, idx):
+    addr, idx = _addresses(b, i, idx)
+    if isinstance(idx, slice) or len(idx):
+        _set(b.regs, idx, i.rt, b.load(addr, idx))
+        b.link[idx] = addr
+
+@kernel('sc')
+def _sc(b, i, idx):
+    addr, idx = _addresses(b, i, idx)
+    if not isinstance(idx, slice) and not len(idx):
+        return
+    done = b.link[idx] == addr
+    b.link[idx] = -1
+    if done.any():
+        writers = _select(idx, done)
+        b.store(addr[done], writers, b.regs[writers, i.rt])
+    _set(b.regs, idx, i.rt, done.astype(np.uint32))
+
+@kernel('beq')
+def _beq(b, i, idx):
+    taken = _select(idx, b.regs[idx, i.rs] == b.regs[idx, i.rt])
+    b.pc[taken] = (b.pc[taken] + (i.simm << 2)) & MASK32
+
+@kernel('bne')
+def _bne(b, i, idx):
+    taken = _select(idx, b.regs[idx, i.rs] != b.regs[idx, i.rt])
+    b.pc[taken] = (b.pc[taken] + (i.simm << 2)) & MASK32
+
+@kernel('j')
+def _j(b, i, idx):
+    b.pc[idx] = (b.pc[idx] & 0xF0000000) | (i.target << 2)
+
+@kernel('jal')
+def _jal(b, i, idx):
+    b.regs[idx, 31] = b.pc[idx].astype(np.uint32)
+    b.pc[idx] = (b.pc[idx] & 0xF0000000) | (i.target << 2)
+
+@kernel('jr')
+def _jr(b, i, idx):
+    target = b.regs[idx, i.rs].astype(np.int64)
+    bad = (target & 3) != 0
+    if bad.any():
+        faulted = _select(idx, bad)
+        b.status[faulted] = FAULT
+        b.pc[faulted] -= 4
+        b.errors.update((int(k), f"jr para endereço desalinhado: 0x{int(t):08x}")
+                        for k, t in zip(faulted, target[bad]))
+    ok = _select(idx, ~bad)
+    b.pc[ok] = target[~bad]
+
+@kernel('syscall')
+def _syscall(b, i, idx):
+    # $v0 = 10 encerra a instância
+    b.pc[_select(idx, b.regs[idx, 2] == 10)] = HALT_PC
+
+class BatchMachine:
+    """N instâncias de um mesmo programa executadas com operações vetoriais"""
+
+    def __init__(self, program, registers):
+        if not isinstance(program, Program):
+            program = Program(program)
+        registers = np.asarray(registers)
+        if registers.ndim != 2 or registers.shape[1] not in (32, NUM_REGISTERS):
+            raise ValueError(f"registers deve ter formato (N, 32) ou (N, {NUM_REGISTERS})")
+        self.program = program
+        self.size = n = registers.shape[0]
+        self.regs = np.zeros((n, NUM_REGISTERS), dtype=np.uint32)
+        self.regs[:, :registers.shape[1]] = registers.astype(np.int64) & MASK32
+        self.regs[:, 0] = 0
+        self.pc = np.zeros(n, dtype=np.int64)
+        self.status = np.zeros(n, dtype=np.int8)
+        self.executed = np.zeros(n, dtype=np.int64)
+        # Endereço reservado pelo último ll de cada instância (-1 = sem reserva)
+        self.link = np.full(n, -1, dtype=np.int64)
+        self.errors = {}
+        # Memória por instância: {endereço da palavra: coluna (N,) de valores}
+        self.memory = {}
+
+    def load(self, addr, idx):
+        """Lê a palavra addr[k] de cada instância idx[k]"""
+        first = int(addr[0])
+        if (addr == first).all():
+            column = self.memory.get(first)
+            if column is None:
+                return np.zeros(len(addr), dtype=np.uint32)
+            return column[idx]
+        values = np.zeros(len(addr), dtype=np.uint32)
+        rows = np.arange(self.size)[idx]
+        for address in np.unique(addr):
+            column = self.memory.get(int(address))
+            if column is not None:
+                same = addr == address
+                values[same] = column[rows[same]]
+        return values
+
+    def store(self, addr, idx, values):
+        """Escreve values[k] na palavra addr[k] de cada instância idx[k]"""
+        rows = np.arange(self.size)[idx]
+        for address in np.unique(addr):
+            column = self.memory.get(int(address))
+            if column is None:
+                column = self.memory[int(address)] = np.zeros(self.size, dtype=np.uint32)
+            same = addr == address
+            column[rows[same]] = values[same]
+
+    def run(self, max_instructions=DEFAULT_MAX_INSTRUCTIONS):
+        """Executa até todas as instâncias pararem; retorna a matriz de registradores"""
+        decoded = self.program.decoded
+        n = len(self.program)
+        pc, status, executed = self.pc, self.status, self.executed
+        everyone = slice(None)
+        while True:
+            active = status == RUNNING
+            if not active.any():
+                break
+            pcs = pc[active]
+            current = int(pcs.min())
+            if current == int(pcs.max()):
+                idx = everyone if active.all() else np.flatnonzero(active)
+            else:
+                idx = np.flatnonzero(active & (pc == current))
+
+            index = current >> 2
+            if index >= n:
+                status[idx] = EXIT if current == HALT_PC else END
+                continue
+            instr = decoded[index]
+            pc[idx] += 4
+            if instr is None:
+                continue  # linhas inválidas são ignoradas, como em Machine.run
+            op = instr.op
+            if op is not None and op.execute is not None:
+                func = KERNELS.get(op.name)
+                if func is None:
+                    raise NotImplementedError(f"instrução sem versão vetorial: {op.name}")
+                func(self, instr, idx)
+            # Instâncias que falharam nesta instrução não a contam como executada
+            if isinstance(idx, slice):
+                idx = np.flatnonzero(status == RUNNING) if (status != RUNNING).any() else idx
+            else:
+                idx = idx[status[idx] == RUNNING]
+            executed[idx] += 1
+            if max_instructions is not None:
+                over = executed >= max_instructions
+                status[over & (status == RUNNING) & ((pc >> 2) < n)] = BUDGET
+        return self.regs
+
+    def statuses(self):
+        """Status de cada instância, com os mesmos nomes de Machine.status"""
+        return [_STATUS_CODES[int(code)] for code in self.status]
+
+    def signed_registers(self):
+        """Matriz de registradores como inteiros de 32 bits com sinal"""
+        return self.regs.view(np.int32)
+
+def run_batch(program, registers, max_instructions=DEFAULT_MAX_INSTRUCTIONS):
+    """Executa program em N instâncias com os registradores iniciais dados.
+
+    registers tem formato (N, 32) ou (N, 34); retorna a matriz final (N, 34)
+    de registradores (uint32; colunas 32 e 33 = HI/LO).
+    """
+    return BatchMachine(program, registers).run(max_instructions)
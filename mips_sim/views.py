@@ -0,0 +1,124 @@
+#====================================================================================
+# MIPS Simulator - visualização virtual de listas de linhas
+#
+# Descrição: Widget Tkinter que exibe uma lista de qualquer tamanho
+# renderizando só as linhas visíveis. O texto de cada linha é pedido a uma
+# função no momento em que ela aparece na tela, de modo que programas com
+# centenas de milhares de instruções abrem e rolam sem montar um Text
+# gigante. Importado apenas pela GUI.
+#====================================================================================
+
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualListView(ttk.Frame):
+    """Lista rolável que renderiza apenas as linhas visíveis.
+
+    row_text(i) devolve o texto da linha i e row_tags(i) (opcional) uma tupla
+    de tags do Text a aplicar nela; ambos são chamados só para as linhas na
+    tela. As tags devem ser configuradas em self.text (tag_configure). A
+    linha clicada fica em self.selected e recebe a tag 'selected'.
+    """
+
+    def __init__(self, master, row_text=None, count=0, row_tags=None, **text_options):
+        super().__init__(master)
+        self.row_text = row_text
+        self.row_tags = row_tags
+        self.count = count
+        self.top = 0
+        self.selected = None
+
+        self.text = tk.Text(self, wrap=tk.NONE, height=1, cursor='arrow', **text_options)
+        self.vsb = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        hsb = ttk.Scrollbar(self, orient='horizontal', command=self.text.xview)
+        self.text.configure(xscrollcommand=hsb.set, state=tk.DISABLED)
+        self.text.tag_configure('selected', underline=True)
+
+        self.text.grid(row=0, column=0, sticky='nsew')
+        self.vsb.grid(row=0, column=1, sticky='ns')
+        hsb.grid(row=1, column=0, sticky='ew')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.text.bind('<Configure>', lambda event: self.render())
+        self.text.bind('<MouseWheel>', self._on_wheel)
+        self.text.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.text.bind('<Button-5>', lambda event: self.scroll(3))
+        self.text.bind('<Button-1>', self._on_click)
+        self.text.bind('<Prior>', lambda event: self.scroll(-self.visible_rows()))
+        self.text.bind('<Next>', lambda event: self.scroll(self.visible_rows()))
+
+    def set_source(self, row_text, count, row_tags=None):
+        """Troca a fonte das linhas e volta ao início da lista"""
+        self.row_text = row_text
+        self.row_tags = row_tags
+        self.count = count
+        self.top = 0
+        self.selected = None
+        self.render()
+
+    def visible_rows(self):
+        """Número de linhas que cabem na altura atual do widget"""
+        line_height = self.text.tk.call('font', 'metrics', self.text.cget('font'), '-linespace')
+        return max(1, self.text.winfo_height() // int(line_height))
+
+    def scroll(self, rows):
+        self.scroll_to(self.top + rows)
+        return 'break'
+
+    def scroll_to(self, top):
+        top = max(0, min(top, self.count - self.visible_rows()))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def see(self, index):
+        """Rola a lista, se preciso, para que a linha index fique visível (centralizada)"""
+        rows = self.visible_rows()
+        if not self.top <= index < self.top + rows:
+            self.scroll_to(index - rows // 2)
+
+    def yview(self, *args):
+        """Comando da barra de rolagem ('moveto' fração / 'scroll' n units|pages)"""
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.count))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.visible_rows()
+            self.scroll(amount)
+
+    def index_at(self, y):
+        """Índice da linha na coordenada y do Text (None fora da lista)"""
+        index = self.top + int(self.text.index(f"@0,{y}").split('.')[0]) - 1
+        return index if index < self.count else None
+
+    def render(self):
+        """Redesenha as linhas visíveis e atualiza a barra de rolagem"""
+        text = self.text
+        end = min(self.count, self.top + self.visible_rows())
+        rows = range(self.top, end)
+        text.config(state=tk.NORMAL)
+        text.delete('1.0', tk.END)
+        if self.row_text is not None:
+            text.insert('1.0', '\n'.join([self.row_text(i) for i in rows]))
+            for offset, index in enumerate(rows, 1):
+                tags = self.row_tags(index) if self.row_tags is not None else ()
+                if index == self.selected:
+                    tags = tags + ('selected',)
+                for tag in tags:
+                    text.tag_add(tag, f"{offset}.0", f"{offset}.end")
+        text.config(state=tk.DISABLED)
+        if self.count:
+            self.vsb.set(self.top / self.count, end / self.count)
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def _on_wheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_click(self, event):
+        self.selected = self.index_at(event.y)
+        self.render()
+        self.text.focus_set()
+        return 'break'
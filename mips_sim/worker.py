@@ -0,0 +1,113 @@
+#====================================================================================
+# MIPS Simulator - execução em segundo plano
+#
+# Descrição: Thread que executa um Machine em fatias de instruções e publica
+# fotografias periódicas do estado em uma fila. A GUI consome a fila com
+# after() e nunca executa o programa na thread do Tk; a thread aceita
+# pausar, continuar e cancelar entre duas fatias.
+#====================================================================================
+
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from .core import STATUS_BUDGET, STATUS_TIMEOUT
+
+# Instruções executadas entre duas verificações de pausa/cancelamento
+SLICE = 65536
+
+# Intervalo mínimo (s) entre duas fotografias publicadas durante a execução
+SNAPSHOT_INTERVAL = 0.05
+
+# Estados da thread, publicados em Snapshot.state
+RUNNING = 'running'
+PAUSED = 'paused'
+DONE = 'done'
+CANCELLED = 'cancelled'
+
+# Fotografia do estado da máquina; registers é uma cópia da lista de registradores
+# e coverage uma cópia do bitmap de linhas executadas (None sem track_coverage)
+Snapshot = namedtuple('Snapshot', 'state pc executed status error registers coverage')
+
+class ExecutionWorker(threading.Thread):
+    """Executa machine.run em segundo plano até o fim, um limite ou stop_at.
+
+    Enquanto a thread está viva ela é a dona do Machine: quem a criou deve
+    ler o estado apenas pelas fotografias em self.snapshots. A última
+    fotografia publicada tem estado DONE ou CANCELLED. O timeout conta só o
+    tempo em execução, não o tempo em pausa.
+    """
+
+    def __init__(self, machine, max_instructions=None, timeout=None, stop_at=None,
+                 compiled=False, snapshot_interval=SNAPSHOT_INTERVAL):
+        super().__init__(daemon=True)
+        self.machine = machine
+        self.max_instructions = max_instructions
+        self.timeout = timeout
+        self.stop_at = stop_at
+        self.compiled = compiled
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = queue.Queue()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._cancelled = False
+
+    @property
+    def paused(self):
+        return not self._resume.is_set()
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    def cancel(self):
+        self._cancelled = True
+        self._resume.set()
+
+    def snapshot(self, state):
+        machine = self.machine
+        coverage = bytes(machine.coverage) if machine.coverage is not None else None
+        return Snapshot(state, machine.pc, machine.executed, machine.status,
+                        machine.error, list(machine.registers), coverage)
+
+    def run(self):
+        machine = self.machine
+        budget = self.max_instructions
+        elapsed = 0.0
+        last_snapshot = time.perf_counter()
+        while True:
+            if not self._resume.is_set():
+                self.snapshots.put(self.snapshot(PAUSED))
+                self._resume.wait()
+            if self._cancelled:
+                self.snapshots.put(self.snapshot(CANCELLED))
+                return
+
+            limit = machine.executed + SLICE
+            if budget is not None:
+                limit = min(limit, budget)
+            remaining = None
+            if self.timeout:
+                # Sem essa verificação um tempo restante 0 seria lido como "sem limite" por Machine.run
+                if elapsed >= self.timeout:
+                    machine.status = STATUS_TIMEOUT
+                    self.snapshots.put(self.snapshot(DONE))
+                    return
+                remaining = max(self.timeout - elapsed, 0)
+            start = time.perf_counter()
+            status = machine.run(compiled=self.compiled, max_instructions=limit,
+                                 timeout=remaining, stop_at=self.stop_at)
+            now = time.perf_counter()
+            elapsed += now - start
+
+            # Fim de fatia não é parada: só o limite total de instruções e o de tempo contam
+            sliced = status == STATUS_BUDGET and (budget is None or machine.executed < budget)
+            if not sliced:
+                self.snapshots.put(self.snapshot(DONE))
+                return
+            if now - last_snapshot >= self.snapshot_interval:
+                self.snapshots.put(self.snapshot(RUNNING))
+                last_snapshot = now
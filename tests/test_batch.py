@@ -0,0 +1,66 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from mips_sim.batch import collect_programs, run_one, run_programs
+from mips_sim.cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES = [os.path.join(ROOT, name) for name in ('final1.txt', 'final2.txt', 'final3.txt')]
+
+@pytest.fixture
+def programs(tmp_path):
+    """Diretório com os exemplos, um subdiretório com um .hex, um programa inválido e um arquivo ignorado"""
+    for path in EXAMPLES:
+        shutil.copy(path, tmp_path)
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'laco.hex').write_text("08000000\n")
+    (tmp_path / 'ruim.txt').write_text("0101\n")
+    (tmp_path / 'notas.md').write_text("não é programa\n")
+    return tmp_path
+
+def by_file(results):
+    return {os.path.basename(result['file']): result for result in results}
+
+def test_collect_programs_walks_directories_and_globs(programs):
+    found = [os.path.relpath(path, programs) for path in collect_programs([str(programs)])]
+    assert found == ['final1.txt', 'final2.txt', 'final3.txt', 'ruim.txt', os.path.join('sub', 'laco.hex')]
+    assert collect_programs([str(programs / 'final*.txt')]) == sorted(str(programs / name)
+                                                                       for name in ('final1.txt', 'final2.txt',
+                                                                                    'final3.txt'))
+
+def test_run_one_reports_status_and_errors(programs):
+    result = run_one(str(programs / 'final1.txt'))
+    assert result['status'] == 'end'
+    assert result['registers']['$t1'] == 33
+    loop = run_one(str(programs / 'sub' / 'laco.hex'), max_instructions=1000)
+    assert loop['status'] == 'budget'
+    assert loop['instructions'] == 1000
+    bad = run_one(str(programs / 'ruim.txt'))
+    assert bad['status'] is None
+    assert 'linha 1' in bad['error']
+
+@pytest.mark.parametrize('workers, chunksize', [(1, 1), (2, 1), (2, 3)])
+def test_pool_gives_the_same_results(programs, workers, chunksize):
+    paths = collect_programs([str(programs)])
+    serial = by_file(run_programs(paths, workers=1, max_instructions=1000))
+    pooled = by_file(run_programs(paths, workers=workers, chunksize=chunksize, max_instructions=1000))
+    for result in list(serial.values()) + list(pooled.values()):
+        result.pop('time')
+    assert pooled == serial
+
+def test_cli_writes_json_lines(programs, tmp_path, capsys):
+    output = tmp_path / 'resultados.jsonl'
+    status = main(['batch', str(programs / 'final1.txt'), str(programs / 'final2.txt'),
+                   '--workers', '1', '-o', str(output)])
+    assert status == 0
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(os.path.basename(line['file']) for line in lines) == ['final1.txt', 'final2.txt']
+
+@pytest.mark.parametrize('option', ['--workers', '--chunksize'])
+def test_cli_rejects_non_positive_counts(programs, option, capsys):
+    with pytest.raises(SystemExit):
+        main(['batch', str(programs), option, '0'])
+    assert 'maior que zero' in capsys.readouterr().err
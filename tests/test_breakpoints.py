@@ -0,0 +1,146 @@
+import pytest
+
+from mips_sim.bench.workloads import T0, T1, T2, T4, build, encode
+from mips_sim.breakpoints import Breakpoints, compile_condition
+from mips_sim.core import STATUS_BREAK, STATUS_END, STATUS_WATCH, Machine, Program
+
+ITERATIONS = 30
+PROGRAM = build('memory', iterations=ITERATIONS, footprint=256)
+BASE = 0x10000000
+
+def first(program, name):
+    """Endereço da primeira instrução name de program"""
+    return next(index for index in range(len(program)) if program.decoded[index].op.name == name) << 2
+
+def attached(program=PROGRAM):
+    machine = Machine(program)
+    points = Breakpoints()
+    points.attach(machine)
+    return machine, points
+
+def stops(machine, points, compiled=False):
+    """Roda até o fim, continuando a cada parada; retorna [(status, pc, executadas, hit)]"""
+    seen = []
+    while True:
+        status = machine.run(compiled=compiled)
+        if status not in (STATUS_BREAK, STATUS_WATCH):
+            return seen
+        seen.append((status, machine.pc, machine.executed, points.hit))
+
+def reference():
+    machine = Machine(PROGRAM)
+    machine.run()
+    return machine
+
+def test_breakpoint_stops_before_the_instruction_and_resumes():
+    expected = reference()
+    machine, points = attached()
+    pc = first(PROGRAM, 'lw')
+    points.add(pc)
+    seen = stops(machine, points)
+    # Uma parada por iteração, sempre antes do lw; continuar executa o lw
+    assert len(seen) == ITERATIONS
+    assert all(status == STATUS_BREAK and stop == pc for status, stop, _, _ in seen)
+    assert len({executed for _, _, executed, _ in seen}) == ITERATIONS
+    assert seen[0][3].kind == 'breakpoint' and seen[0][3].pc == pc
+    assert machine.status == STATUS_END
+    assert machine.registers == expected.registers and machine.executed == expected.executed
+
+def test_conditional_breakpoint():
+    machine, points = attached()
+    points.add(first(PROGRAM, 'lw'), "$t0 == 5")
+    assert machine.run() == STATUS_BREAK
+    assert machine.registers[T0] == 5
+    assert machine.run() == STATUS_END
+
+def test_remove_and_toggle():
+    machine, points = attached()
+    pc = first(PROGRAM, 'lw')
+    assert points.toggle(pc)
+    assert machine.run() == STATUS_BREAK
+    assert not points.toggle(pc)
+    assert machine.run() == STATUS_END
+    machine.reset()
+    points.add(pc)
+    points.remove(pc)
+    assert not points and machine.run() == STATUS_END
+
+def test_register_watchpoint():
+    words = [encode('addi', rt=T1, imm=3), encode('addi', rt=T2, imm=1),
+             encode('addi', rs=T1, rt=T1, imm=4), encode('addi', rs=T1, rt=T1, imm=0)]
+    machine, points = attached(Program.from_words(words))
+    points.watch_register('$t1')
+    assert machine.run() == STATUS_WATCH
+    # Para depois da instrução que mudou o valor
+    assert machine.pc == 4
+    assert tuple(points.hit) == ('register', 0, T1, 0, 3)
+    assert machine.run() == STATUS_WATCH
+    assert tuple(points.hit) == ('register', 8, T1, 3, 7)
+    # Escrever o mesmo valor não dispara
+    assert machine.run() == STATUS_END
+
+def test_memory_watchpoint():
+    expected = reference()
+    machine, points = attached()
+    address = BASE + 4 * 7
+    points.watch_memory(address + 2)
+    seen = stops(machine, points)
+    assert seen and all(status == STATUS_WATCH for status, _, _, _ in seen)
+    hits = [hit for _, _, _, hit in seen]
+    assert all(hit.kind == 'memory' and hit.target == address for hit in hits)
+    assert hits[0].old == 0
+    assert all(before.new == after.old for before, after in zip(hits, hits[1:]))
+    assert hits[-1].new == expected.memory.load_word(address)
+    assert {PROGRAM.decoded[hit.pc >> 2].op.name for hit in hits} == {'sw'}
+
+@pytest.mark.parametrize('setup', [
+    lambda points: points.add(first(PROGRAM, 'sw'), "$t0 == 7 or $t0 <= 2"),
+    lambda points: (points.watch_register('$t4'), points.watch_memory(BASE + 8)),
+])
+def test_compiled_stops_like_interpreter(setup):
+    results = []
+    for compiled in (False, True):
+        machine, points = attached()
+        setup(points)
+        results.append((stops(machine, points, compiled), machine.executed, list(machine.registers)))
+    assert results[0] == results[1]
+    assert results[0][0]
+
+def test_breakpoint_on_translate_only_instruction():
+    # print_int só é traduzida (o interpretador a trata como nop), mas ainda para
+    words = [encode('addi', rt=T1, imm=1), encode('print_int', rt=T1), encode('addi', rt=T4, imm=2)]
+    machine, points = attached(Program.from_words(words))
+    points.add(4)
+    assert machine.run() == STATUS_BREAK
+    assert machine.pc == 4 and machine.executed == 1
+    assert machine.run() == STATUS_END
+    assert machine.executed == 3 and machine.registers[T4] == 2
+
+def test_invalid_lines_are_rejected():
+    program = Program([f"{encode('addi', rt=T1, imm=1):032b}", "nada aqui", f"{encode('addi', rt=T2, imm=1):032b}"])
+    points = Breakpoints()
+    points.add(4)
+    assert points.invalid_lines(program) == [4]
+    with pytest.raises(ValueError, match="Linha 2"):
+        points.check(program)
+
+    machine, points = attached(program)
+    with pytest.raises(ValueError):
+        points.add(4)
+    with pytest.raises(ValueError):
+        points.add(2)
+    points.add(8)
+    assert machine.run() == STATUS_BREAK and machine.pc == 8
+
+def test_conditions():
+    condition = compile_condition("$t1 == 10 and $t0 != -1 || $a0 >= 0x7")
+    regs = [0] * 34
+    regs[T1] = 10
+    assert condition(regs)
+    regs[T1] = 0
+    assert not condition(regs)
+    regs[4] = 7
+    assert condition(regs)
+    for text in ("$t1 ==", "$t1 10", "$foo == 1", "== 3", "$t1 == 1 and"):
+        with pytest.raises(ValueError):
+            compile_condition(text)
@@ -0,0 +1,111 @@
+import pytest
+
+from mips_sim.bench.workloads import T1, build, encode
+from mips_sim.breakpoints import Breakpoints
+from mips_sim.cache import Cache, CacheHierarchy
+from mips_sim.core import STATUS_BREAK, STATUS_FAULT, Machine, Program
+
+# Endereços que caem no conjunto 0 de um cache com 2 conjuntos de linhas de 32 bytes
+A, B, C = 0, 64, 128
+
+def run(cache, accesses):
+    for address, write in accesses:
+        cache.access(address, write)
+    return cache
+
+def test_hits_and_misses():
+    cache = run(Cache(128, 2, 32), [(A, False), (A + 4, False), (32, True), (A, True), (B, False)])
+    assert (cache.reads, cache.writes) == (3, 2)
+    assert (cache.read_misses, cache.write_misses) == (2, 1)
+    stats = cache.stats()
+    assert stats['accesses'] == 5 and stats['misses'] == 3
+    assert stats['hit_rate'] == pytest.approx(2 / 5)
+
+@pytest.mark.parametrize('policy, hit', [('lru', True), ('fifo', False)])
+def test_replacement_policy(policy, hit):
+    cache = run(Cache(128, 2, 32, policy=policy), [(A, False), (B, False), (A, False), (C, False)])
+    assert cache.misses == 3
+    # LRU tira B (usada há mais tempo); FIFO tira A (a mais antiga a entrar)
+    misses = cache.misses
+    cache.access(A, False)
+    assert (cache.misses == misses) == hit
+
+def test_write_back():
+    cache = run(Cache(64, 1, 32), [(A, True), (A, True), (B, False)])
+    # A escrita aloca a linha; o write-back só acontece quando ela sai do cache
+    assert cache.write_misses == 1 and cache.read_misses == 1
+    assert cache.writebacks == 1 and cache.writes_through == 0
+
+def test_write_through():
+    cache = run(Cache(64, 1, 32, write_back=False), [(A, True), (A, False), (A, True), (B, False)])
+    # Sem alocação na escrita: a primeira escrita não traz a linha, a leitura seguinte falha
+    assert cache.write_misses == 1 and cache.read_misses == 2
+    assert cache.writes_through == 2 and cache.writebacks == 0
+
+def test_l2_latency():
+    hierarchy = CacheHierarchy(Cache(64, 1, 32), Cache(256, 2, 32, hit_latency=10, name='L2'),
+                               memory_latency=100)
+    l1, l2 = hierarchy.levels
+    assert l1.access(A, False) == 110
+    assert l1.access(B, False) == 110
+    # A saiu da L1 mas continua na L2
+    assert l1.access(A, False) == 10
+    assert l1.access(A, False) == 0
+    assert (l1.misses, l2.misses, l2.accesses) == (3, 2, 3)
+
+def test_from_spec():
+    cache = Cache.from_spec('size=32K,ways=4,line=64,policy=fifo,write=through,latency=3', 'L2')
+    assert (cache.size, cache.associativity, cache.line_size, cache.sets) == (32768, 4, 64, 128)
+    assert (cache.policy, cache.write_back, cache.write_allocate) == ('fifo', False, False)
+    assert (cache.hit_latency, cache.name) == (3, 'L2')
+    assert Cache.from_spec('').size == Cache().size
+    for spec in ('size=3000', 'ways=3', 'policy=random', 'write=sometimes', 'color=blue', 'size'):
+        with pytest.raises(ValueError):
+            Cache.from_spec(spec)
+
+def test_machine_report_and_reset():
+    program = build('memory', iterations=40, footprint=1024)
+    machine = Machine(program)
+    caches = CacheHierarchy(Cache(256, 2, 32))
+    caches.attach(machine)
+    machine.run()
+    report = caches.report(machine)
+    l1 = report['levels'][0]
+    # 2 lw e 2 sw por iteração
+    assert (l1['reads'], l1['writes']) == (80, 80)
+    assert sum(item['misses'] for item in report['hotspots']) == l1['misses'] > 0
+    assert {program.decoded[item['pc'] >> 2].op.name for item in report['hotspots']} <= {'lw', 'sw'}
+    assert report['stall_cycles'] > 0
+
+    # O modo compilado não é usado com caches: o resultado é o mesmo
+    machine.reset()
+    assert caches.l1.accesses == caches.stall_cycles == 0
+    machine.run(compiled=True)
+    assert caches.report(machine) == report
+
+def test_faulting_access_is_not_counted():
+    machine = Machine(Program.from_words([encode('lw', rt=T1, imm=2)]))
+    caches = CacheHierarchy()
+    caches.attach(machine)
+    assert machine.run() == STATUS_FAULT
+    assert caches.l1.accesses == 0
+
+def test_breakpoint_does_not_count_twice():
+    program = build('memory', iterations=20, footprint=256)
+    load = next(index for index in range(len(program)) if program.decoded[index].op.name == 'lw')
+    reference = Machine(program)
+    expected = CacheHierarchy()
+    expected.attach(reference)
+    reference.run()
+
+    machine = Machine(program)
+    caches = CacheHierarchy()
+    caches.attach(machine)
+    breakpoints = Breakpoints()
+    breakpoints.attach(machine)
+    breakpoints.add(load << 2)
+    stops = 0
+    while machine.run() == STATUS_BREAK:
+        stops += 1
+    assert stops == 20
+    assert caches.report(machine) == expected.report(reference)
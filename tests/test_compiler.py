@@ -0,0 +1,34 @@
+import pytest
+
+from mips_sim.bench.workloads import build
+from mips_sim.core import Machine
+
+# Workloads executáveis, em tamanho reduzido
+WORKLOADS = [
+    ('alu', {'instructions': 2000}),
+    ('memory', {'iterations': 300, 'footprint': 4096}),
+    ('branch', {'iterations': 300}),
+]
+
+def state(machine):
+    return (machine.status, machine.pc, machine.executed, machine.error,
+            list(machine.registers), sorted(machine.memory.words()))
+
+@pytest.mark.parametrize('name, params', WORKLOADS)
+def test_compiled_matches_interpreter(name, params):
+    program = build(name, **params)
+    interpreted = Machine(program)
+    interpreted.run()
+    compiled = Machine(program)
+    compiled.run(compiled=True)
+    assert state(compiled) == state(interpreted)
+
+@pytest.mark.parametrize('budget', [1, 7, 100, 1001])
+def test_compiled_stops_at_the_same_budget(budget):
+    program = build('branch', iterations=300)
+    interpreted = Machine(program)
+    interpreted.run(max_instructions=budget)
+    compiled = Machine(program)
+    compiled.run(compiled=True, max_instructions=budget)
+    assert state(compiled) == state(interpreted)
+    assert compiled.executed == budget
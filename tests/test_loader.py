@@ -0,0 +1,67 @@
+import pytest
+
+from mips_sim.core import load_program
+from mips_sim.loader import read_text, read_words
+
+ADDI = '00100001000010010000000000001000'
+ADD = '00000001001010100100000000100000'
+
+def write(tmp_path, text):
+    path = tmp_path / 'programa.txt'
+    path.write_text(text)
+    return str(path)
+
+def test_blank_lines_and_comments_are_skipped(tmp_path):
+    path = write(tmp_path, f"# início\n\n{ADDI}  \n   \n// comentário\n{ADD} // soma\n")
+    assert list(read_text(path)) == [int(ADDI, 2), int(ADD, 2)]
+
+def test_without_comments(tmp_path):
+    path = write(tmp_path, f"{ADDI}\n\n{ADD}\n")
+    assert list(read_text(path)) == [int(ADDI, 2), int(ADD, 2)]
+
+@pytest.mark.parametrize('line, message', [
+    ('0' * 31, 'linha 2: instrução deve ter 32 bits, tem 31'),
+    ('0' * 33, 'linha 2: instrução deve ter 32 bits, tem 33'),
+    ('2' + '0' * 31, 'linha 2: instrução binária inválida'),
+    ('-' + '1' * 31, 'linha 2: instrução binária inválida'),
+    ('0_' + '1' * 30, 'linha 2: instrução binária inválida'),
+])
+def test_bad_line_reports_line_number(tmp_path, line, message):
+    path = write(tmp_path, f"{ADDI}\n{line}\n{ADD}\n")
+    with pytest.raises(ValueError, match=message):
+        read_text(path)
+
+def test_bad_line_after_comment(tmp_path):
+    path = write(tmp_path, f"# cabeçalho\n{ADDI}\n{'0' * 31 + '2'}\n")
+    with pytest.raises(ValueError, match='linha 3: instrução binária inválida'):
+        read_text(path)
+
+def test_hex_and_binary_formats_match_text(tmp_path):
+    words = [int(ADDI, 2), int(ADD, 2)]
+    text = write(tmp_path, f"{ADDI}\n{ADD}\n")
+    hex_path = tmp_path / 'programa.hex'
+    hex_path.write_text("# dump\n0x21090008\n012a4020 // add\n")
+    bin_path = tmp_path / 'programa.bin'
+    bin_path.write_bytes(b''.join(word.to_bytes(4, 'big') for word in words))
+    assert list(read_words(text)) == words
+    assert list(read_words(str(hex_path))) == words
+    assert list(read_words(str(bin_path))) == words
+    assert list(read_words(str(bin_path), 'bin')) == words
+
+def test_binary_size_must_be_whole_words(tmp_path):
+    path = tmp_path / 'programa.bin'
+    path.write_bytes(bytes(6))
+    with pytest.raises(ValueError, match='múltiplo de 4'):
+        read_words(str(path))
+
+def test_bad_hex_word(tmp_path):
+    path = tmp_path / 'programa.hex'
+    path.write_text("21090008 123456789\n")
+    with pytest.raises(ValueError, match='palavra hexadecimal inválida'):
+        read_words(str(path))
+
+def test_load_program_decodes_lazily(tmp_path):
+    program = load_program(write(tmp_path, f"{ADDI}\n{ADD}\n"))
+    assert len(program) == 2
+    assert program.assembly(0) == 'addi $t1, $t0, 8'
+    assert program.line(1) == ADD
@@ -0,0 +1,84 @@
+import pytest
+
+from mips_sim.bench.workloads import T1, T2, encode, load_constant
+from mips_sim.core import STATUS_FAULT, Machine, Program
+from mips_sim.isa import ExecutionError
+from mips_sim.memory import PAGE_SIZE, Memory
+
+def test_unwritten_memory_reads_zero_without_allocating():
+    memory = Memory()
+    assert memory.load_word(0x10000000) == 0
+    assert memory.load_byte(0x7ffffffc) == 0
+    assert memory.page_count == 0
+
+def test_words_are_big_endian():
+    memory = Memory()
+    memory.store_word(0x1000, 0x11223344)
+    assert [memory.load_byte(0x1000 + i) for i in range(4)] == [0x11, 0x22, 0x33, 0x44]
+    memory.store_byte(0x1003, 0xff)
+    assert memory.load_word(0x1000) == 0x112233ff
+    assert list(memory.words()) == [(0x1000, 0x112233ff)]
+
+def test_misaligned_word_access_raises():
+    memory = Memory()
+    with pytest.raises(ExecutionError):
+        memory.load_word(0x1002)
+    with pytest.raises(ExecutionError):
+        memory.store_word(0x1001, 1)
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_misaligned_lw_faults(compiled):
+    words = load_constant(T1, 0x10000002) + [encode('lw', rs=T1, rt=T2, imm=0),
+                                              encode('addi', rt=T2, imm=1)]
+    machine = Machine(Program.from_words(words))
+    assert machine.run(compiled=compiled) == STATUS_FAULT
+    assert 'desalinhado' in machine.error
+    # O PC fica na instrução que falhou e ela não conta como executada
+    assert machine.pc == 8
+    assert machine.executed == 2
+    assert machine.registers[T2] == 0
+
+def test_load_image_crosses_pages():
+    memory = Memory()
+    data = bytes(range(256)) * 20
+    memory.load_image(PAGE_SIZE - 8, data)
+    assert memory.page_count == 3
+    assert memory.load_word(PAGE_SIZE - 8) == 0x00010203
+    assert memory.load_word(PAGE_SIZE) == 0x08090a0b
+
+def test_map_file_is_copy_on_write(tmp_path):
+    image = tmp_path / 'dados.bin'
+    original = bytes(range(256)) * 16 + b'\x01\x02\x03\x04'
+    image.write_bytes(original)
+    memory = Memory()
+    memory.map_file(0x10000000, str(image))
+    assert memory.load_word(0x10000000) == 0x00010203
+    # O pedaço final (menos de uma página) é copiado
+    assert memory.load_word(0x10000000 + PAGE_SIZE) == 0x01020304
+    memory.store_word(0x10000000, 0xdeadbeef)
+    assert memory.load_word(0x10000000) == 0xdeadbeef
+    assert image.read_bytes() == original
+
+def test_map_buffer_writes_through():
+    buffer = bytearray(2 * PAGE_SIZE)
+    memory = Memory()
+    memory.map_buffer(0x20000000, buffer)
+    memory.store_word(0x20000000 + PAGE_SIZE, 0x01020304)
+    assert buffer[PAGE_SIZE:PAGE_SIZE + 4] == b'\x01\x02\x03\x04'
+    memory.unmap_buffer(0x20000000, len(buffer))
+    memory.store_word(0x20000000, 5)
+    assert buffer[:4] == bytes(4)
+    assert memory.load_word(0x20000000 + PAGE_SIZE) == 0x01020304
+
+def test_freeze_and_restore_only_touch_dirty_pages():
+    memory = Memory()
+    memory.store_word(0x1000, 1)
+    memory.store_word(0x5000, 2)
+    frozen = memory.freeze()
+    memory.store_word(0x1000, 10)
+    memory.store_word(0x9000, 3)
+    assert frozen[1][:4] == b'\x00\x00\x00\x01'
+    assert memory.dirty == {1, 9}
+    memory.restore(frozen)
+    assert list(memory.words()) == [(0x1000, 1), (0x5000, 2)]
+    assert memory.pages[5] is frozen[5]
@@ -0,0 +1,106 @@
+import pytest
+
+from mips_sim.bench.workloads import T0, T1, T2, T3, T4, encode, load_constant
+from mips_sim.core import STATUS_END, STATUS_FAULT, Machine, Program
+from mips_sim.multicore import CORE_ID_REGISTER, DEFAULT_SHARED_BASE, MultiCore
+
+NOP = 0
+
+def final_state(system):
+    return [(machine.status, machine.pc, list(machine.registers), sorted(machine.memory.words()))
+            for machine in system.cores]
+
+def run(words, mode, prepare):
+    with MultiCore(Program.from_words(words), cores=2) as system:
+        prepare(system)
+        if mode == 'lockstep':
+            system.run_lockstep()
+        else:
+            system.run_parallel()
+        return final_state(system)
+
+def test_parallel_keeps_private_memory():
+    # Cada núcleo lê a palavra em 0x2000 da sua memória privada e grava o sucessor em 0x2004
+    words = load_constant(T1, 0x2000) + [
+        encode('lw', rs=T1, rt=T2),
+        encode('addi', rs=T2, rt=T2, imm=1),
+        encode('sw', rs=T1, rt=T2, imm=4),
+    ]
+
+    def prepare(system):
+        system.cores[0].memory.store_word(0x2000, 77)
+
+    lockstep = run(words, 'lockstep', prepare)
+    parallel = run(words, 'parallel', prepare)
+    assert parallel == lockstep
+    assert lockstep[0][2][T2] == 78
+    assert lockstep[1][2][T2] == 1
+
+# Núcleo 0: ll, espera e sc de 7 no endereço compartilhado
+LL_SC = load_constant(T0, DEFAULT_SHARED_BASE) + [encode('ll', rs=T0, rt=T1)] + [NOP] * 6 + [
+    encode('addi', rt=T1, imm=7),
+    encode('sc', rs=T0, rt=T1),
+]
+
+def test_sc_succeeds_without_interference():
+    with MultiCore([Program.from_words(LL_SC)]) as system:
+        system.run_lockstep()
+        assert system.cores[0].registers[T1] == 1
+        assert system.load_word(DEFAULT_SHARED_BASE) == 7
+
+def test_sc_fails_after_intervening_write():
+    # Núcleo 1 escreve 5 e depois volta a 0 entre o ll e o sc: o valor é o
+    # mesmo, mas a reserva foi perdida (não há ABA)
+    other = load_constant(T0, DEFAULT_SHARED_BASE) + [
+        NOP,
+        encode('addi', rt=T2, imm=5),
+        encode('sw', rs=T0, rt=T2),
+        encode('sw', rs=T0, rt=0),
+    ]
+    with MultiCore([Program.from_words(LL_SC), Program.from_words(other)]) as system:
+        system.run_lockstep()
+        assert system.cores[0].registers[T1] == 0
+        assert system.load_word(DEFAULT_SHARED_BASE) == 0
+
+def test_misaligned_sc_faults():
+    machine = Machine(Program.from_words([encode('addi', rt=T0, imm=2), encode('sc', rs=T0, rt=T1)]))
+    assert machine.run() == STATUS_FAULT
+
+# Cada núcleo soma 1 ao contador compartilhado ITERATIONS vezes com ll/sc e
+# grava 100 + id na sua posição do vetor logo depois do contador
+ITERATIONS = 300
+COUNTER = [
+    encode('lui', rt=T0, imm=DEFAULT_SHARED_BASE >> 16),
+    encode('addi', rt=T1, imm=ITERATIONS),
+    encode('ll', rs=T0, rt=T2),
+    encode('addi', rs=T2, rt=T2, imm=1),
+    encode('sc', rs=T0, rt=T2),
+    encode('beq', rs=T2, rt=0, imm=-4),
+    encode('addi', rs=T1, rt=T1, imm=-1),
+    encode('bne', rs=T1, rt=0, imm=-6),
+    encode('sll', rt=CORE_ID_REGISTER, rd=T3, shamt=2),
+    encode('add', rs=T3, rt=T0, rd=T3),
+    encode('addi', rs=CORE_ID_REGISTER, rt=T4, imm=100),
+    encode('sw', rs=T3, rt=T4, imm=4),
+]
+
+@pytest.mark.parametrize('mode, compiled', [('lockstep', False), ('lockstep', True),
+                                            ('parallel', False), ('parallel', True)])
+def test_counter_is_atomic(mode, compiled):
+    cores = 3
+    with MultiCore(Program.from_words(COUNTER), cores=cores) as system:
+        if mode == 'lockstep':
+            statuses = system.run_lockstep(quantum=3, compiled=compiled)
+        else:
+            statuses = system.run_parallel(compiled=compiled)
+        assert statuses == [STATUS_END] * cores
+        assert system.load_word(DEFAULT_SHARED_BASE) == cores * ITERATIONS
+        assert [system.load_word(DEFAULT_SHARED_BASE + 4 + 4 * core) for core in range(cores)] == [100, 101, 102]
+
+def test_lockstep_is_deterministic():
+    with MultiCore(Program.from_words(COUNTER), cores=3) as system:
+        system.run_lockstep(quantum=3)
+        first = system.to_dict()
+        system.reset()
+        system.run_lockstep(quantum=3)
+        assert system.to_dict() == first
@@ -0,0 +1,91 @@
+import pytest
+
+from mips_sim.bench.workloads import T0, T1, T2, T3, build, encode
+from mips_sim.core import Machine, Program
+from mips_sim.pipeline import DEFAULT_BRANCH_PENALTY, DEFAULT_JUMP_PENALTY, PipelineModel
+
+def modeled(words, **options):
+    machine = Machine(Program.from_words(words))
+    model = PipelineModel(**options)
+    model.attach(machine)
+    machine.run()
+    return machine, model
+
+def stalls(model):
+    return model.load_use_stalls, model.data_stalls, model.control_stalls
+
+@pytest.mark.parametrize('forwarding', [True, False])
+def test_independent_instructions_have_cpi_near_one(forwarding):
+    words = [encode('addi', rt=reg, imm=1) for reg in (T0, T1, T2, T3)] * 5
+    machine, model = modeled(words, forwarding=forwarding)
+    assert model.instructions == machine.executed == 20
+    # Sem dependências: encher o pipeline (4 ciclos) e depois uma por ciclo
+    assert model.cycles == 20 + 4
+    assert model.cpi == pytest.approx(24 / 20)
+    assert stalls(model) == (0, 0, 0)
+
+def test_alu_dependency():
+    words = [encode('addi', rt=T1, imm=5), encode('add', rs=T1, rt=T1, rd=T2)]
+    _, model = modeled(words)
+    assert stalls(model) == (0, 0, 0)
+    assert model.cycles == 6
+    # Sem adiantamento o add espera o WB do addi
+    _, model = modeled(words, forwarding=False)
+    assert stalls(model) == (0, 2, 0)
+    assert model.cycles == 8
+
+def test_load_use():
+    words = [encode('lw', rt=T1, imm=0), encode('add', rs=T1, rt=T1, rd=T2)]
+    _, model = modeled(words)
+    assert stalls(model) == (1, 0, 0)
+    assert model.cycles == 7
+    _, model = modeled(words, forwarding=False)
+    assert stalls(model) == (0, 2, 0)
+    assert model.cycles == 8
+
+def test_store_data_is_forwarded_to_mem():
+    words = [encode('lw', rt=T1, imm=0), encode('sw', rt=T1, imm=4)]
+    _, model = modeled(words)
+    assert stalls(model) == (0, 0, 0)
+    _, model = modeled(words, forwarding=False)
+    assert stalls(model) == (0, 2, 0)
+
+def test_control_penalties():
+    words = [
+        encode('bne', rs=0, rt=0, imm=5),          # não tomado: sem custo
+        encode('beq', rs=0, rt=0, imm=1),          # tomado
+        encode('addi', rt=T1, imm=1),              # pulada
+        encode('j', target=4),
+        encode('addi', rt=T2, imm=1),
+    ]
+    machine, model = modeled(words)
+    assert model.instructions == machine.executed == 4
+    assert stalls(model) == (0, 0, DEFAULT_BRANCH_PENALTY + DEFAULT_JUMP_PENALTY)
+    assert model.cycles == 4 + 4 + DEFAULT_BRANCH_PENALTY + DEFAULT_JUMP_PENALTY
+
+    _, model = modeled(words, branch_penalty=1, jump_penalty=0)
+    assert stalls(model) == (0, 0, 1)
+
+def test_report_and_reset():
+    program = build('memory', iterations=20, footprint=256)
+    reference = Machine(program)
+    reference.run()
+    machine = Machine(program)
+    model = PipelineModel()
+    model.attach(machine)
+    machine.run()
+    # O modelo não muda a execução
+    assert machine.registers == reference.registers
+
+    report = model.report(machine)
+    assert report['instructions'] == machine.executed
+    assert report['cycles'] == model.cycles
+    assert report['cpi'] > 1
+    total = sum(report['stalls'].values())
+    assert total == sum(model.stalls)
+    assert report['hotspots'][0]['stalls'] == max(model.stalls)
+
+    machine.reset()
+    assert model.instructions == model.cycles == 0 and model.cpi is None
+    machine.run()
+    assert model.report(machine) == report
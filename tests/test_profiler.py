@@ -0,0 +1,72 @@
+import csv
+import json
+
+from mips_sim.bench.workloads import build
+from mips_sim.core import Machine
+from mips_sim.profiler import Profiler
+
+ITERATIONS = 25
+
+def profiled(program):
+    machine = Machine(program)
+    profiler = Profiler()
+    profiler.attach(machine)
+    machine.run()
+    return machine, profiler
+
+def test_counts_match_interpreter():
+    program = build('memory', iterations=ITERATIONS, footprint=256)
+    reference = Machine(program)
+    reference.run()
+    machine, profiler = profiled(program)
+    # O perfil não muda o resultado da execução
+    assert machine.registers == reference.registers
+    assert profiler.instructions == machine.executed == reference.executed
+
+    opcodes = profiler.opcode_counts(program)
+    assert opcodes['lw'] == opcodes['sw'] == 2 * ITERATIONS
+    assert opcodes['bne'] == ITERATIONS
+    assert list(opcodes.values()) == sorted(opcodes.values(), reverse=True)
+
+    report = profiler.report(machine)
+    assert report['loads'] == report['stores'] == 2 * ITERATIONS
+    assert report['instructions'] == machine.executed
+    assert report['time'] > 0 and report['ips'] > 0
+
+def test_hotspots_are_the_loop_body():
+    program = build('memory', iterations=ITERATIONS, footprint=256)
+    machine, profiler = profiled(program)
+    hotspots = profiler.hotspots(program)
+    # Só o corpo do laço (10 instruções) roda ITERATIONS vezes
+    assert [count for _, count, _ in hotspots[:10]] == [ITERATIONS] * 10
+    assert all(count == 1 for _, count, _ in hotspots[10:])
+    pc, _, text = hotspots[0]
+    assert text == program.assembly(pc >> 2)
+    assert len(profiler.hotspots(program, limit=3)) == 3
+
+def test_reset_clears_counts():
+    program = build('branch', iterations=10)
+    machine, profiler = profiled(program)
+    assert profiler.instructions
+    machine.reset()
+    assert profiler.instructions == 0 and profiler.time == 0.0
+    machine.run()
+    assert profiler.instructions == machine.executed
+
+def test_write_json_and_csv(tmp_path):
+    program = build('branch', iterations=10)
+    machine, profiler = profiled(program)
+
+    profiler.write_json(machine, tmp_path / 'perfil.json')
+    with open(tmp_path / 'perfil.json') as f:
+        saved = json.load(f)
+    assert saved['opcodes'] == profiler.opcode_counts(program)
+    assert saved['instructions'] == machine.executed
+
+    profiler.write_csv(machine, tmp_path / 'perfil.csv')
+    with open(tmp_path / 'perfil.csv', newline='') as f:
+        rows = list(csv.DictReader(f))
+    executed = [index for index, count in enumerate(profiler.counts) if count]
+    assert [int(row['line']) - 1 for row in rows] == executed
+    assert sum(int(row['count']) for row in rows) == machine.executed
+    assert all(int(row['pc'], 16) == (int(row['line']) - 1) << 2 for row in rows)
@@ -0,0 +1,84 @@
+from mips_sim.bench.workloads import build
+from mips_sim.core import Machine
+from mips_sim.snapshot import Snapshot
+from mips_sim.trace import TraceRecorder
+
+def run_partially():
+    machine = Machine(build('memory', iterations=200, footprint=4096))
+    machine.run(max_instructions=500)
+    return machine
+
+def test_round_trip(tmp_path):
+    machine = run_partially()
+    snapshot = machine.snapshot()
+    path = str(tmp_path / 'estado.snap')
+    snapshot.save(path)
+    loaded = Snapshot.load(path)
+
+    restored = Machine(machine.program)
+    restored.restore(loaded)
+    assert restored.pc == machine.pc
+    assert restored.executed == machine.executed
+    assert restored.status == machine.status
+    assert restored.registers == machine.registers
+    assert sorted(restored.memory.words()) == sorted(machine.memory.words())
+
+    # As duas continuam a execução da mesma forma
+    machine.run()
+    restored.run()
+    assert restored.registers == machine.registers
+    assert sorted(restored.memory.words()) == sorted(machine.memory.words())
+
+def test_fork_is_isolated():
+    machine = run_partially()
+    registers = list(machine.registers)
+    memory = sorted(machine.memory.words())
+    child = machine.fork()
+
+    child.registers[8] = 12345
+    child.memory.store_word(0x10000000, 0xDEADBEEF)
+    child.run()
+    assert machine.registers == registers
+    assert sorted(machine.memory.words()) == memory
+
+    # Escrita na mesma página, agora pela máquina original
+    before = child.memory.load_word(0x10000ff0)
+    machine.memory.store_word(0x10000ff0, before + 1)
+    assert child.memory.load_word(0x10000ff0) == before
+
+def test_reset_from_snapshot_after_more_work():
+    machine = run_partially()
+    snapshot = machine.snapshot()
+    state = (machine.pc, machine.executed, list(machine.registers), sorted(machine.memory.words()))
+    machine.run()
+    machine.restore(snapshot)
+    assert (machine.pc, machine.executed, list(machine.registers), sorted(machine.memory.words())) == state
+    assert machine.status == snapshot.status
+
+def test_to_bytes_omits_zero_pages():
+    machine = Machine(build('alu', instructions=10))
+    machine.memory.store_word(0x1000, 0)
+    machine.memory.store_word(0x2000, 9)
+    snapshot = Snapshot.from_bytes(machine.snapshot().to_bytes())
+    assert sorted(snapshot.pages) == [2]
+
+def test_file_trace_with_mapped_memory(tmp_path):
+    # Checkpoints com páginas mapeadas (memoryview) precisam ser gravados no arquivo
+    image = tmp_path / 'dados.bin'
+    image.write_bytes(bytes(range(256)) * 32)
+    machine = Machine(build('memory', iterations=300, footprint=4096))
+    machine.memory.map_file(0x10000000, str(image))
+    before = machine.memory.load_word(0x10000100)
+    path = str(tmp_path / 'execucao.trace')
+    recorder = TraceRecorder(path, capacity=64, checkpoint_interval=500)
+    recorder.attach(machine)
+    machine.run()
+    recorder.close(machine)
+
+    replay = TraceRecorder.open(path)
+    restored = Machine(machine.program)
+    replay.seek(restored, machine.executed)
+    assert restored.registers == machine.registers
+    assert sorted(restored.memory.words()) == sorted(machine.memory.words())
+    replay.seek(restored, 0)
+    assert restored.memory.load_word(0x10000100) == before
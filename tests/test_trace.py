@@ -0,0 +1,89 @@
+from mips_sim.bench.workloads import T1, T2, build, encode
+from mips_sim.core import Machine, Program
+from mips_sim.trace import KIND_WORD, TraceRecorder
+
+def state(machine):
+    return (machine.pc, machine.executed, list(machine.registers), sorted(machine.memory.words()))
+
+def test_step_back_restores_registers_and_memory():
+    program = build('memory', iterations=50, footprint=256)
+    machine = Machine(program)
+    recorder = TraceRecorder(checkpoint_interval=64)
+    recorder.attach(machine)
+
+    history = []
+    while machine.executed < 300:
+        history.append(state(machine))
+        assert machine.step() is not None
+    # Volta instrução por instrução, conferindo cada estado intermediário
+    while history:
+        assert recorder.step_back(machine)
+        assert state(machine) == history.pop()
+    assert recorder.step_back(machine) == []
+
+def test_step_back_then_continue():
+    program = build('memory', iterations=50, footprint=256)
+    reference = Machine(program)
+    reference.run()
+
+    machine = Machine(program)
+    recorder = TraceRecorder()
+    recorder.attach(machine)
+    machine.run(max_instructions=200)
+    for _ in range(50):
+        recorder.step_back(machine)
+    machine.run()
+    assert state(machine) == state(reference)
+
+def test_reverse_continue_to_last_memory_write():
+    program = build('memory', iterations=50, footprint=256)
+    machine = Machine(program)
+    recorder = TraceRecorder()
+    recorder.attach(machine)
+    machine.run(max_instructions=200)
+    record = recorder.reverse_continue(machine, address=0x10000000)
+    assert record.kind == KIND_WORD
+    assert record.target == 0x10000000
+    # A máquina para antes da escrita: o valor antigo está de volta
+    assert machine.memory.load_word(0x10000000) == record.old
+    assert machine.pc == record.pc
+
+def test_seek_in_a_saved_trace(tmp_path):
+    program = build('memory', iterations=50, footprint=256)
+    path = str(tmp_path / 'execucao.trace')
+    recorder = TraceRecorder(path, capacity=32, checkpoint_interval=100)
+    machine = Machine(program)
+    recorder.attach(machine)
+    machine.run()
+    recorder.close(machine)
+
+    reference = Machine(program)
+    reference.run(max_instructions=123)
+    replay = TraceRecorder.open(path)
+    restored = Machine(program)
+    replay.seek(restored, 123)
+    assert state(restored) == state(reference)
+
+def test_ring_buffer_keeps_whole_instructions():
+    # mult grava dois registros (HI e LO); com capacidade ímpar a volta do buffer
+    # cai no meio de uma instrução
+    words = [encode('addi', rt=T2, imm=3)]
+    for _ in range(40):
+        words += [encode('mult', rs=T1, rt=T2), encode('addi', rs=T1, rt=T1, imm=1)]
+    machine = Machine(Program.from_words(words))
+    recorder = TraceRecorder(capacity=5)
+    recorder.attach(machine)
+
+    history = []
+    while machine.step() is not None:
+        history.append(state(machine))
+    states = {repr(item) for item in history}
+    history.pop()
+    while True:
+        undone = recorder.step_back(machine)
+        if not undone:
+            break
+        assert state(machine) == history.pop()
+    # Parou no início de uma instrução completa, não no meio de um mult
+    assert repr(state(machine)) in states
+    assert len(recorder) == 0
@@ -0,0 +1,78 @@
+import pytest
+
+from mips_sim.bench.workloads import encode
+from mips_sim.core import Machine, Program
+
+np = pytest.importorskip('numpy')
+
+from mips_sim.vector import BatchMachine, run_batch  # noqa: E402
+
+A0, A1, A2, A3 = 4, 5, 6, 7
+T2, T3, T5, T6, T7 = 10, 11, 13, 14, 15
+
+# Desvios, acessos à memória e falhas que dependem dos registradores iniciais
+PROGRAM = Program.from_words([
+    encode('lui', rt=T6, imm=0x1000),
+    encode('slt', rs=A0, rt=A1, rd=T2),
+    encode('beq', rs=T2, rt=0, imm=2),
+    encode('add', rs=A0, rt=A1, rd=T3),
+    encode('j', target=7),
+    encode('sub', rs=A0, rt=A1, rd=T3),
+    encode('addi', rt=0, imm=0),
+    encode('sw', rs=T6, rt=T3, imm=0),
+    encode('add', rs=T6, rt=A2, rd=T5),
+    encode('lw', rs=T5, rt=T7, imm=0),
+    encode('mult', rs=T3, rt=A0),
+    encode('addi', rs=A3, rt=A3, imm=-1),
+    encode('bne', rs=A3, rt=0, imm=-2),
+])
+
+def initial_registers(n, seed=3):
+    rng = np.random.default_rng(seed)
+    registers = np.zeros((n, 32), dtype=np.int64)
+    registers[:, A0] = rng.integers(-1000, 1000, n)
+    registers[:, A1] = rng.integers(-1000, 1000, n)
+    registers[:, A2] = rng.choice([0, 4, 8, 2, 3], n)
+    registers[:, A3] = rng.integers(1, 20, n)
+    return registers
+
+def reference(registers, max_instructions=None):
+    machine = Machine(PROGRAM, max_instructions=max_instructions)
+    machine.registers[:32] = [int(value) & 0xFFFFFFFF for value in registers]
+    machine.registers[0] = 0
+    machine.run()
+    return machine
+
+@pytest.mark.parametrize('max_instructions', [None, 15])
+def test_instances_match_machine(max_instructions):
+    registers = initial_registers(64)
+    batch = BatchMachine(PROGRAM, registers)
+    final = batch.run(max_instructions) if max_instructions else batch.run()
+    statuses = batch.statuses()
+    for k in range(len(registers)):
+        machine = reference(registers[k], max_instructions)
+        assert [int(value) for value in final[k]] == machine.registers, k
+        assert statuses[k] == machine.status, k
+        assert int(batch.pc[k]) == machine.pc, k
+        assert int(batch.executed[k]) == machine.executed, k
+        word = batch.memory.get(0x10000000)
+        assert (int(word[k]) if word is not None else 0) == machine.memory.load_word(0x10000000), k
+
+def test_misaligned_instances_fault_alone():
+    registers = initial_registers(8)
+    registers[:, A2] = [0, 2, 4, 1, 0, 3, 8, 0]
+    batch = BatchMachine(PROGRAM, registers)
+    batch.run()
+    statuses = batch.statuses()
+    assert [status == 'fault' for status in statuses] == [False, True, False, True, False, True, False, False]
+
+def test_run_batch_shape_and_signed_view():
+    registers = np.zeros((3, 32), dtype=np.int64)
+    registers[:, A0] = [-5, 0, 7]
+    registers[:, A3] = 1
+    final = run_batch(PROGRAM, registers)
+    assert final.shape == (3, 34)
+    assert final.dtype == np.uint32
+    batch = BatchMachine(PROGRAM, registers)
+    batch.run()
+    assert list(batch.signed_registers()[:, T3]) == [-5, 0, 7]
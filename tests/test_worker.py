@@ -0,0 +1,90 @@
+import time
+
+from mips_sim.bench.workloads import build, encode
+from mips_sim.core import STATUS_BREAK, STATUS_BUDGET, STATUS_END, STATUS_TIMEOUT, Machine, Program
+from mips_sim.worker import CANCELLED, DONE, PAUSED, SLICE, ExecutionWorker
+
+LOOP = Program.from_words([encode('j', target=0)])
+
+def last_snapshot(worker):
+    worker.join(10)
+    assert not worker.is_alive()
+    snapshot = worker.snapshots.get_nowait()
+    while not worker.snapshots.empty():
+        snapshot = worker.snapshots.get_nowait()
+    return snapshot
+
+def test_runs_to_the_end_like_machine_run():
+    program = build('branch', iterations=20_000)
+    reference = Machine(program)
+    reference.run()
+    machine = Machine(program)
+    machine.track_coverage()
+    worker = ExecutionWorker(machine)
+    worker.start()
+    snapshot = last_snapshot(worker)
+    assert snapshot.state == DONE
+    assert snapshot.status == STATUS_END
+    assert snapshot.executed == reference.executed > SLICE
+    assert snapshot.registers == reference.registers
+    assert snapshot.coverage == bytes(machine.coverage)
+
+def test_budget_spans_slices():
+    machine = Machine(LOOP)
+    worker = ExecutionWorker(machine, max_instructions=SLICE + 10)
+    worker.start()
+    snapshot = last_snapshot(worker)
+    assert snapshot.status == STATUS_BUDGET
+    assert snapshot.executed == SLICE + 10
+
+def test_pause_resume_and_cancel():
+    machine = Machine(LOOP)
+    worker = ExecutionWorker(machine)
+    worker.pause()
+    worker.start()
+    snapshot = worker.snapshots.get(timeout=10)
+    assert snapshot.state == PAUSED
+    assert snapshot.executed == 0
+    assert worker.paused
+    worker.resume()
+    worker.cancel()
+    snapshot = last_snapshot(worker)
+    assert snapshot.state == CANCELLED
+
+def test_stop_at_runs_to_the_cursor():
+    program = build('branch', iterations=50)
+    machine = Machine(program)
+    worker = ExecutionWorker(machine, stop_at=4 * 10)
+    worker.start()
+    snapshot = last_snapshot(worker)
+    assert snapshot.status == STATUS_BREAK
+    assert snapshot.pc == 4 * 10
+
+def test_timeout_stops_an_infinite_loop():
+    machine = Machine(LOOP)
+    worker = ExecutionWorker(machine, timeout=0.05)
+    worker.start()
+    snapshot = last_snapshot(worker)
+    assert snapshot.state == DONE
+    assert snapshot.status == STATUS_TIMEOUT
+    assert machine.executed > 0
+
+def test_timeout_checked_between_slices(monkeypatch):
+    # Fatias que terminam pelo limite de instruções depois de gastar o tempo todo
+    machine = Machine(LOOP)
+    timeouts = []
+
+    def slow_slice(compiled, max_instructions, timeout, stop_at):
+        timeouts.append(timeout)
+        time.sleep(0.03)
+        machine.executed = max_instructions
+        machine.status = STATUS_BUDGET
+        return STATUS_BUDGET
+
+    monkeypatch.setattr(machine, 'run', slow_slice)
+    worker = ExecutionWorker(machine, timeout=0.05)
+    worker.start()
+    snapshot = last_snapshot(worker)
+    assert snapshot.status == STATUS_TIMEOUT
+    assert len(timeouts) == 2
+    assert all(timeout > 0 for timeout in timeouts)